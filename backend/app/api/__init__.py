@@ -1,3 +1,3 @@
-from app.api import auth, tasks, monitoring, websocket
+from app.api import auth, tasks, monitoring, websocket, audit
 
-__all__ = ["auth", "tasks", "monitoring", "websocket"]
+__all__ = ["auth", "tasks", "monitoring", "websocket", "audit"]
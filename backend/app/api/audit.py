@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.database import get_db
+from app.utils.auth import get_current_active_user, token_cache
+from app.utils.pagination import NEXT_CURSOR_HEADER, NDJSON_MEDIA_TYPE, ndjson_stream
+from app.services import AuditService, AuditLogQueue
+from pydantic import BaseModel
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+import uuid
+
+router = APIRouter(prefix="/api", tags=["audit"])
+
+# Shared with AuditMiddleware and started/stopped in the app lifespan
+audit_queue = AuditLogQueue()
+
+
+# Pydantic schemas
+class AuditLogResponse(BaseModel):
+    id: uuid.UUID
+    timestamp: datetime
+    user_id: Optional[uuid.UUID]
+    action: str
+    resource_type: str
+    resource_id: Optional[uuid.UUID]
+    method: Optional[str]
+    endpoint: Optional[str]
+    ip_address: Optional[str]
+    response_status: Optional[int]
+    changes: Optional[Dict[str, Any]]
+    details: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
+def _caller_id(current_user: dict) -> uuid.UUID:
+    """Audit logs are scoped to the user they were recorded for"""
+    try:
+        return uuid.UUID(str(current_user.get("id")))
+    except ValueError:
+        raise HTTPException(status_code=403, detail="Audit logs are not available for this user")
+
+
+@router.get("/audit-logs", response_model=List[AuditLogResponse])
+async def list_audit_logs(
+    response: Response,
+    resource_type: Optional[str] = None,
+    action: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """List the current user's audit logs, newest first
+
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
+    """
+    user_id = _caller_id(current_user)
+    try:
+        page = await AuditService.get_audit_logs_page(
+            db,
+            user_id=user_id,
+            resource_type=resource_type,
+            action=action,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
+@router.get("/audit-logs/export")
+async def export_audit_logs(
+    resource_type: Optional[str] = None,
+    action: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Stream the current user's matching audit logs as NDJSON, newest first"""
+    logs = AuditService.iter_audit_logs(
+        db,
+        user_id=_caller_id(current_user),
+        resource_type=resource_type,
+        action=action,
+        start_date=start_date,
+        end_date=end_date
+    )
+    return StreamingResponse(ndjson_stream(logs, AuditLogResponse), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/metrics/audit")
+async def get_audit_metrics(
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get audit log writer queue depth, lag and drop counts"""
+    return audit_queue.stats()
+
+
+@router.get("/metrics/auth")
+async def get_auth_metrics(
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get verified token cache size, hit/miss counts and evictions"""
+    return {"token_cache": token_cache.stats()}
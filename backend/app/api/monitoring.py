@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils.database import get_db
 from app.utils.auth import get_current_active_user
 from app.services import MonitorService
+from app.services.status_page_cache import etag_matches
+from app.utils.pagination import NEXT_CURSOR_HEADER, NDJSON_MEDIA_TYPE, ndjson_stream
 from app.agents import MonitorAgent
 from pydantic import BaseModel
 from typing import List, Optional, Dict
@@ -77,14 +80,40 @@ async def create_monitor(
 
 @router.get("/monitors", response_model=List[MonitorResponse])
 async def list_monitors(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """List all monitors"""
-    monitors = await monitor_service.get_monitors(db, skip=skip, limit=limit)
-    return monitors
+    """List monitors in creation order
+
+    Pass the X-Next-Cursor response header back as `cursor` to get the next
+    page. `skip` still works for existing clients but falls back to OFFSET.
+    """
+    if skip:
+        return await monitor_service.get_monitors(db, skip=skip, limit=limit)
+
+    try:
+        page = await monitor_service.get_monitors_page(db, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
+@router.get("/monitors/export")
+async def export_monitors(
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Stream every monitor as NDJSON"""
+    return StreamingResponse(
+        ndjson_stream(monitor_service.iter_monitors(db), MonitorResponse),
+        media_type=NDJSON_MEDIA_TYPE
+    )
 
 
 @router.get("/monitors/{monitor_id}", response_model=MonitorResponse)
@@ -128,25 +157,22 @@ async def trigger_check(
 
 
 @router.get("/status-page")
-async def get_status_page(db: AsyncSession = Depends(get_db)):
-    """Public status page data - no authentication required"""
-    monitors = await monitor_service.get_monitors(db)
-
-    status_data = {
-        "overall_status": "operational",
-        "monitors": [],
-        "last_updated": datetime.utcnow().isoformat()
+async def get_status_page(request: Request, db: AsyncSession = Depends(get_db)):
+    """Public status page data - no authentication required
+
+    Served from an in-process snapshot with ETag and Cache-Control headers, so
+    traffic spikes during an outage do not reach the database.
+    """
+    cache = monitor_service.status_page_cache
+    snapshot = await cache.get(lambda: monitor_service.get_status_page_data(db))
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": f"public, max-age={int(cache.min_refresh)}"
     }
 
-    for monitor in monitors:
-        uptime = await monitor_service.calculate_uptime(db, monitor.id, hours=24)
-        status_data["monitors"].append({
-            "name": monitor.name,
-            "status": monitor.status,
-            "uptime_24h": uptime["uptime_percentage"]
-        })
-
-    return status_data
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 
 @router.get("/metrics/dashboard", response_model=DashboardMetrics)
@@ -154,40 +180,29 @@ async def get_dashboard_metrics(
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get dashboard metrics"""
-    from sqlalchemy import select, func
-    from app.models import Monitor, Incident, MonitorStatus, IncidentStatus
-
-    # Count monitors by status
-    monitors = await monitor_service.get_monitors(db)
-    total_monitors = len(monitors)
-    monitors_up = sum(1 for m in monitors if m.status == MonitorStatus.UP)
-    monitors_down = sum(1 for m in monitors if m.status == MonitorStatus.DOWN)
-    monitors_degraded = sum(1 for m in monitors if m.status == MonitorStatus.DEGRADED)
-
-    # Count active incidents
-    query = select(func.count()).select_from(Incident).where(
-        Incident.status.in_([IncidentStatus.INVESTIGATING, IncidentStatus.IDENTIFIED])
-    )
-    result = await db.execute(query)
-    active_incidents = result.scalar()
-
-    # Calculate average uptime
-    total_uptime = 0
-    for monitor in monitors:
-        uptime_data = await monitor_service.calculate_uptime(db, monitor.id, hours=24)
-        total_uptime += uptime_data["uptime_percentage"]
-
-    avg_uptime = total_uptime / total_monitors if total_monitors > 0 else 100.0
-
-    return DashboardMetrics(
-        total_monitors=total_monitors,
-        monitors_up=monitors_up,
-        monitors_down=monitors_down,
-        monitors_degraded=monitors_degraded,
-        active_incidents=active_incidents,
-        avg_uptime=round(avg_uptime, 2)
-    )
+    """Get dashboard metrics
+
+    Cached per user for DASHBOARD_CACHE_TTL seconds so dashboards polling in
+    many tabs share one computation.
+    """
+    cache = monitor_service.dashboard_cache
+    metrics = cache.get(current_user["id"])
+    if metrics is None:
+        metrics = await monitor_service.get_dashboard_metrics(db)
+        cache.set(current_user["id"], metrics)
+
+    return DashboardMetrics(**metrics)
+
+
+@router.get("/metrics/scheduler")
+async def get_scheduler_metrics(
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get check scheduler lag, queue depth and result sink backlog"""
+    return {
+        **monitor_service.scheduler.stats(),
+        "result_sink": monitor_service.result_sink.stats()
+    }
 
 
 # AI-powered analysis
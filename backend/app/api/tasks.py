@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils.database import get_db
 from app.utils.auth import get_current_active_user
 from app.services import TaskService
-from pydantic import BaseModel
+from app.services.board_cache import board_cache
+from app.utils.pagination import NEXT_CURSOR_HEADER, NDJSON_MEDIA_TYPE, ndjson_stream
+from app.config import settings
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
+import orjson
 import uuid
 
 router = APIRouter(prefix="/api", tags=["tasks"])
@@ -21,6 +26,7 @@ class BoardResponse(BaseModel):
     id: uuid.UUID
     name: str
     description: Optional[str]
+    version: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -30,14 +36,15 @@ class BoardResponse(BaseModel):
 
 class ListCreate(BaseModel):
     name: str
-    position: int = 0
+    position: Optional[float] = None  # appended after the last list when omitted
 
 
 class ListResponse(BaseModel):
     id: uuid.UUID
     board_id: uuid.UUID
     name: str
-    position: int
+    position: float
+    version: int = 0
     created_at: datetime
 
     class Config:
@@ -47,7 +54,10 @@ class ListResponse(BaseModel):
 class CardCreate(BaseModel):
     title: str
     description: Optional[str] = None
-    position: int = 0
+    # Either an explicit position or a neighbouring card; appended to the list otherwise
+    position: Optional[float] = None
+    after_card_id: Optional[uuid.UUID] = None
+    before_card_id: Optional[uuid.UUID] = None
 
 
 class CardUpdate(BaseModel):
@@ -58,7 +68,36 @@ class CardUpdate(BaseModel):
 
 class CardMove(BaseModel):
     list_id: uuid.UUID
-    position: int
+    # Either an explicit position or a neighbouring card in the target list; appended otherwise
+    position: Optional[float] = None
+    after_card_id: Optional[uuid.UUID] = None
+    before_card_id: Optional[uuid.UUID] = None
+
+
+class ListOrder(BaseModel):
+    list_ids: List[uuid.UUID] = Field(..., max_length=settings.BULK_MAX_ITEMS)
+
+
+class CardBulkItem(BaseModel):
+    title: str
+    description: Optional[str] = None
+    position: Optional[float] = None  # appended in request order when omitted
+
+
+class CardBulkCreate(BaseModel):
+    cards: List[CardBulkItem] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class CardBulkMove(BaseModel):
+    card_ids: List[uuid.UUID] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    list_id: uuid.UUID
+    # The cards are placed together, in order, next to this card; appended otherwise
+    after_card_id: Optional[uuid.UUID] = None
+    before_card_id: Optional[uuid.UUID] = None
+
+
+class CardOrder(BaseModel):
+    card_ids: List[uuid.UUID] = Field(..., max_length=settings.BULK_MAX_ITEMS)
 
 
 class CardResponse(BaseModel):
@@ -66,7 +105,8 @@ class CardResponse(BaseModel):
     list_id: uuid.UUID
     title: str
     description: Optional[str]
-    position: int
+    position: float
+    version: int = 0
     completed: bool
     created_at: datetime
     updated_at: datetime
@@ -79,7 +119,8 @@ class ListWithCardsResponse(BaseModel):
     id: uuid.UUID
     board_id: uuid.UUID
     name: str
-    position: int
+    position: float
+    version: int = 0
     created_at: datetime
     cards: List[CardResponse] = []
 
@@ -91,6 +132,7 @@ class BoardWithListsResponse(BaseModel):
     id: uuid.UUID
     name: str
     description: Optional[str]
+    version: int = 0
     created_at: datetime
     updated_at: datetime
     lists: List[ListWithCardsResponse] = []
@@ -99,6 +141,19 @@ class BoardWithListsResponse(BaseModel):
         from_attributes = True
 
 
+class DeletedEntity(BaseModel):
+    entity_type: str
+    id: uuid.UUID
+
+
+class BoardChangesResponse(BaseModel):
+    board: BoardResponse
+    version: int = 0
+    lists: List[ListResponse] = []
+    cards: List[CardResponse] = []
+    deleted: List[DeletedEntity] = []
+
+
 class ActivityResponse(BaseModel):
     id: uuid.UUID
     action: str
@@ -130,30 +185,94 @@ async def create_board(
 
 @router.get("/boards", response_model=List[BoardResponse])
 async def list_boards(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """List all boards"""
-    boards = await TaskService.get_boards(db, skip=skip, limit=limit)
-    return boards
+    """List boards in creation order
+
+    Pass the X-Next-Cursor response header back as `cursor` to get the next
+    page. `skip` still works for existing clients but falls back to OFFSET.
+    """
+    if skip:
+        return await TaskService.get_boards(db, skip=skip, limit=limit)
 
+    try:
+        page = await TaskService.get_boards_page(db, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
-@router.get("/boards/{board_id}")
+
+@router.get("/boards/export")
+async def export_boards(
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Stream every board as NDJSON"""
+    return StreamingResponse(
+        ndjson_stream(TaskService.iter_boards(db), BoardResponse),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@router.get("/boards/{board_id}", response_model=BoardWithListsResponse)
 async def get_board(
     board_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get board by ID with lists and cards"""
-    board = await TaskService.get_board(db, board_id)
-    if not board:
+    """Get board by ID with lists and cards
+
+    Served from the serialized board snapshot cache when possible; snapshots
+    are built from row tuples and encoded with orjson.
+    """
+    body = await board_cache.get(board_id)
+    if body is None:
+        generation = await board_cache.generation(board_id)
+        board = await TaskService.get_board_payload(db, board_id)
+        if not board:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Board not found"
+            )
+        body = orjson.dumps(board)
+        await board_cache.set(board_id, body, generation)
+
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/boards/{board_id}/changes", response_model=BoardChangesResponse)
+async def get_board_changes(
+    board_id: uuid.UUID,
+    since: int = Query(..., ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get lists and cards changed or removed after board version `since`
+
+    Clients start from the `version` of a full board fetch and pass the
+    `version` of each response as the next `since`. A `since` from before
+    the board's pruned tombstones gets 410 "snapshot_required": fetch the
+    full board again.
+    """
+    changes = await TaskService.get_board_changes(db, board_id, since)
+    if not changes:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Board not found"
         )
-    return BoardWithListsResponse.model_validate(board)
+    if changes.get("snapshot_required"):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="snapshot_required"
+        )
+    return Response(content=orjson.dumps(changes), media_type="application/json")
 
 
 @router.put("/boards/{board_id}", response_model=BoardResponse)
@@ -216,6 +335,26 @@ async def create_list(
     return list_obj
 
 
+@router.put("/boards/{board_id}/lists/order", response_model=List[ListResponse])
+async def reorder_lists(
+    board_id: uuid.UUID,
+    order: ListOrder,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Reorder all lists of a board in one transaction"""
+    try:
+        lists = await TaskService.reorder_lists(db, board_id, order.list_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if lists is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Board not found"
+        )
+    return lists
+
+
 @router.put("/lists/{list_id}", response_model=ListResponse)
 async def update_list(
     list_id: uuid.UUID,
@@ -248,13 +387,18 @@ async def create_card(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Create a new card in list"""
-    card = await TaskService.create_card(
-        db,
-        list_id,
-        title=card_data.title,
-        description=card_data.description,
-        position=card_data.position
-    )
+    try:
+        card = await TaskService.create_card(
+            db,
+            list_id,
+            title=card_data.title,
+            description=card_data.description,
+            position=card_data.position,
+            after_card_id=card_data.after_card_id,
+            before_card_id=card_data.before_card_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not card:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -263,6 +407,68 @@ async def create_card(
     return card
 
 
+@router.post("/lists/{list_id}/cards/bulk", response_model=List[CardResponse], status_code=status.HTTP_201_CREATED)
+async def create_cards(
+    list_id: uuid.UUID,
+    card_data: CardBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Create many cards in a list in one transaction"""
+    cards = await TaskService.create_cards(db, list_id, [card.model_dump() for card in card_data.cards])
+    if cards is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="List not found"
+        )
+    return cards
+
+
+@router.put("/lists/{list_id}/cards/order", response_model=List[CardResponse])
+async def reorder_cards(
+    list_id: uuid.UUID,
+    order: CardOrder,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Reorder all cards of a list in one transaction"""
+    try:
+        cards = await TaskService.reorder_cards(db, list_id, order.card_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cards is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="List not found"
+        )
+    return cards
+
+
+@router.put("/cards/move", response_model=List[CardResponse])
+async def move_cards(
+    move_data: CardBulkMove,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Move several cards into a list, kept together in the given order, in one transaction"""
+    try:
+        cards = await TaskService.move_cards(
+            db,
+            move_data.card_ids,
+            new_list_id=move_data.list_id,
+            after_card_id=move_data.after_card_id,
+            before_card_id=move_data.before_card_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cards is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="List not found"
+        )
+    return cards
+
+
 @router.put("/cards/{card_id}", response_model=CardResponse)
 async def update_card(
     card_id: uuid.UUID,
@@ -282,13 +488,18 @@ async def move_card(
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Move card to different list"""
-    card = await TaskService.move_card(
-        db,
-        card_id,
-        new_list_id=move_data.list_id,
-        new_position=move_data.position
-    )
+    """Move card to a list, after/before a neighbouring card or at an explicit position"""
+    try:
+        card = await TaskService.move_card(
+            db,
+            card_id,
+            new_list_id=move_data.list_id,
+            new_position=move_data.position,
+            after_card_id=move_data.after_card_id,
+            before_card_id=move_data.before_card_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not card:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -312,10 +523,20 @@ async def delete_card(
 @router.get("/boards/{board_id}/activity", response_model=List[ActivityResponse])
 async def get_board_activity(
     board_id: uuid.UUID,
+    response: Response,
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get activity log for board"""
-    activities = await TaskService.get_board_activity(db, board_id, limit=limit)
-    return activities
+    """Get activity log for board, newest first
+
+    Pass the X-Next-Cursor response header back as `cursor` to get older entries.
+    """
+    try:
+        page = await TaskService.get_board_activity_page(db, board_id, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -1,72 +1,125 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from app.services.broadcaster import ClientConnection, broadcaster, normalize_topic, STATUS_PAGE_TOPIC, MONITORS_TOPIC
+from app.services.coalescer import coalescer
+from app.services.event_bus import event_bus
+from app.utils.auth import get_current_active_user
 from app.utils.logger import logger
-from typing import List
-import json
-import asyncio
+from typing import Dict, List, Optional, Tuple
+import orjson
 
 router = APIRouter()
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+# Shared by both endpoints. The app lifespan feeds it from the event bus and
+# closes its connections on shutdown.
+manager = broadcaster
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket client connected. Total connections: {len(self.active_connections)}")
+PONG = orjson.dumps({"type": "pong"}).decode()
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        logger.info(f"WebSocket client disconnected. Total connections: {len(self.active_connections)}")
+# Topics each endpoint may subscribe to
+TASK_TOPICS = ("board",)
+MONITORING_TOPICS = ("monitor", MONITORS_TOPIC, STATUS_PAGE_TOPIC)
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
 
-    async def broadcast(self, message: dict):
-        message_str = json.dumps(message)
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_str)
-            except Exception as e:
-                logger.error(f"Error broadcasting to websocket: {e}")
+def frame(message: Dict) -> str:
+    return orjson.dumps(message).decode()
 
-manager = ConnectionManager()
 
+def handle_message(connection: ClientConnection, data: str, allowed: Tuple[str, ...]) -> List[str]:
+    """Frames to send back for one client message
 
-@router.websocket("/ws/monitoring")
-async def websocket_monitoring(websocket: WebSocket):
-    """WebSocket endpoint for real-time monitoring updates"""
-    await manager.connect(websocket)
+    Besides "ping", clients send {"action": "subscribe" | "unsubscribe",
+    "topics": [...]} to choose which updates they receive. A reconnecting
+    client adds "since": {topic: {"epoch": ..., "seq": ...}} from the last
+    frame it saw on each topic; it is sent the frames it missed, or a
+    "snapshot_required" message when they are no longer buffered or don't
+    fit in the connection's send queue alongside the other replies.
+    """
+    if data == "ping":
+        return [PONG]
+
+    try:
+        message = orjson.loads(data)
+        action = message["action"]
+        topics = message["topics"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        return [frame({"type": "error", "detail": "Expected ping or {\"action\": ..., \"topics\": [...]}"})]
+    if not isinstance(topics, list) or not all(isinstance(topic, str) for topic in topics):
+        return [frame({"type": "error", "detail": "topics must be a list of strings"})]
+
+    if action == "unsubscribe":
+        return [frame({"type": "unsubscribed", "topics": manager.unsubscribe(connection, topics)})]
+    if action != "subscribe":
+        return [frame({"type": "error", "detail": f"Unknown action: {action}"})]
+
+    refused = [topic for topic in topics if topic.partition(":")[0] not in allowed]
+    if refused:
+        return [frame({"type": "error", "detail": f"Unknown topic: {refused[0]}"})]
+    since = message.get("since") or {}
+    try:
+        positions = {topic: (str(since[topic]["epoch"]), int(since[topic]["seq"])) for topic in topics if topic in since}
+    except (KeyError, TypeError, ValueError):
+        return [frame({"type": "error", "detail": "since must map topics to {\"epoch\": ..., \"seq\": ...}"})]
+    try:
+        added = manager.subscribe(connection, topics)
+    except ValueError as e:
+        return [frame({"type": "error", "detail": str(e)})]
+
+    streams = {normalize_topic(topic): manager.position(topic) for topic in topics}
+    replies = [frame({"type": "subscribed", "topics": added, "streams": streams})]
+    # Replays must not overflow the send queue, or the slow consumer policy
+    # would disconnect the client or silently drop frames. Keep one slot per
+    # remaining topic for a snapshot_required message.
+    room = connection.room - 1 - len(positions)
+    for topic, (epoch, seq) in positions.items():
+        missed = manager.replay(topic, epoch, seq, limit=room + 1)
+        if missed is not None:
+            replies.extend(missed)
+            room -= len(missed) - 1
+        else:
+            replies.append(frame({"type": "snapshot_required", "topic": normalize_topic(topic), "stream": manager.position(topic)}))
+    return replies
+
+
+async def serve(websocket: WebSocket, allowed: Tuple[str, ...]):
+    """Register a client and answer its messages until it goes away; updates arrive via broadcast_update"""
+    connection = await manager.connect(websocket)
     try:
         while True:
             data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+            # Queued without awaiting, so no live frame can slip in between a
+            # subscription's replayed frames and what is published next
+            for reply in handle_message(connection, data, allowed):
+                connection.offer(reply)
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
-        manager.disconnect(websocket)
+        if not connection.closed:
+            logger.error(f"WebSocket error: {e}")
+    finally:
+        await manager.disconnect(connection)
+
+
+@router.websocket("/ws/monitoring")
+async def websocket_monitoring(websocket: WebSocket):
+    """WebSocket endpoint for real-time monitoring updates (monitor:<id>, monitors and status_page topics)"""
+    await serve(websocket, MONITORING_TOPICS)
 
 
 @router.websocket("/ws/tasks")
 async def websocket_tasks(websocket: WebSocket):
-    """WebSocket endpoint for real-time task board updates"""
-    await manager.connect(websocket)
-    try:
-        while True:
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
-        manager.disconnect(websocket)
+    """WebSocket endpoint for real-time task board updates (board:<id> topics)"""
+    await serve(websocket, TASK_TOPICS)
+
+
+@router.get("/api/metrics/websocket")
+async def get_websocket_metrics(
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get WebSocket connection count, subscriptions, queue depth, slow consumer, coalescing and event bus counts"""
+    return {**manager.stats(), "coalescer": coalescer.stats(), "event_bus": event_bus.stats()}
 
 
-async def broadcast_update(update_type: str, data: dict):
-    """Broadcast update to all connected clients"""
+async def broadcast_update(update_type: str, data: dict, topic: Optional[str] = None):
+    """Broadcast an update to a topic's subscribers on every worker, or to all clients without a topic"""
     message = {"type": update_type, "data": data}
-    await manager.broadcast(message)
+    await event_bus.publish(topic, message)
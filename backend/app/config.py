@@ -1,6 +1,6 @@
 # backend/app/config.py
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict
 
 class Settings(BaseSettings):
     # Application
@@ -18,10 +18,102 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = 10000  # verified tokens kept in memory
+    TOKEN_CACHE_TTL: int = 300  # seconds; never beyond the token's exp, 0 disables
+    BCRYPT_ROUNDS: int = 12  # work factor for new password hashes
+    PASSWORD_HASH_WORKERS: int = 4  # threads dedicated to bcrypt
     
     # Monitoring
     MONITOR_CHECK_INTERVAL: int = 30  # seconds
     ALERT_COOLDOWN: int = 300  # 5 minutes
+
+    # Check scheduler
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_MAX_CONCURRENCY: int = 100  # concurrent checks across all monitors
+    SCHEDULER_QUEUE_SIZE: int = 1000
+    SCHEDULER_JITTER: float = 1.0  # spread first runs over this fraction of the interval
+
+    # Health check HTTP client
+    CHECK_MAX_CONNECTIONS: int = 500
+    CHECK_MAX_CONNECTIONS_PER_HOST: int = 10
+    CHECK_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    CHECK_HTTP2: bool = True
+    CHECK_DNS_CACHE_TTL: int = 300  # seconds
+    CHECK_DNS_CACHE_SIZE: int = 10000  # hostnames kept
+
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared across workers)
+    RATE_LIMIT_DEFAULT: str = "100/60"  # requests/seconds per client IP
+    RATE_LIMIT_PER_USER: str = "100/60"  # requests/seconds per authenticated user
+    RATE_LIMIT_ROUTES: Dict[str, str] = {  # "[METHOD] /path/prefix" -> requests/seconds
+        "POST /api/auth/login": "10/60",
+        "POST /api/auth/register": "5/60",
+    }
+    RATE_LIMIT_MAX_KEYS: int = 100000  # in-memory backend only
+
+    # Board snapshot cache
+    BOARD_CACHE_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared across workers)
+    BOARD_CACHE_SIZE: int = 1000  # boards kept in memory
+    BOARD_CACHE_TTL: int = 300  # seconds; 0 disables
+
+    # List and card positions (fractional ranks)
+    POSITION_MIN_GAP: float = 1e-6  # neighbours closer than this are renumbered during the write
+    POSITION_REBALANCE_GAP: float = 0.01  # background job renumbers lists with gaps below this
+    POSITION_REBALANCE_INTERVAL: int = 300  # seconds
+
+    # Bulk card and list operations
+    BULK_MAX_ITEMS: int = 1000  # cards or lists per request
+
+    # WebSocket fan-out
+    WS_SEND_QUEUE_SIZE: int = 100  # outbound frames buffered per client
+    WS_SLOW_CONSUMER_POLICY: str = "disconnect"  # "disconnect" or "drop_oldest" when a client's queue is full
+    WS_SEND_TIMEOUT: float = 10.0  # seconds; a send taking longer closes the connection
+    WS_MAX_SUBSCRIPTIONS: int = 1000  # topics one connection may subscribe to
+    WS_COALESCE_WINDOW: float = 0.25  # seconds to batch check updates for; 0 sends each one immediately
+    # Replays that don't fit in a client's send queue get snapshot_required instead
+    WS_REPLAY_BUFFER_SIZE: int = 50  # recent frames kept per topic for reconnecting clients; 0 disables resume
+    WS_REPLAY_MAX_TOPICS: int = 1000  # topic buffers kept; buffers of subscribed topics are never evicted
+    EVENT_BUS_BACKEND: str = "memory"  # "memory" (single worker) or "redis" (updates reach clients on every worker)
+    EVENT_BUS_CHANNEL: str = "events"
+
+    # Board activity retention
+    ACTIVITY_RETENTION_ENABLED: bool = True
+    ACTIVITY_RETENTION_DAYS: int = 90  # older activity is moved to activity_archive
+    ACTIVITY_ARCHIVE_RETENTION_DAYS: int = 0  # archived activity is deleted after this; 0 keeps it
+    ACTIVITY_RETENTION_INTERVAL: int = 3600  # seconds
+    ACTIVITY_RETENTION_BATCH_SIZE: int = 5000
+    BOARD_TOMBSTONE_RETENTION_DAYS: int = 30  # older tombstones are pruned; syncs from before them need a full fetch
+
+    # Audit log writer
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL: float = 1.0  # seconds
+    AUDIT_OVERFLOW_POLICY: str = "drop"  # "drop" or "block" when the queue is full
+    AUDIT_BLOCK_TIMEOUT: float = 0.5  # seconds a request waits for room under "block"
+    AUDIT_MAX_ATTEMPTS: int = 3  # writes of a rejected audit row before it is dropped
+    AUDIT_MAX_BODY_CAPTURE: int = 65536  # bytes of request body kept for the audit trail
+
+    # Check result sink
+    CHECK_SINK_BATCH_SIZE: int = 500
+    CHECK_SINK_FLUSH_INTERVAL: float = 1.0  # seconds
+    CHECK_SINK_MAX_PENDING: int = 5000
+
+    # Uptime rollups
+    ROLLUP_ENABLED: bool = True
+    ROLLUP_MIN_WINDOW_HOURS: int = 24  # uptime windows this long are read from rollups
+    ROLLUP_COMPACTION_INTERVAL: int = 300  # seconds
+    ROLLUP_COMPACTION_LOOKBACK_HOURS: int = 2
+    ROLLUP_BACKFILL_HOURS: int = 24  # recomputed on the first compaction after startup
+    ROLLUP_BACKFILL_CHUNK_HOURS: int = 24  # checks older than the first rollup are backfilled this many hours per transaction
+
+    # Public status page snapshot
+    STATUS_PAGE_MIN_REFRESH: int = 5  # seconds; also the Cache-Control max-age
+    STATUS_PAGE_MAX_AGE: int = 60  # seconds; rebuilt at least this often
+
+    # Dashboard metrics cache (per user)
+    DASHBOARD_CACHE_TTL: float = 10.0  # seconds
+    DASHBOARD_CACHE_MAXSIZE: int = 1000
     
     # AI Agents
     ENABLE_AI_AGENTS: bool = True
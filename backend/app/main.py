@@ -1,10 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.config import settings
 from app.utils.logger import logger
 from app.utils.middleware import AuditMiddleware, RateLimitMiddleware
 from app.utils.database import engine, Base
-from app.api import auth, tasks, monitoring, websocket
+from app.utils.periodic import PeriodicTask
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.rate_limit import create_rate_limiter
+from app.utils.auth import shutdown_password_hash_executor
+from app.services.rollup_service import RollupCompactionJob
+from app.services.task_service import PositionRebalanceJob
+from app.services.activity_retention import ActivityRetentionJob
+from app.services.event_bus import event_bus
+from app.api import auth, tasks, monitoring, websocket, audit
 from contextlib import asynccontextmanager
 
 
@@ -18,10 +27,48 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created/verified")
 
+    # Start the background audit log writer
+    await audit.audit_queue.start()
+
+    # Start health check scheduler and its batched result writer
+    monitor_service = monitoring.monitor_service
+    if settings.SCHEDULER_ENABLED:
+        await monitor_service.result_sink.start()
+        await monitor_service.scheduler.start()
+
+    # Keep uptime rollups compacted
+    rollup_compaction = PeriodicTask("rollup compaction", settings.ROLLUP_COMPACTION_INTERVAL, RollupCompactionJob())
+    if settings.ROLLUP_ENABLED:
+        await rollup_compaction.start()
+
+    # Renumber crowded lists before moves run out of room between neighbours
+    position_rebalance = PeriodicTask("position rebalance", settings.POSITION_REBALANCE_INTERVAL, PositionRebalanceJob())
+    await position_rebalance.start()
+
+    # Move old board activity to the archive table
+    activity_retention = PeriodicTask("activity retention", settings.ACTIVITY_RETENTION_INTERVAL, ActivityRetentionJob())
+    if settings.ACTIVITY_RETENTION_ENABLED:
+        await activity_retention.start()
+
+    # Deliver published updates (from any worker, with the redis bus) to this worker's
+    # WebSocket clients, batching check results on the way
+    await event_bus.start(websocket.coalescer.publish)
+
     yield
 
     # Cleanup
     logger.info("Shutting down application")
+    await event_bus.stop()
+    websocket.coalescer.flush()
+    await websocket.manager.close_all()
+    await activity_retention.stop()
+    await position_rebalance.stop()
+    await rollup_compaction.stop()
+    await monitor_service.scheduler.stop()
+    await monitor_service.result_sink.stop()
+    await monitor_service.http_client.aclose()
+    await audit.audit_queue.stop()
+    shutdown_password_hash_executor()
     await engine.dispose()
 
 
@@ -30,6 +77,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     description="AI-first MVP combining task management and operational reliability monitoring",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -40,17 +88,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER],
 )
 
 # Custom middleware
-app.add_middleware(AuditMiddleware)
-app.add_middleware(RateLimitMiddleware, max_requests=100, window=60)
+app.add_middleware(AuditMiddleware, queue=audit.audit_queue)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=create_rate_limiter())
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(tasks.router)
 app.include_router(monitoring.router)
 app.include_router(websocket.router)
+app.include_router(audit.router)
 
 
 @app.get("/")
@@ -1,11 +1,11 @@
-from app.models.task import Board, List, Card, Label, CardLabel, Activity, LabelColor
+from app.models.task import Board, List, Card, BoardTombstone, Label, CardLabel, Activity, ActivityArchive, LabelColor
 from app.models.monitor import (
     Monitor, Check, Incident, IncidentUpdate, StatusPage, Metric,
     MonitorStatus, MonitorType, IncidentStatus, IncidentSeverity
 )
 
 __all__ = [
-    "Board", "List", "Card", "Label", "CardLabel", "Activity", "LabelColor",
+    "Board", "List", "Card", "BoardTombstone", "Label", "CardLabel", "Activity", "ActivityArchive", "LabelColor",
     "Monitor", "Check", "Incident", "IncidentUpdate", "StatusPage", "Metric",
     "MonitorStatus", "MonitorType", "IncidentStatus", "IncidentSeverity"
 ]
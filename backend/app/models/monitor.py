@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Float, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Float, Index, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -42,6 +42,11 @@ class Monitor(Base):
     incidents = relationship("Incident", back_populates="monitor", cascade="all, delete-orphan")
     metrics = relationship("Metric", back_populates="monitor", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_monitors_created_at_id", "created_at", "id"),
+    )
+
 
 class Check(Base):
     __tablename__ = "checks"
@@ -52,10 +57,15 @@ class Check(Base):
     response_time = Column(Float, nullable=True)  # milliseconds
     status_code = Column(Integer, nullable=True)
     error_message = Column(Text, nullable=True)
-    checked_at = Column(DateTime, default=datetime.utcnow)
+    checked_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     monitor = relationship("Monitor", back_populates="checks")
 
+    __table_args__ = (
+        # Uptime queries scan one monitor over a time window
+        Index("ix_checks_monitor_id_checked_at", "monitor_id", "checked_at"),
+    )
+
 
 class IncidentStatus(str, enum.Enum):
     INVESTIGATING = "investigating"
@@ -119,8 +129,10 @@ class Metric(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     monitor_id = Column(UUID(as_uuid=True), ForeignKey("monitors.id"), nullable=False)
+    granularity = Column(String(10), nullable=False, default="hour")  # rollups are hourly
     uptime_percentage = Column(Float, nullable=False)
     avg_response_time = Column(Float, nullable=False)  # milliseconds
+    response_time_count = Column(Integer, nullable=False, default=0)  # checks with a response time
     total_checks = Column(Integer, nullable=False)
     failed_checks = Column(Integer, nullable=False)
     period_start = Column(DateTime, nullable=False)
@@ -128,3 +140,7 @@ class Metric(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     monitor = relationship("Monitor", back_populates="metrics")
+
+    __table_args__ = (
+        UniqueConstraint("monitor_id", "granularity", "period_start", name="uq_metrics_bucket"),
+    )
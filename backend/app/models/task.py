@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,10 +17,17 @@ class Board(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     deleted_at = Column(DateTime, nullable=True)
     user_id = Column(UUID(as_uuid=True), nullable=True)
+    version = Column(Integer, nullable=False, default=0)  # bumped by every write to the board or its lists/cards
+    sync_horizon = Column(Integer, nullable=False, default=0)  # tombstones up to this version were pruned
 
-    lists = relationship("List", back_populates="board", cascade="all, delete-orphan")
+    lists = relationship("List", back_populates="board", cascade="all, delete-orphan", order_by="List.position")
     activities = relationship("Activity", back_populates="board", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_boards_created_at_id", "created_at", "id"),
+    )
+
 
 class List(Base):
     __tablename__ = "lists"
@@ -28,12 +35,18 @@ class List(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     board_id = Column(UUID(as_uuid=True), ForeignKey("boards.id"), nullable=False)
     name = Column(String(255), nullable=False)
-    position = Column(Integer, nullable=False, default=0)
+    position = Column(Float, nullable=False, default=0)  # fractional rank, see app.utils.positions
+    version = Column(Integer, nullable=False, default=0)  # board version of the last change
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     board = relationship("Board", back_populates="lists")
-    cards = relationship("Card", back_populates="list", cascade="all, delete-orphan")
+    cards = relationship("Card", back_populates="list", cascade="all, delete-orphan", order_by="Card.position")
+
+    __table_args__ = (
+        Index("ix_lists_board_id_position", "board_id", "position"),
+        Index("ix_lists_board_id_version", "board_id", "version"),
+    )
 
 
 class Card(Base):
@@ -43,7 +56,8 @@ class Card(Base):
     list_id = Column(UUID(as_uuid=True), ForeignKey("lists.id"), nullable=False)
     title = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
-    position = Column(Integer, nullable=False, default=0)
+    position = Column(Float, nullable=False, default=0)  # fractional rank, see app.utils.positions
+    version = Column(Integer, nullable=False, default=0)  # board version of the last change
     due_date = Column(DateTime, nullable=True)
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -52,6 +66,31 @@ class Card(Base):
     list = relationship("List", back_populates="cards")
     labels = relationship("CardLabel", back_populates="card", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Neighbour lookups when placing a card
+        Index("ix_cards_list_id_position", "list_id", "position"),
+        # Incremental board sync
+        Index("ix_cards_list_id_version", "list_id", "version"),
+    )
+
+
+class BoardTombstone(Base):
+    """A list or card that left a board, so incremental sync can tell clients to drop it"""
+    __tablename__ = "board_tombstones"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    board_id = Column(UUID(as_uuid=True), ForeignKey("boards.id"), nullable=False)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    version = Column(Integer, nullable=False)  # board version at removal
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_board_tombstones_board_id_version", "board_id", "version"),
+        # Pruning by age
+        Index("ix_board_tombstones_created_at", "created_at"),
+    )
+
 
 class LabelColor(str, enum.Enum):
     RED = "red"
@@ -96,3 +135,30 @@ class Activity(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     board = relationship("Board", back_populates="activities")
+
+    __table_args__ = (
+        # Board history, newest first (keyset pagination)
+        Index("ix_activities_board_id_timestamp_id", "board_id", "timestamp", "id"),
+        # Retention scans
+        Index("ix_activities_timestamp", "timestamp"),
+    )
+
+
+class ActivityArchive(Base):
+    """Activity rows moved out of the live table by the retention job"""
+    __tablename__ = "activity_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    board_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    action = Column(String(100), nullable=False)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    details = Column(Text, nullable=True)
+    timestamp = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_activity_archive_board_id_timestamp", "board_id", "timestamp"),
+        Index("ix_activity_archive_timestamp", "timestamp"),
+    )
@@ -1,6 +1,11 @@
 from app.services.task_service import TaskService
 from app.services.monitor_service import MonitorService
+from app.services.scheduler import CheckScheduler
+from app.services.check_sink import CheckResultSink
+from app.services.status_page_cache import StatusPageCache
 from app.services.alert_service import AlertService
 from app.services.audit_service import AuditService, AuditLog
+from app.services.audit_queue import AuditLogQueue
+from app.services.broadcaster import Broadcaster
 
-__all__ = ["TaskService", "MonitorService", "AlertService", "AuditService", "AuditLog"]
+__all__ = ["TaskService", "MonitorService", "CheckScheduler", "CheckResultSink", "StatusPageCache", "AlertService", "AuditService", "AuditLog", "AuditLogQueue", "Broadcaster"]
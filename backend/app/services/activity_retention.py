@@ -0,0 +1,128 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, and_
+from app.models import Activity, ActivityArchive, Board, BoardTombstone
+from app.utils.database import AsyncSessionLocal
+from app.utils.logger import logger
+from app.config import settings
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+
+ARCHIVED_COLUMNS = ("id", "board_id", "user_id", "action", "entity_type", "entity_id", "details", "timestamp")
+
+
+class ActivityRetentionService:
+    @staticmethod
+    async def archive(db: AsyncSession, before: datetime, batch_size: Optional[int] = None, max_batches: int = 100) -> int:
+        """Move activity older than `before` to activity_archive, oldest first
+
+        Each batch is copied and deleted in its own transaction, so the live
+        table is never locked for long and an interrupted run loses nothing.
+        Returns the number of rows moved.
+        """
+        batch_size = batch_size or settings.ACTIVITY_RETENTION_BATCH_SIZE
+        moved = 0
+
+        for _ in range(max_batches):
+            result = await db.execute(
+                select(Activity.id).where(Activity.timestamp < before).order_by(Activity.timestamp).limit(batch_size)
+            )
+            ids = result.scalars().all()
+            if not ids:
+                break
+
+            columns = [getattr(Activity, name) for name in ARCHIVED_COLUMNS]
+            await db.execute(
+                insert(ActivityArchive).from_select(ARCHIVED_COLUMNS, select(*columns).where(Activity.id.in_(ids)))
+            )
+            await db.execute(delete(Activity).where(Activity.id.in_(ids)))
+            await db.commit()
+
+            moved += len(ids)
+            if len(ids) < batch_size:
+                break
+
+        return moved
+
+    @staticmethod
+    async def purge_archive(db: AsyncSession, before: datetime) -> int:
+        """Permanently delete archived activity older than `before`"""
+        result = await db.execute(delete(ActivityArchive).where(ActivityArchive.timestamp < before))
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def prune_tombstones(db: AsyncSession, before: datetime, batch_size: Optional[int] = None, max_batches: int = 100) -> int:
+        """Delete board tombstones created before `before`, oldest first
+
+        Each board's sync_horizon is raised to the newest version pruned from
+        it in the same transaction, so incremental syncs from before that
+        version are told to fetch the full board instead of missing removals.
+        Returns the number of tombstones deleted.
+        """
+        batch_size = batch_size or settings.ACTIVITY_RETENTION_BATCH_SIZE
+        pruned = 0
+
+        for _ in range(max_batches):
+            result = await db.execute(
+                select(BoardTombstone.id, BoardTombstone.board_id, BoardTombstone.version)
+                .where(BoardTombstone.created_at < before)
+                .order_by(BoardTombstone.created_at)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            horizons: Dict = {}
+            for _, board_id, version in rows:
+                horizons[board_id] = max(version, horizons.get(board_id, 0))
+            for board_id, version in horizons.items():
+                await db.execute(
+                    update(Board)
+                    .where(and_(Board.id == board_id, Board.sync_horizon < version))
+                    .values(sync_horizon=version, updated_at=Board.updated_at)
+                )
+            await db.execute(delete(BoardTombstone).where(BoardTombstone.id.in_([row[0] for row in rows])))
+            await db.commit()
+
+            pruned += len(rows)
+            if len(rows) < batch_size:
+                break
+
+        return pruned
+
+    @staticmethod
+    async def run_retention(db: AsyncSession, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Periodic job: archive activity past ACTIVITY_RETENTION_DAYS, purge the archive past its own
+        limit and prune board tombstones past BOARD_TOMBSTONE_RETENTION_DAYS"""
+        now = now or datetime.utcnow()
+        stats = {
+            "archived": await ActivityRetentionService.archive(
+                db, now - timedelta(days=settings.ACTIVITY_RETENTION_DAYS)
+            ),
+            "purged": 0,
+            "tombstones_pruned": await ActivityRetentionService.prune_tombstones(
+                db, now - timedelta(days=settings.BOARD_TOMBSTONE_RETENTION_DAYS)
+            )
+        }
+        if settings.ACTIVITY_ARCHIVE_RETENTION_DAYS > 0:
+            stats["purged"] = await ActivityRetentionService.purge_archive(
+                db, now - timedelta(days=settings.ACTIVITY_ARCHIVE_RETENTION_DAYS)
+            )
+        return stats
+
+
+class ActivityRetentionJob:
+    """Periodic activity archival"""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def __call__(self):
+        async with self.session_factory() as db:
+            stats = await ActivityRetentionService.run_retention(db)
+        if any(stats.values()):
+            logger.info(
+                f"Activity retention: archived {stats['archived']}, purged {stats['purged']}, "
+                f"pruned {stats['tombstones_pruned']} board tombstones"
+            )
@@ -0,0 +1,244 @@
+from sqlalchemy import insert, String
+from app.services.audit_service import AuditLog
+from app.utils.database import AsyncSessionLocal, TRANSIENT_ERRORS
+from app.utils.logger import logger
+from app.config import settings
+from typing import Optional, Dict, List as ListType, Tuple
+from datetime import datetime
+import asyncio
+import time
+import uuid
+
+OVERFLOW_POLICIES = ("drop", "block")
+
+# Every queued row carries all of these so a batch can be written with one executemany INSERT
+AUDIT_FIELDS = (
+    "user_id", "action", "resource_type", "resource_id", "method", "endpoint", "ip_address",
+    "user_agent", "request_body", "response_status", "changes", "details"
+)
+
+# Column sizes of the bounded string fields; longer values (user agents, paths) are cut to fit
+STRING_LIMITS = {
+    column.name: column.type.length
+    for column in AuditLog.__table__.columns
+    if isinstance(column.type, String) and column.type.length
+}
+
+
+class AuditLogQueue:
+    """Bounded in-memory queue of audit events drained by a background writer.
+
+    Requests only enqueue an event; the writer inserts them in batches of up to
+    batch_size rows, at least every flush_interval seconds. When the queue is
+    full the overflow policy decides: "drop" discards the event immediately,
+    "block" waits up to block_timeout seconds for room before dropping it.
+    Events still queued at shutdown are flushed by stop().
+
+    A batch that fails because the database is unreachable is retried as a
+    whole. Any other failure is retried row by row, so one bad row can't hold
+    back the rest; a row that fails max_attempts times is dropped and logged.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        max_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        overflow_policy: Optional[str] = None,
+        block_timeout: Optional[float] = None,
+        max_attempts: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.max_size = max_size or settings.AUDIT_QUEUE_MAX_SIZE
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.AUDIT_FLUSH_INTERVAL
+        self.overflow_policy = overflow_policy or settings.AUDIT_OVERFLOW_POLICY
+        self.block_timeout = settings.AUDIT_BLOCK_TIMEOUT if block_timeout is None else block_timeout
+        self.max_attempts = max_attempts or settings.AUDIT_MAX_ATTEMPTS
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy: {self.overflow_policy}")
+
+        # Items are (enqueued_at monotonic, row)
+        self._queue: asyncio.Queue[Tuple[float, Dict]] = asyncio.Queue(maxsize=self.max_size)
+        self._retry: ListType[Tuple[float, Dict]] = []
+        self._attempts: Dict[uuid.UUID, int] = {}  # failed row writes, by row id
+        self._stopping = False
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.failed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() + len(self._retry)
+
+    async def start(self):
+        if not self.running:
+            self._stopping = False
+            self._task = asyncio.create_task(self._writer_loop())
+            logger.info(f"Audit log writer started (batch_size={self.batch_size}, policy={self.overflow_policy})")
+
+    async def stop(self, timeout: float = 10.0):
+        """Drain the queue and stop the writer, giving up after `timeout` seconds"""
+        if not self._task:
+            return
+        self._stopping = True
+        self._flush_requested.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Audit log writer did not drain in {timeout}s, {self.depth} events lost")
+        self._task = None
+        logger.info("Audit log writer stopped")
+
+    async def enqueue(self, **fields) -> bool:
+        """Queue one audit event. Returns False if it was dropped because the queue is full."""
+        row = {name: fields.get(name) for name in AUDIT_FIELDS}
+        for name, limit in STRING_LIMITS.items():
+            if isinstance(row.get(name), str):
+                row[name] = row[name][:limit]
+        row["id"] = uuid.uuid4()
+        row["timestamp"] = fields.get("timestamp") or datetime.utcnow()
+        item = (time.monotonic(), row)
+
+        try:
+            if self.overflow_policy == "block":
+                await asyncio.wait_for(self._queue.put(item), self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Audit queue full, {self.dropped} events dropped so far")
+            return False
+
+        self.enqueued += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._flush_requested.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write everything queued right now. Returns the number of rows written."""
+        written = 0
+        async with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return written
+                written += await self._write(batch)
+                if self._retry:
+                    return written
+
+    def stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "queue_depth": self.depth,
+            "max_size": self.max_size,
+            "overflow_policy": self.overflow_policy,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "failed": self.failed,
+            "lag_seconds": {"last": round(self.last_lag, 4), "max": round(self.max_lag, 4)}
+        }
+
+    def _take_batch(self) -> ListType[Tuple[float, Dict]]:
+        if self._retry:
+            batch, self._retry = self._retry, []
+            return batch
+
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _insert(self, rows: ListType[Dict]):
+        async with self.session_factory() as db:
+            await db.execute(insert(AuditLog), rows)
+            await db.commit()
+
+    async def _write(self, batch: ListType[Tuple[float, Dict]]) -> int:
+        """Write a batch; returns the rows written. Rows to try again are left in _retry."""
+        try:
+            await self._insert([row for _, row in batch])
+        except Exception as e:
+            self.write_errors += 1
+            if isinstance(e, TRANSIENT_ERRORS):
+                logger.error(f"Failed to write {len(batch)} audit events, will retry: {e}")
+                # Retried before anything newer; the bounded queue keeps memory in check meanwhile
+                self._retry = batch
+                return 0
+            logger.error(f"Failed to write {len(batch)} audit events, retrying one at a time: {e}")
+            return await self._write_rows(batch)
+
+        self._record(batch)
+        self.batches += 1
+        return len(batch)
+
+    async def _write_rows(self, batch: ListType[Tuple[float, Dict]]) -> int:
+        written = 0
+        retry = []
+        for i, item in enumerate(batch):
+            row_id = item[1]["id"]
+            try:
+                await self._insert([item[1]])
+            except TRANSIENT_ERRORS as e:
+                logger.error(f"Audit database unavailable, will retry: {e}")
+                retry.extend(batch[i:])
+                break
+            except Exception as e:
+                attempts = self._attempts.pop(row_id, 0) + 1
+                if attempts >= self.max_attempts:
+                    self.failed += 1
+                    logger.error(f"Dropping audit event {row_id} after {attempts} failed writes: {e}")
+                else:
+                    self._attempts[row_id] = attempts
+                    retry.append(item)
+            else:
+                self._attempts.pop(row_id, None)
+                self._record([item])
+                written += 1
+
+        self._retry = retry
+        return written
+
+    def _record(self, written: ListType[Tuple[float, Dict]]):
+        lag = time.monotonic() - written[0][0]
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.written += len(written)
+
+    async def _writer_loop(self):
+        while True:
+            if not self._stopping:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+
+            queued = self.depth
+            written = await self.flush()
+            if self._stopping and (self.depth == 0 or written < queued):
+                return
+            if written < queued:
+                await asyncio.sleep(self.flush_interval)
@@ -1,10 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import Column, String, DateTime, Text, Integer
+from sqlalchemy import Column, String, DateTime, Text, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID, JSON
-from sqlalchemy import select
+from sqlalchemy import select, Select
 from app.utils.database import Base
 from app.utils.logger import logger
-from typing import Optional, Dict, Any, List as ListType
+from app.utils.pagination import Page, keyset, fetch_page, stream_scalars
+from typing import Optional, Dict, Any, AsyncIterator, List as ListType
 from datetime import datetime, timedelta
 import uuid
 import json
@@ -29,6 +30,11 @@ class AuditLog(Base):
     changes = Column(JSON, nullable=True)  # Before/after values
     details = Column(Text, nullable=True)
 
+    __table_args__ = (
+        # Keyset pagination order (newest first)
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+    )
+
 
 class AuditService:
     @staticmethod
@@ -112,6 +118,51 @@ class AuditService:
         limit: int = 100
     ) -> ListType[AuditLog]:
         """Query audit logs with filters"""
+        query = AuditService._filtered_logs(user_id, resource_type, action, start_date, end_date)
+        query = query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit)
+
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_audit_logs_page(
+        db: AsyncSession,
+        user_id: Optional[uuid.UUID] = None,
+        resource_type: Optional[str] = None,
+        action: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Page:
+        """Newest-first page of audit logs after `cursor` (keyset pagination)"""
+        query = AuditService._filtered_logs(user_id, resource_type, action, start_date, end_date)
+        query = keyset(query, AuditLog.timestamp, AuditLog.id, cursor, descending=True)
+        return await fetch_page(db, query, limit, lambda log: (log.timestamp, log.id))
+
+    @staticmethod
+    async def iter_audit_logs(
+        db: AsyncSession,
+        user_id: Optional[uuid.UUID] = None,
+        resource_type: Optional[str] = None,
+        action: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> AsyncIterator[AuditLog]:
+        """Stream every matching audit log, newest first, without loading them all"""
+        query = AuditService._filtered_logs(user_id, resource_type, action, start_date, end_date)
+        query = keyset(query, AuditLog.timestamp, AuditLog.id, descending=True)
+        async for log in stream_scalars(db, query):
+            yield log
+
+    @staticmethod
+    def _filtered_logs(
+        user_id: Optional[uuid.UUID],
+        resource_type: Optional[str],
+        action: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Select:
         query = select(AuditLog)
 
         if user_id:
@@ -125,10 +176,7 @@ class AuditService:
         if end_date:
             query = query.where(AuditLog.timestamp <= end_date)
 
-        query = query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit)
-
-        result = await db.execute(query)
-        return result.scalars().all()
+        return query
 
     @staticmethod
     async def get_resource_history(
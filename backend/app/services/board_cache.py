@@ -0,0 +1,132 @@
+from app.utils.cache import TTLCache
+from app.utils.logger import logger
+from app.config import settings
+from typing import Dict, Optional
+import uuid
+
+# KEYS: snapshot, generation; ARGV: body, expected generation, ttl
+SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[2] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class BoardCache:
+    """Read model cache of serialized board snapshots (board + lists + cards).
+
+    Entries are JSON bytes ready to send. Writes go through TaskService, which
+    invalidates the affected boards after committing. A snapshot loaded
+    concurrently with an invalidation is not stored: callers take a
+    generation() token before loading and pass it to set(). With the redis
+    backend the generations live in Redis too (INCR on invalidate, a
+    compare-and-set script on store), so the guard holds across workers.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None, redis_client=None, prefix: str = "board:"):
+        self.ttl = settings.BOARD_CACHE_TTL if ttl is None else ttl
+        self.maxsize = maxsize or settings.BOARD_CACHE_SIZE
+        self.redis = redis_client
+        self.prefix = prefix
+        self._local = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        self._generations = TTLCache(maxsize=self.maxsize * 4, ttl=self.ttl * 2)
+
+        # Metrics (the local TTLCache keeps its own for the in-process backend)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def generation(self, board_id: uuid.UUID) -> int:
+        """Token to pass to set(); -1 if it can't be read, which never matches"""
+        if self.redis is None:
+            return self._generations.get(board_id, 0, count=False)
+        try:
+            value = await self.redis.get(f"{self.prefix}{board_id}:gen")
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Board cache generation read failed: {e}")
+            return -1
+        return int(value or 0)
+
+    async def get(self, board_id: uuid.UUID) -> Optional[bytes]:
+        if self.redis is not None:
+            try:
+                body = await self.redis.get(f"{self.prefix}{board_id}")
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Board cache read failed: {e}")
+                body = None
+        else:
+            body = self._local.get(board_id)
+
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def set(self, board_id: uuid.UUID, body: bytes, generation: Optional[int] = None):
+        """Store a snapshot unless the board was invalidated since `generation` was taken"""
+        if self.ttl <= 0:
+            return
+
+        if self.redis is not None:
+            key = f"{self.prefix}{board_id}"
+            try:
+                if generation is None:
+                    await self.redis.set(key, body, ex=max(int(self.ttl), 1))
+                else:
+                    await self.redis.eval(SET_IF_GENERATION, 2, key, f"{key}:gen", body, generation, max(int(self.ttl), 1))
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Board cache write failed: {e}")
+        elif generation is None or generation == self._generations.get(board_id, 0, count=False):
+            self._local.set(board_id, body)
+
+    async def invalidate(self, *board_ids: uuid.UUID):
+        for board_id in set(board_ids):
+            if board_id is None:
+                continue
+            self.invalidations += 1
+            if self.redis is not None:
+                key = f"{self.prefix}{board_id}"
+                try:
+                    # Bump the generation first, so a rebuild racing the
+                    # delete can no longer store what it loaded
+                    await self.redis.incr(f"{key}:gen")
+                    await self.redis.expire(f"{key}:gen", max(int(self.ttl), 1) * 2)
+                    await self.redis.delete(key)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Board cache invalidation failed: {e}")
+            else:
+                self._generations.set(board_id, self._generations.get(board_id, 0, count=False) + 1)
+                self._local.delete(board_id)
+
+    async def clear(self):
+        self._local.clear()
+        self._generations.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "redis" if self.redis is not None else "memory",
+            "size": len(self._local) if self.redis is None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors
+        }
+
+
+def create_board_cache() -> BoardCache:
+    """Build the application's board cache from settings"""
+    if settings.BOARD_CACHE_BACKEND == "redis":
+        import redis.asyncio as redis
+        return BoardCache(redis_client=redis.from_url(settings.REDIS_URL))
+    return BoardCache()
+
+
+board_cache = create_board_cache()
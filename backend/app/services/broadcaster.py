@@ -0,0 +1,342 @@
+from fastapi import WebSocket
+from app.utils.logger import logger
+from app.config import settings
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+from collections import OrderedDict, deque
+import asyncio
+import orjson
+import secrets
+import uuid
+
+SLOW_CONSUMER_POLICIES = ("disconnect", "drop_oldest")
+
+# Close code for clients that can't keep up ("Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# Topics are "board:<id>", "monitor:<id>", the status page, or the batched
+# feed of every monitor's checks
+TOPIC_KINDS = ("board", "monitor")
+STATUS_PAGE_TOPIC = "status_page"
+MONITORS_TOPIC = "monitors"
+
+
+def board_topic(board_id: uuid.UUID) -> str:
+    return f"board:{board_id}"
+
+
+def monitor_topic(monitor_id: uuid.UUID) -> str:
+    return f"monitor:{monitor_id}"
+
+
+def normalize_topic(topic: str) -> Optional[str]:
+    """Canonical form of a topic name, or None if it isn't one"""
+    if topic in (STATUS_PAGE_TOPIC, MONITORS_TOPIC):
+        return topic
+    kind, _, entity_id = topic.partition(":")
+    if kind not in TOPIC_KINDS:
+        return None
+    try:
+        return f"{kind}:{uuid.UUID(entity_id)}"
+    except ValueError:
+        return None
+
+
+class TopicBuffer:
+    """The most recent frames published to one topic, numbered by sequence.
+
+    `epoch` identifies this run of numbers: a buffer created again (after
+    eviction, a restart, or on another worker) starts a new epoch, so a
+    client can't resume from a sequence number it didn't get from here.
+    """
+
+    def __init__(self, size: int):
+        self.epoch = secrets.token_hex(4)
+        self.seq = 0
+        self.frames: Deque[Tuple[int, str]] = deque(maxlen=size)
+
+    def since(self, seq: int) -> Optional[List[str]]:
+        """Frames after `seq`, or None if some of them are no longer buffered"""
+        oldest = self.frames[0][0] if self.frames else self.seq + 1
+        if seq > self.seq or seq < oldest - 1:
+            return None
+        return [frame for frame_seq, frame in self.frames if frame_seq > seq]
+
+
+class ClientConnection:
+    """One WebSocket client: a bounded queue of outbound frames and the task writing them.
+
+    Frames are queued without waiting on the socket. When the queue is full
+    the slow consumer policy applies: "disconnect" closes the socket (the
+    client reconnects and refetches), "drop_oldest" discards the oldest
+    queued frame to make room. A send that fails or takes longer than
+    send_timeout also closes the connection.
+    """
+
+    def __init__(self, websocket: WebSocket, broadcaster: "Broadcaster"):
+        self.websocket = websocket
+        self.broadcaster = broadcaster
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=broadcaster.queue_size)
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.topics: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._close_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+
+    @property
+    def room(self) -> int:
+        """Frames that can be queued right now without the slow consumer policy kicking in"""
+        return self.queue.maxsize - self.queue.qsize()
+
+    def offer(self, frame: str) -> bool:
+        """Queue a frame for this client; False if it was dropped or the client is gone"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.broadcaster.slow_consumer_policy == "drop_oldest":
+            self.queue.get_nowait()
+            self.queue.put_nowait(frame)
+            self.dropped += 1
+            self.broadcaster.dropped += 1
+            return True
+
+        # Stop offering frames right away; the close itself happens off the publish path
+        self.broadcaster.unregister(self)
+        self.broadcaster.slow_disconnects += 1
+        logger.warning("Disconnecting slow WebSocket consumer")
+        self._close_task = asyncio.create_task(self.close(SLOW_CONSUMER_CLOSE_CODE))
+        return False
+
+    async def _writer(self):
+        try:
+            while True:
+                frame = await self.queue.get()
+                async with asyncio.timeout(self.broadcaster.send_timeout):
+                    await self.websocket.send_text(frame)
+                self.sent += 1
+                self.broadcaster.frames_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.broadcaster.send_errors += 1
+            logger.info(f"WebSocket send failed, closing connection: {e}")
+            await self.close(SLOW_CONSUMER_CLOSE_CODE)
+
+    async def close(self, code: int = 1000):
+        """Stop writing and close the socket; safe to call more than once"""
+        if self.closed:
+            return
+        self.closed = True
+        self.broadcaster.unregister(self)
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        try:
+            await asyncio.wait_for(self.websocket.close(code), self.broadcaster.send_timeout)
+        except Exception:
+            pass  # already closed or unresponsive
+
+
+class Broadcaster:
+    """Fans messages out to connected WebSocket clients.
+
+    publish() serializes a message once and queues the frame on every
+    subscribed connection without awaiting any socket, so one slow client
+    can't delay the others; each connection's writer task drains its own
+    queue. Subscriptions are kept in a topic -> connections index, so a
+    message only costs work for the clients that asked for its topic.
+
+    Topics that have been subscribed to also keep a TopicBuffer of their
+    last replay_size frames, each tagged with a sequence number, so a client
+    that reconnects can be sent just the frames it missed (replay()).
+    Buffers of topics nobody is subscribed to are evicted, least recently
+    used first, beyond replay_topics.
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        slow_consumer_policy: Optional[str] = None,
+        send_timeout: Optional[float] = None,
+        replay_size: Optional[int] = None,
+        replay_topics: Optional[int] = None
+    ):
+        self.queue_size = queue_size or settings.WS_SEND_QUEUE_SIZE
+        self.slow_consumer_policy = slow_consumer_policy or settings.WS_SLOW_CONSUMER_POLICY
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT
+        self.replay_size = settings.WS_REPLAY_BUFFER_SIZE if replay_size is None else replay_size
+        self.replay_topics = replay_topics or settings.WS_REPLAY_MAX_TOPICS
+        if self.slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {self.slow_consumer_policy}")
+
+        self.connections: Set[ClientConnection] = set()
+        self.topics: Dict[str, Set[ClientConnection]] = {}
+        self.buffers: "OrderedDict[str, TopicBuffer]" = OrderedDict()
+
+        # Metrics
+        self.published = 0
+        self.frames_queued = 0
+        self.frames_sent = 0
+        self.dropped = 0
+        self.slow_disconnects = 0
+        self.send_errors = 0
+        self.replayed = 0
+        self.replay_misses = 0
+
+    async def connect(self, websocket: WebSocket) -> ClientConnection:
+        await websocket.accept()
+        connection = ClientConnection(websocket, self)
+        self.connections.add(connection)
+        connection.start()
+        logger.info(f"WebSocket client connected. Total connections: {len(self.connections)}")
+        return connection
+
+    async def disconnect(self, connection: ClientConnection):
+        await connection.close()
+        logger.info(f"WebSocket client disconnected. Total connections: {len(self.connections)}")
+
+    def unregister(self, connection: ClientConnection):
+        self.connections.discard(connection)
+        self.unsubscribe(connection, list(connection.topics))
+
+    def subscribe(self, connection: ClientConnection, topics: Iterable[str]) -> List[str]:
+        """Add topics to a connection; returns the ones it wasn't already subscribed to
+
+        Raises ValueError for names that aren't topics, or when the
+        connection would exceed WS_MAX_SUBSCRIPTIONS.
+        """
+        names = []
+        for topic in topics:
+            name = normalize_topic(topic)
+            if name is None:
+                raise ValueError(f"Unknown topic: {topic}")
+            if name not in connection.topics and name not in names:
+                names.append(name)
+        if len(connection.topics) + len(names) > settings.WS_MAX_SUBSCRIPTIONS:
+            raise ValueError(f"At most {settings.WS_MAX_SUBSCRIPTIONS} subscriptions per connection")
+
+        if connection in self.connections:
+            for name in names:
+                connection.topics.add(name)
+                self.topics.setdefault(name, set()).add(connection)
+                self._buffer(name)
+        return names
+
+    def unsubscribe(self, connection: ClientConnection, topics: Iterable[str]) -> List[str]:
+        """Remove topics from a connection; returns the ones it was subscribed to"""
+        removed = []
+        for topic in topics:
+            name = normalize_topic(topic)
+            if name not in connection.topics:
+                continue
+            connection.topics.discard(name)
+            subscribers = self.topics.get(name)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self.topics[name]
+            removed.append(name)
+        return removed
+
+    def position(self, topic: str) -> Optional[Dict]:
+        """Where a topic's stream is now: {"epoch", "seq"}, or None if it isn't buffered"""
+        buffer = self.buffers.get(normalize_topic(topic))
+        if buffer is None:
+            return None
+        return {"epoch": buffer.epoch, "seq": buffer.seq}
+
+    def replay(self, topic: str, epoch: str, seq: int, limit: Optional[int] = None) -> Optional[List[str]]:
+        """The frames published to a topic after (epoch, seq)
+
+        None when they can't all be replayed: the buffer has moved past
+        them, belongs to another epoch, or holds more than `limit` of them.
+        The client then has to reload a snapshot over the REST API.
+        """
+        buffer = self.buffers.get(normalize_topic(topic))
+        frames = buffer.since(seq) if buffer is not None and buffer.epoch == epoch else None
+        if frames is None or (limit is not None and len(frames) > limit):
+            self.replay_misses += 1
+            return None
+        self.replayed += len(frames)
+        return frames
+
+    def _buffer(self, topic: str) -> Optional[TopicBuffer]:
+        if self.replay_size <= 0:
+            return None
+        buffer = self.buffers.get(topic)
+        if buffer is not None:
+            self.buffers.move_to_end(topic)
+            return buffer
+
+        buffer = self.buffers[topic] = TopicBuffer(self.replay_size)
+        excess = len(self.buffers) - self.replay_topics
+        for name in list(self.buffers):
+            if excess <= 0:
+                break
+            if name not in self.topics:
+                del self.buffers[name]
+                excess -= 1
+        return buffer
+
+    def publish(self, message: Dict, topic: Optional[str] = None) -> int:
+        """Queue a message for a topic's subscribers, or for every client if topic is None
+
+        The topic, and the sequence number when the topic is buffered, are
+        added to the frame so clients can tell their streams apart and
+        resume them. Returns the number of clients the frame was queued for.
+        """
+        self.published += 1
+        recipients = self.topics.get(topic) if topic is not None else self.connections
+        buffer = self._buffer(topic) if topic is not None and (recipients or topic in self.buffers) else None
+        if not recipients and buffer is None:
+            return 0
+
+        if topic is None:
+            body = message
+        elif buffer is None:
+            body = {**message, "topic": topic}
+        else:
+            buffer.seq += 1
+            body = {**message, "topic": topic, "seq": buffer.seq}
+        frame = orjson.dumps(body).decode()
+        if buffer is not None:
+            buffer.frames.append((buffer.seq, frame))
+
+        queued = 0
+        for connection in list(recipients or ()):
+            if connection.offer(frame):
+                queued += 1
+        self.frames_queued += queued
+        return queued
+
+    async def close_all(self):
+        await asyncio.gather(*(connection.close(1001) for connection in list(self.connections)))
+
+    def stats(self) -> Dict:
+        depths = [connection.queue.qsize() for connection in self.connections]
+        return {
+            "connections": len(self.connections),
+            "topics": len(self.topics),
+            "subscriptions": sum(len(subscribers) for subscribers in self.topics.values()),
+            "replay_buffers": len(self.buffers),
+            "replayed": self.replayed,
+            "replay_misses": self.replay_misses,
+            "published": self.published,
+            "frames_queued": self.frames_queued,
+            "frames_sent": self.frames_sent,
+            "dropped": self.dropped,
+            "slow_disconnects": self.slow_disconnects,
+            "send_errors": self.send_errors,
+            "max_queue_depth": max(depths, default=0),
+            "slow_consumer_policy": self.slow_consumer_policy
+        }
+
+
+broadcaster = Broadcaster()
@@ -0,0 +1,223 @@
+from sqlalchemy import insert, update
+from app.models import Check, Monitor, MonitorStatus
+from app.utils.database import AsyncSessionLocal, TRANSIENT_ERRORS
+from app.utils.logger import logger
+from app.config import settings
+from typing import Optional, Dict, Callable, Awaitable, List as ListType, Tuple
+from datetime import datetime
+import asyncio
+import uuid
+
+
+class CheckResultSink:
+    """Buffers check results and writes them in bulk.
+
+    Check rows are inserted with a single executemany-style INSERT (rendered as
+    multi-row INSERT ... VALUES batches by SQLAlchemy) and only the latest
+    status per monitor is written back. A flush happens when the buffer reaches
+    batch_size or every flush_interval seconds. Submitters wait once
+    max_pending rows are buffered, so a slow database slows checks down
+    instead of growing memory without bound.
+
+    A flush that fails because the database is unreachable keeps its rows for
+    the next one. A batch the database rejects is split in halves and each is
+    retried on its own, down to single rows; a row rejected on its own is
+    dropped and logged, so one bad row can't stall the sink.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.CHECK_SINK_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.CHECK_SINK_FLUSH_INTERVAL
+        self.max_pending = max(max_pending or settings.CHECK_SINK_MAX_PENDING, self.batch_size)
+
+        self._checks: ListType[Dict] = []
+        self._monitor_updates: Dict[uuid.UUID, Dict] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._space_available = asyncio.Event()
+        self._space_available.set()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_hooks: ListType[Callable[..., Awaitable]] = []
+        self._commit_hooks: ListType[Callable[..., Awaitable]] = []
+
+        # Metrics
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+        self.dropped = 0
+        self.hook_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._checks)
+
+    async def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._flush_loop())
+            logger.info(f"Check result sink started (batch_size={self.batch_size}, flush_interval={self.flush_interval}s)")
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop the background flusher and write everything still buffered
+
+        Failed flushes are retried for up to `timeout` seconds; whatever is
+        still buffered after that is logged as lost rather than raised, so the
+        rest of shutdown still runs.
+        """
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if self.pending:
+            logger.error(f"Check result sink did not drain in {timeout}s, {self.pending} check results lost")
+        logger.info("Check result sink stopped")
+
+    async def _drain(self):
+        while self._checks or self._monitor_updates:
+            try:
+                await self.flush()
+            except Exception:
+                await asyncio.sleep(self.flush_interval)
+
+    def add_flush_hook(self, hook: Callable[..., Awaitable]):
+        """Register `hook(db, checks)` to run inside every flush transaction, in a savepoint of its own"""
+        self._flush_hooks.append(hook)
+
+    def add_commit_hook(self, hook: Callable[..., Awaitable]):
+        """Register `hook(checks)` to run after every flush has committed"""
+        self._commit_hooks.append(hook)
+
+    async def submit(self, check: Dict, status: MonitorStatus, checked_at: datetime):
+        """Buffer a check row and the resulting monitor status"""
+        while len(self._checks) >= self.max_pending:
+            self._space_available.clear()
+            self._flush_requested.set()
+            await self._space_available.wait()
+
+        self._checks.append(check)
+        self._monitor_updates[check["monitor_id"]] = {
+            "id": check["monitor_id"],
+            "status": status,
+            "last_checked_at": checked_at
+        }
+
+        if len(self._checks) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        """Write buffered rows, in one transaction unless the batch is rejected. Returns the number of checks written."""
+        written = []
+        error = None
+        async with self._flush_lock:
+            if not self._checks and not self._monitor_updates:
+                return 0
+
+            parts = [(self._checks, self._monitor_updates)]
+            self._checks, self._monitor_updates = [], {}
+            while parts:
+                checks, monitor_updates = parts.pop()
+                try:
+                    await self._write(checks, monitor_updates)
+                except TRANSIENT_ERRORS as e:
+                    self.flush_errors += 1
+                    logger.error(f"Failed to flush {len(checks)} check results: {e}")
+                    error = e
+                    parts.append((checks, monitor_updates))
+                    break
+                except Exception as e:
+                    self.flush_errors += 1
+                    if len(checks) <= 1:
+                        self.dropped += len(checks)
+                        logger.error(f"Dropping check result rejected by the database: {e}")
+                    else:
+                        logger.error(f"Failed to write {len(checks)} check results, retrying in halves: {e}")
+                        parts.extend(reversed(self._split(checks, monitor_updates)))
+                else:
+                    written.extend(checks)
+
+            # Put the unwritten rows back; newer monitor updates win over the failed ones
+            for checks, monitor_updates in parts:
+                self._checks = checks + self._checks
+                self._monitor_updates = {**monitor_updates, **self._monitor_updates}
+            self.rows_written += len(written)
+            if len(self._checks) < self.max_pending:
+                self._space_available.set()
+            if error is None:
+                self.flushes += 1
+
+        if written:
+            for hook in self._commit_hooks:
+                try:
+                    await hook(written)
+                except Exception as e:
+                    logger.error(f"Check sink commit hook failed: {e}")
+        if error is not None:
+            raise error
+        return len(written)
+
+    def stats(self) -> Dict:
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "flush_errors": self.flush_errors,
+            "dropped": self.dropped,
+            "hook_errors": self.hook_errors
+        }
+
+    async def _write(self, checks: ListType[Dict], monitor_updates: Dict[uuid.UUID, Dict]):
+        async with self.session_factory() as db:
+            if checks:
+                await db.execute(insert(Check), checks)
+            if monitor_updates:
+                await db.execute(update(Monitor), list(monitor_updates.values()))
+            for hook in self._flush_hooks:
+                # A failing hook (e.g. the rollup fold, which compaction repairs)
+                # must not cost the raw check rows, so it gets its own savepoint
+                try:
+                    async with db.begin_nested():
+                        await hook(db, checks)
+                except TRANSIENT_ERRORS:
+                    raise
+                except Exception as e:
+                    self.hook_errors += 1
+                    logger.error(f"Check sink flush hook failed, writing checks without it: {e}")
+            await db.commit()
+
+    @staticmethod
+    def _split(checks: ListType[Dict], monitor_updates: Dict[uuid.UUID, Dict]) -> ListType[Tuple[ListType[Dict], Dict]]:
+        """Halve a batch; each monitor update goes with the half holding that monitor's last check"""
+        middle = len(checks) // 2
+        last = {check["monitor_id"]: i for i, check in enumerate(checks)}
+        first_updates = {monitor_id: u for monitor_id, u in monitor_updates.items() if last.get(monitor_id, middle) < middle}
+        second_updates = {monitor_id: u for monitor_id, u in monitor_updates.items() if monitor_id not in first_updates}
+        return [(checks[:middle], first_updates), (checks[middle:], second_updates)]
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                await asyncio.sleep(self.flush_interval)
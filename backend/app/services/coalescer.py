@@ -0,0 +1,83 @@
+from app.services.broadcaster import broadcaster, MONITORS_TOPIC
+from app.config import settings
+from typing import Callable, Dict, Optional
+import asyncio
+
+# Message types where only the latest per topic matters
+COALESCED_TYPES = ("check",)
+
+
+class UpdateCoalescer:
+    """Batches high-rate updates in front of the broadcaster.
+
+    A "check" message is held for up to `window` seconds; a newer one for the
+    same topic (monitor) replaces it. When the window closes each monitor's
+    latest check goes to its own topic, and all of them go to MONITORS_TOPIC
+    as one "checks" frame holding just the monitors that changed. Other
+    messages pass straight through. A window of 0 disables coalescing: each
+    check is published at once, to its topic and as a one-item "checks"
+    frame to MONITORS_TOPIC, so that topic's subscribers still see it.
+    """
+
+    def __init__(self, publish: Callable[[Dict, Optional[str]], int], window: Optional[float] = None):
+        self._publish = publish
+        self.window = settings.WS_COALESCE_WINDOW if window is None else window
+        self._pending: Dict[str, Dict] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Metrics
+        self.updates = 0
+        self.superseded = 0
+        self.frames = 0  # per-monitor "check" frames
+        self.summary_frames = 0  # "checks" frames to MONITORS_TOPIC
+        self.flushes = 0
+
+    def publish(self, message: Dict, topic: Optional[str] = None):
+        if topic is None or message.get("type") not in COALESCED_TYPES:
+            return self._publish(message, topic)
+
+        self.updates += 1
+        if self.window <= 0:
+            delivered = self._publish(message, topic)
+            if delivered:
+                self.frames += 1
+            if self._publish({"type": "checks", "data": [message["data"]]}, MONITORS_TOPIC):
+                self.summary_frames += 1
+            return delivered
+
+        if topic in self._pending:
+            self.superseded += 1
+        self._pending[topic] = message["data"]
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def flush(self):
+        """Publish the held updates now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        self.flushes += 1
+        for topic, data in pending.items():
+            if self._publish({"type": "check", "data": data}, topic):
+                self.frames += 1
+        if self._publish({"type": "checks", "data": list(pending.values())}, MONITORS_TOPIC):
+            self.summary_frames += 1
+
+    def stats(self) -> Dict:
+        return {
+            "window": self.window,
+            "pending": len(self._pending),
+            "updates": self.updates,
+            "superseded": self.superseded,
+            "frames": self.frames,
+            "summary_frames": self.summary_frames,
+            "flushes": self.flushes,
+            "messages_saved": max(self.updates - self.frames, 0)
+        }
+
+
+coalescer = UpdateCoalescer(broadcaster.publish)
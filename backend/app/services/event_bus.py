@@ -0,0 +1,144 @@
+from app.utils.logger import logger
+from app.config import settings
+from typing import Any, Callable, Dict, Optional, Protocol
+import asyncio
+import orjson
+
+# Receives (message, topic); the application passes Broadcaster.publish
+EventHandler = Callable[[Dict, Optional[str]], Any]
+
+
+class EventBus(Protocol):
+    async def publish(self, topic: Optional[str], message: Dict):
+        ...
+
+    async def start(self, handler: EventHandler):
+        ...
+
+    async def stop(self):
+        ...
+
+    def stats(self) -> Dict:
+        ...
+
+
+class InProcessEventBus:
+    """Single-worker bus: events go straight to this process's handler"""
+
+    def __init__(self):
+        self.handler: Optional[EventHandler] = None
+        self.published = 0
+        self.delivered = 0
+
+    async def publish(self, topic: Optional[str], message: Dict):
+        self.published += 1
+        if self.handler is not None:
+            self.handler(message, topic)
+            self.delivered += 1
+
+    async def start(self, handler: EventHandler):
+        self.handler = handler
+
+    async def stop(self):
+        self.handler = None
+
+    def stats(self) -> Dict:
+        return {"backend": "memory", "published": self.published, "delivered": self.delivered}
+
+
+class RedisEventBus:
+    """Events shared by all workers through a Redis pub/sub channel.
+
+    Every worker subscribes to the channel and hands what it receives to its
+    own handler, including the events it published itself, so each event
+    reaches the clients connected to any worker exactly once. If Redis is
+    unreachable, publish falls back to local delivery so this worker's
+    clients still get their updates; the listener reconnects with backoff.
+    """
+
+    def __init__(self, client, channel: str = "events", reconnect_delay: float = 1.0):
+        self.client = client
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.handler: Optional[EventHandler] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.published = 0
+        self.delivered = 0
+        self.errors = 0
+
+    async def publish(self, topic: Optional[str], message: Dict):
+        self.published += 1
+        try:
+            await self.client.publish(self.channel, orjson.dumps({"topic": topic, "message": message}))
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Event bus publish failed, delivering locally only: {e}")
+            if self.handler is not None:
+                self.handler(message, topic)
+                self.delivered += 1
+
+    async def start(self, handler: EventHandler):
+        if self._task is not None:
+            return
+        self.handler = handler
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.handler = None
+
+    async def _listen(self):
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for event in pubsub.listen():
+                    self._deliver(event["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Event bus subscription failed, retrying in {self.reconnect_delay}s: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def _deliver(self, data: bytes):
+        try:
+            event = orjson.loads(data)
+            self.handler(event["message"], event["topic"])
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Dropping malformed event: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "redis",
+            "published": self.published,
+            "delivered": self.delivered,
+            "errors": self.errors
+        }
+
+
+def create_event_bus() -> EventBus:
+    """Build the application's event bus from settings"""
+    if settings.EVENT_BUS_BACKEND == "redis":
+        import redis.asyncio as redis
+        return RedisEventBus(redis.from_url(settings.REDIS_URL), channel=settings.EVENT_BUS_CHANNEL)
+    return InProcessEventBus()
+
+
+event_bus = create_event_bus()
@@ -0,0 +1,240 @@
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.logger import logger
+from typing import Optional, Dict, AsyncIterator
+from urllib.parse import urlsplit
+import asyncio
+import importlib.util
+import ipaddress
+import socket
+import httpcore
+import httpx
+
+# httpcore errors and the httpx errors callers expect, most specific first
+HTTPCORE_ERRORS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.ProxyError, httpx.ProxyError),
+)
+
+
+CORE_ERRORS = tuple(core_error for core_error, _ in HTTPCORE_ERRORS)
+
+
+def _httpx_error(error: Exception, request: httpx.Request) -> httpx.RequestError:
+    for core_error, httpx_error in HTTPCORE_ERRORS:
+        if isinstance(error, core_error):
+            return httpx_error(str(error), request=request)
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that caches hostname resolution.
+
+    Connections are opened to the cached address while TLS still verifies
+    against the original hostname (httpcore passes it as server_hostname).
+    """
+
+    def __init__(self, ttl: float, maxsize: Optional[int] = None, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache = TTLCache(maxsize=maxsize or settings.CHECK_DNS_CACHE_SIZE, ttl=ttl)
+        self._pending: Dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int) -> str:
+        """Resolve host to an address, using the cache while the entry is fresh"""
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        key = (host, port)
+        cached = self._cache.get(key, count=False)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        # Concurrent connects to the same host share a single lookup
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        pending = self._pending[key] = asyncio.ensure_future(self._lookup(host, port))
+        try:
+            address = await asyncio.shield(pending)
+        finally:
+            self._pending.pop(key, None)
+        self._cache.set(key, address)
+        return address
+
+    async def _lookup(self, host: str, port: int) -> str:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return infos[0][4][0]
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        address = await self.resolve(host, port)
+        try:
+            return await self._backend.connect_tcp(
+                address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+            )
+        except httpcore.ConnectError:
+            # The cached address may be stale; resolve again on the next attempt
+            self._cache.delete((host, port))
+            raise
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+class ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream, request: httpx.Request):
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for part in self._stream:
+                yield part
+        except CORE_ERRORS as e:
+            raise _httpx_error(e, self._request) from e
+
+    async def aclose(self):
+        await self._stream.aclose()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """httpx transport over an httpcore connection pool built with our own network backend"""
+
+    def __init__(self, network_backend: httpcore.AsyncNetworkBackend, limits: httpx.Limits, http2: bool = False):
+        self._pool = httpcore.AsyncConnectionPool(
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions
+        )
+        try:
+            response = await self._pool.handle_async_request(core_request)
+        except CORE_ERRORS as e:
+            raise _httpx_error(e, request) from e
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=ResponseStream(response.stream, request),
+            extensions=response.extensions
+        )
+
+    async def aclose(self):
+        await self._pool.aclose()
+
+
+class HostLimit:
+    """Per-host connection cap, kept only while the host has requests in flight"""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class HealthCheckClient:
+    """Long-lived, pooled HTTP client shared by all health checks.
+
+    Keeps connections alive between checks, caps connections globally and per
+    host, negotiates HTTP/2 when the h2 package is installed and caches DNS
+    lookups. Timeouts are passed per request so each monitor keeps its own.
+    A response's `elapsed` covers the request itself, not the wait for a
+    free slot on its host.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_connections_per_host: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        dns_cache_ttl: Optional[float] = None
+    ):
+        self.max_connections = max_connections or settings.CHECK_MAX_CONNECTIONS
+        self.max_connections_per_host = max_connections_per_host or settings.CHECK_MAX_CONNECTIONS_PER_HOST
+        self.keepalive_expiry = settings.CHECK_KEEPALIVE_EXPIRY if keepalive_expiry is None else keepalive_expiry
+        http2 = settings.CHECK_HTTP2 if http2 is None else http2
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.dns = CachingDNSBackend(settings.CHECK_DNS_CACHE_TTL if dns_cache_ttl is None else dns_cache_ttl)
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, HostLimit] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        transport = PooledTransport(
+            self.dns,
+            httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            http2=self.http2
+        )
+        return httpx.AsyncClient(transport=transport, follow_redirects=False)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = self._build_client()
+            logger.info(f"Health check client created (http2={self.http2}, max_connections={self.max_connections})")
+        return self._client
+
+    async def get(self, url: str, headers: Optional[Dict] = None, timeout: Optional[float] = None) -> httpx.Response:
+        """Send a GET request, waiting for a free slot on the target host"""
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = HostLimit(self.max_connections_per_host)
+
+        limit.users += 1
+        try:
+            async with limit.semaphore:
+                return await self.client.get(url, headers=headers, timeout=timeout)
+        finally:
+            limit.users -= 1
+            if not limit.users:
+                del self._host_limits[host]
+
+    async def aclose(self):
+        """Close all pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
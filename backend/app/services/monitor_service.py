@@ -1,18 +1,36 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from app.models import Monitor, Check, Incident, Metric, MonitorStatus, IncidentStatus, IncidentSeverity
+from app.services.check_sink import CheckResultSink
+from app.services.http_client import HealthCheckClient
+from app.services.rollup_service import RollupService
+from app.services.status_page_cache import StatusPageCache
+from app.services.scheduler import CheckScheduler
+from app.services.broadcaster import monitor_topic, STATUS_PAGE_TOPIC
+from app.services.event_bus import event_bus
+from app.utils.cache import TTLCache
+from app.utils.pagination import Page, keyset, fetch_page, stream_scalars
 from app.utils.logger import logger
-from typing import Optional, List as ListType, Dict
+from app.config import settings
+from typing import Optional, AsyncIterator, List as ListType, Dict
 from datetime import datetime, timedelta
 import httpx
-import asyncio
 import uuid
 
 
 class MonitorService:
     def __init__(self):
-        self.active_monitors = {}
         self.failure_counts = {}
+        self.http_client = HealthCheckClient()
+        self.result_sink = CheckResultSink()
+        self.status_page_cache = StatusPageCache()
+        self.dashboard_cache = TTLCache(maxsize=settings.DASHBOARD_CACHE_MAXSIZE, ttl=settings.DASHBOARD_CACHE_TTL)
+        if settings.ROLLUP_ENABLED:
+            self.result_sink.add_flush_hook(RollupService.fold_checks)
+        # Monitors whose status changed in a check the sink hasn't written yet
+        self._unflushed_status_changes = set()
+        self.result_sink.add_commit_hook(self._checks_committed)
+        self.scheduler = CheckScheduler(self)
 
     async def create_monitor(self, db: AsyncSession, name: str, url: str, interval: int = 60, monitor_type: str = "https") -> Monitor:
         """Create a new monitor"""
@@ -21,6 +39,11 @@ class MonitorService:
         await db.commit()
         await db.refresh(monitor)
 
+        if self.scheduler.running and monitor.enabled:
+            self.scheduler.schedule(monitor.id, monitor.interval)
+        await self.status_page_changed()
+        self.dashboard_cache.clear()
+
         logger.info(f"Created monitor: {monitor.id} - {name}")
         return monitor
 
@@ -30,31 +53,50 @@ class MonitorService:
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_monitors_page(self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        """Get a page of monitors after `cursor`, oldest first (keyset pagination)"""
+        query = keyset(select(Monitor), Monitor.created_at, Monitor.id, cursor)
+        return await fetch_page(db, query, limit, lambda monitor: (monitor.created_at, monitor.id))
+
+    async def iter_monitors(self, db: AsyncSession) -> AsyncIterator[Monitor]:
+        """Stream all monitors in creation order without loading them all"""
+        async for monitor in stream_scalars(db, keyset(select(Monitor), Monitor.created_at, Monitor.id)):
+            yield monitor
+
+    async def get_enabled_monitors(self, db: AsyncSession) -> ListType[Monitor]:
+        """Get all monitors that should be checked"""
+        query = select(Monitor).where(Monitor.enabled.is_(True))
+        result = await db.execute(query)
+        return result.scalars().all()
+
     async def get_monitor(self, db: AsyncSession, monitor_id: uuid.UUID) -> Optional[Monitor]:
         """Get monitor by ID"""
         query = select(Monitor).where(Monitor.id == monitor_id)
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
-    async def execute_check(self, db: AsyncSession, monitor: Monitor) -> Check:
-        """Execute a single health check"""
-        start_time = datetime.utcnow()
+    async def execute_check(self, db: AsyncSession, monitor: Monitor, batched: bool = False) -> Check:
+        """Execute a single health check
+
+        With batched=True (used by the scheduler) the result is handed to the
+        result sink and written in bulk instead of committed immediately.
+        """
         status = MonitorStatus.DOWN
         response_time = None
         status_code = None
         error_message = None
 
         try:
-            async with httpx.AsyncClient(timeout=monitor.timeout) as client:
-                response = await client.get(monitor.url, headers=monitor.headers or {})
-                response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-                status_code = response.status_code
+            response = await self.http_client.get(monitor.url, headers=monitor.headers or {}, timeout=monitor.timeout)
+            # Excludes the wait for a free connection slot on the host
+            response_time = response.elapsed.total_seconds() * 1000
+            status_code = response.status_code
 
-                if status_code == monitor.expected_status_code:
-                    status = MonitorStatus.UP
-                else:
-                    status = MonitorStatus.DEGRADED
-                    error_message = f"Expected {monitor.expected_status_code}, got {status_code}"
+            if status_code == monitor.expected_status_code:
+                status = MonitorStatus.UP
+            else:
+                status = MonitorStatus.DEGRADED
+                error_message = f"Expected {monitor.expected_status_code}, got {status_code}"
 
         except httpx.TimeoutException:
             error_message = "Request timeout"
@@ -63,53 +105,81 @@ class MonitorService:
             error_message = str(e)
             status = MonitorStatus.DOWN
 
+        checked_at = datetime.utcnow()
+        previous_status = monitor.status
+
         # Create check record
         check = Check(
+            id=uuid.uuid4(),
             monitor_id=monitor.id,
             status=status,
             response_time=response_time,
             status_code=status_code,
-            error_message=error_message
+            error_message=error_message,
+            checked_at=checked_at
         )
-        db.add(check)
 
         # Update monitor status
         monitor.status = status
-        monitor.last_checked_at = datetime.utcnow()
-
-        await db.commit()
-        await db.refresh(check)
+        monitor.last_checked_at = checked_at
+
+        flushed = not (batched and self.result_sink.running)
+        if not flushed:
+            await self.result_sink.submit({
+                "id": check.id,
+                "monitor_id": check.monitor_id,
+                "status": check.status,
+                "response_time": check.response_time,
+                "status_code": check.status_code,
+                "error_message": check.error_message,
+                "checked_at": check.checked_at
+            }, status, checked_at)
+        else:
+            db.add(check)
+            await db.commit()
+            await db.refresh(check)
 
         logger.info(f"Check completed for monitor {monitor.id}: {status} ({response_time}ms)")
+        await event_bus.publish(monitor_topic(monitor.id), {
+            "type": "check",
+            "data": {
+                "monitor_id": monitor.id,
+                "status": status,
+                "response_time": response_time,
+                "status_code": status_code,
+                "checked_at": checked_at
+            }
+        })
+
+        if status != previous_status:
+            if flushed:
+                await self.status_page_changed()
+            else:
+                # The status page would be rebuilt from the old status until the sink commits
+                self._unflushed_status_changes.add(monitor.id)
 
         # Handle incident creation/resolution
-        await self.handle_incident(db, monitor, status)
+        await self.handle_incident(db, monitor, status, previous_status)
 
         return check
 
-    async def handle_incident(self, db: AsyncSession, monitor: Monitor, status: MonitorStatus):
-        """Handle incident creation and resolution"""
+    async def handle_incident(self, db: AsyncSession, monitor: Monitor, status: MonitorStatus, previous_status: Optional[MonitorStatus] = None):
+        """Handle incident creation and resolution
+
+        The open-incident lookup is skipped when the check cannot change
+        anything: fewer than 3 consecutive failures, or UP following UP.
+        """
         monitor_id_str = str(monitor.id)
 
         # Initialize failure count if needed
         if monitor_id_str not in self.failure_counts:
             self.failure_counts[monitor_id_str] = 0
 
-        # Check for existing open incident
-        query = select(Incident).where(
-            and_(
-                Incident.monitor_id == monitor.id,
-                Incident.status.in_([IncidentStatus.INVESTIGATING, IncidentStatus.IDENTIFIED])
-            )
-        )
-        result = await db.execute(query)
-        existing_incident = result.scalar_one_or_none()
-
         if status == MonitorStatus.DOWN:
             self.failure_counts[monitor_id_str] += 1
 
             # Create incident after 3 consecutive failures
-            if self.failure_counts[monitor_id_str] >= 3 and not existing_incident:
+            if self.failure_counts[monitor_id_str] >= 3 and not await self.get_open_incident(db, monitor.id):
                 incident = Incident(
                     monitor_id=monitor.id,
                     title=f"{monitor.name} is down",
@@ -119,75 +189,190 @@ class MonitorService:
                 )
                 db.add(incident)
                 await db.commit()
+                await self.status_page_changed()
                 logger.warning(f"Created incident for monitor {monitor.id}")
 
         elif status == MonitorStatus.UP:
             self.failure_counts[monitor_id_str] = 0
+            if previous_status == MonitorStatus.UP:
+                return
 
             # Auto-resolve incident if exists
+            existing_incident = await self.get_open_incident(db, monitor.id)
             if existing_incident:
                 existing_incident.status = IncidentStatus.RESOLVED
                 existing_incident.resolved_at = datetime.utcnow()
                 await db.commit()
+                await self.status_page_changed()
                 logger.info(f"Auto-resolved incident {existing_incident.id}")
 
-    async def calculate_uptime(self, db: AsyncSession, monitor_id: uuid.UUID, hours: int = 24) -> Dict:
-        """Calculate uptime percentage"""
-        since = datetime.utcnow() - timedelta(hours=hours)
+    async def _checks_committed(self, checks: ListType[Dict]):
+        """Sink commit hook: the status changes in these checks are now readable"""
+        changed = self._unflushed_status_changes & {check["monitor_id"] for check in checks}
+        if changed:
+            self._unflushed_status_changes -= changed
+            await self.status_page_changed()
 
-        query = select(Check).where(
+    async def status_page_changed(self):
+        """Drop the cached status page and tell its subscribers to refetch"""
+        self.status_page_cache.invalidate()
+        await event_bus.publish(STATUS_PAGE_TOPIC, {"type": "status_page_changed", "data": {}})
+
+    async def get_open_incident(self, db: AsyncSession, monitor_id: uuid.UUID) -> Optional[Incident]:
+        """Get the unresolved incident for a monitor, if any"""
+        query = select(Incident).where(
+            and_(
+                Incident.monitor_id == monitor_id,
+                Incident.status.in_([IncidentStatus.INVESTIGATING, IncidentStatus.IDENTIFIED])
+            )
+        )
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def calculate_uptime(self, db: AsyncSession, monitor_id: uuid.UUID, hours: int = 24) -> Dict:
+        """Calculate uptime percentage with a single aggregate query
+
+        Windows of ROLLUP_MIN_WINDOW_HOURS or more are read from hourly rollups.
+        """
+        now = datetime.utcnow()
+        since = now - timedelta(hours=hours)
+
+        if settings.ROLLUP_ENABLED and hours >= settings.ROLLUP_MIN_WINDOW_HOURS:
+            totals = await RollupService.read_totals(db, [monitor_id], since, now)
+            total_checks, up_checks, rt_sum, rt_count = totals.get(monitor_id, (0, 0, 0.0, 0))
+            return self._uptime_result(total_checks, up_checks, rt_sum / rt_count if rt_count else None)
+
+        query = select(
+            func.count(Check.id),
+            func.count(Check.id).filter(Check.status == MonitorStatus.UP),
+            func.avg(Check.response_time)
+        ).where(
             and_(
                 Check.monitor_id == monitor_id,
                 Check.checked_at >= since
             )
         )
         result = await db.execute(query)
-        checks = result.scalars().all()
-
-        if not checks:
-            return {"uptime_percentage": 100.0, "total_checks": 0, "failed_checks": 0}
+        total_checks, up_checks, avg_response_time = result.one()
+
+        return self._uptime_result(total_checks, up_checks, avg_response_time)
+
+    async def calculate_uptime_bulk(self, db: AsyncSession, monitor_ids: Optional[ListType[uuid.UUID]] = None, hours: int = 24) -> Dict[uuid.UUID, Dict]:
+        """Calculate uptime for many monitors with one grouped query
+
+        monitor_ids=None covers every monitor. Monitors without checks in the
+        window are omitted; callers treat them as 100% up.
+        """
+        now = datetime.utcnow()
+        since = now - timedelta(hours=hours)
+
+        if settings.ROLLUP_ENABLED and hours >= settings.ROLLUP_MIN_WINDOW_HOURS:
+            totals = await RollupService.read_totals(db, monitor_ids, since, now)
+            return {
+                monitor_id: self._uptime_result(total, up, rt_sum / rt_count if rt_count else None)
+                for monitor_id, (total, up, rt_sum, rt_count) in totals.items()
+            }
+
+        query = select(
+            Check.monitor_id,
+            func.count(Check.id),
+            func.count(Check.id).filter(Check.status == MonitorStatus.UP),
+            func.avg(Check.response_time)
+        ).where(Check.checked_at >= since).group_by(Check.monitor_id)
+        if monitor_ids is not None:
+            query = query.where(Check.monitor_id.in_(monitor_ids))
+        result = await db.execute(query)
 
-        total_checks = len(checks)
-        up_checks = sum(1 for check in checks if check.status == MonitorStatus.UP)
-        failed_checks = total_checks - up_checks
-        uptime_percentage = (up_checks / total_checks) * 100
+        return {
+            monitor_id: self._uptime_result(total, up, avg_response_time)
+            for monitor_id, total, up, avg_response_time in result.all()
+        }
 
-        avg_response_time = sum(check.response_time for check in checks if check.response_time) / len([c for c in checks if c.response_time])
+    @staticmethod
+    def _uptime_result(total_checks: int, up_checks: int, avg_response_time: Optional[float]) -> Dict:
+        if not total_checks:
+            return {"uptime_percentage": 100.0, "total_checks": 0, "failed_checks": 0, "avg_response_time": 0}
 
         return {
-            "uptime_percentage": round(uptime_percentage, 2),
+            "uptime_percentage": round((up_checks / total_checks) * 100, 2),
             "total_checks": total_checks,
-            "failed_checks": failed_checks,
+            "failed_checks": total_checks - up_checks,
             "avg_response_time": round(avg_response_time, 2) if avg_response_time else 0
         }
 
+    async def get_dashboard_metrics(self, db: AsyncSession) -> Dict:
+        """Dashboard counters from aggregate queries
+
+        Status counts come from one GROUP BY, active incidents from one COUNT
+        and the average uptime from the grouped 24h uptime read, so the cost
+        does not grow with the number of monitors loaded into Python.
+        """
+        result = await db.execute(select(Monitor.status, func.count(Monitor.id)).group_by(Monitor.status))
+        status_counts = {monitor_status: count for monitor_status, count in result.all()}
+        total_monitors = sum(status_counts.values())
+
+        result = await db.execute(
+            select(func.count(Incident.id)).where(
+                Incident.status.in_([IncidentStatus.INVESTIGATING, IncidentStatus.IDENTIFIED])
+            )
+        )
+        active_incidents = result.scalar()
+
+        # Monitors without checks in the window count as 100% up
+        uptimes = await self.calculate_uptime_bulk(db, hours=24)
+        total_uptime = sum(u["uptime_percentage"] for u in uptimes.values())
+        total_uptime += 100.0 * max(total_monitors - len(uptimes), 0)
+        avg_uptime = total_uptime / total_monitors if total_monitors > 0 else 100.0
+
+        return {
+            "total_monitors": total_monitors,
+            "monitors_up": status_counts.get(MonitorStatus.UP, 0),
+            "monitors_down": status_counts.get(MonitorStatus.DOWN, 0),
+            "monitors_degraded": status_counts.get(MonitorStatus.DEGRADED, 0),
+            "active_incidents": active_incidents,
+            "avg_uptime": round(avg_uptime, 2)
+        }
+
+    async def get_status_page_data(self, db: AsyncSession) -> Dict:
+        """Build the public status page payload
+
+        Two queries regardless of monitor count: the monitor list and a grouped
+        24h uptime aggregate.
+        """
+        result = await db.execute(select(Monitor.id, Monitor.name, Monitor.status).order_by(Monitor.created_at))
+        monitors = result.all()
+        uptimes = await self.calculate_uptime_bulk(db, hours=24)
+
+        status_data = {
+            "overall_status": "operational",
+            "monitors": [],
+            "last_updated": datetime.utcnow().isoformat()
+        }
+
+        for monitor_id, name, monitor_status in monitors:
+            uptime = uptimes.get(monitor_id)
+            status_data["monitors"].append({
+                "name": name,
+                "status": monitor_status,
+                "uptime_24h": uptime["uptime_percentage"] if uptime else 100.0
+            })
+
+        return status_data
+
     async def start_monitoring(self, db: AsyncSession, monitor_id: uuid.UUID):
-        """Start monitoring loop for a monitor"""
+        """Hand a monitor to the check scheduler"""
         monitor = await self.get_monitor(db, monitor_id)
         if not monitor or not monitor.enabled:
             return
 
-        monitor_id_str = str(monitor_id)
-        if monitor_id_str in self.active_monitors:
+        if self.scheduler.is_scheduled(monitor_id):
             return
 
-        async def monitor_loop():
-            while monitor_id_str in self.active_monitors:
-                try:
-                    await self.execute_check(db, monitor)
-                    await asyncio.sleep(monitor.interval)
-                except Exception as e:
-                    logger.error(f"Error in monitor loop for {monitor_id}: {e}")
-                    await asyncio.sleep(monitor.interval)
-
-        task = asyncio.create_task(monitor_loop())
-        self.active_monitors[monitor_id_str] = task
+        self.scheduler.schedule(monitor.id, monitor.interval)
         logger.info(f"Started monitoring for {monitor_id}")
 
     async def stop_monitoring(self, monitor_id: uuid.UUID):
-        """Stop monitoring loop for a monitor"""
-        monitor_id_str = str(monitor_id)
-        if monitor_id_str in self.active_monitors:
-            task = self.active_monitors.pop(monitor_id_str)
-            task.cancel()
+        """Remove a monitor from the check scheduler"""
+        if self.scheduler.is_scheduled(monitor_id):
+            self.scheduler.unschedule(monitor_id)
             logger.info(f"Stopped monitoring for {monitor_id}")
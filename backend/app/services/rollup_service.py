@@ -0,0 +1,246 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, and_, or_, func, case, cast, Numeric
+from app.models import Check, Metric, MonitorStatus
+from app.utils.database import AsyncSessionLocal
+from app.utils.logger import logger
+from app.config import settings
+from typing import Optional, Dict, Iterable, List as ListType, Tuple
+from datetime import datetime, timedelta
+import uuid
+
+HOUR = timedelta(hours=1)
+
+# (total_checks, up_checks, response_time_sum, response_time_count)
+Totals = Tuple[int, int, float, int]
+
+KEY_CHUNK_SIZE = 1000
+
+
+def bucket_start(timestamp: datetime) -> datetime:
+    """Truncate a timestamp to the start of its hour bucket"""
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _merge(a: Totals, b: Totals) -> Totals:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3])
+
+
+class RollupService:
+    """Folds raw Check rows into hourly Metric buckets.
+
+    Buckets are updated incrementally as the check sink flushes, and a periodic
+    compaction recomputes recent hours so checks written outside the sink are
+    included. Both write with INSERT ... ON CONFLICT, so a flush and a
+    compaction touching the same bucket never fail on the unique constraint.
+    Long uptime windows are answered from hourly buckets plus the raw checks
+    in the partial hours at either edge.
+    """
+
+    @staticmethod
+    async def fold_checks(db: AsyncSession, checks: ListType[Dict]):
+        """Add a batch of check rows to their buckets (runs inside the caller's transaction)"""
+        totals: Dict[Tuple[uuid.UUID, datetime], Totals] = {}
+        for check in checks:
+            up = 1 if check["status"] == MonitorStatus.UP else 0
+            response_time = check.get("response_time")
+            values = (1, up, response_time or 0.0, 1 if response_time is not None else 0)
+            key = (check["monitor_id"], bucket_start(check["checked_at"]))
+            totals[key] = _merge(totals[key], values) if key in totals else values
+
+        await RollupService._upsert(db, totals, replace=False)
+
+    @staticmethod
+    async def compact(db: AsyncSession, start: datetime, end: datetime):
+        """Recompute hour buckets in [start, end) from raw checks"""
+        start = bucket_start(start)
+        end = bucket_start(end)
+        if start >= end:
+            return
+
+        hour = RollupService._truncate_hour(db, Check.checked_at)
+        query = select(
+            Check.monitor_id,
+            hour,
+            func.count(Check.id),
+            func.count(Check.id).filter(Check.status == MonitorStatus.UP),
+            func.coalesce(func.sum(Check.response_time), 0.0),
+            func.count(Check.response_time)
+        ).where(
+            and_(Check.checked_at >= start, Check.checked_at < end)
+        ).group_by(Check.monitor_id, hour)
+        result = await db.execute(query)
+
+        hours = {}
+        for monitor_id, period_start, total, up, rt_sum, rt_count in result.all():
+            if isinstance(period_start, str):
+                period_start = datetime.fromisoformat(period_start)
+            hours[(monitor_id, period_start)] = (total, up, rt_sum, rt_count)
+        await RollupService._upsert(db, hours, replace=True)
+
+        logger.info(f"Compacted rollups for {start} - {end}: {len(hours)} hour buckets")
+
+    @staticmethod
+    async def run_compaction(db: AsyncSession, lookback_hours: Optional[int] = None):
+        """Periodic job: recompute recent closed hours"""
+        now = datetime.utcnow()
+        lookback = settings.ROLLUP_COMPACTION_LOOKBACK_HOURS if lookback_hours is None else lookback_hours
+        await RollupService.compact(db, now - timedelta(hours=lookback), now)
+        await db.commit()
+
+    @staticmethod
+    async def backfill(db: AsyncSession, chunk_hours: Optional[int] = None):
+        """Build buckets for all raw checks older than the first hour bucket, committing per chunk
+
+        Covers history recorded before rollups were enabled, so read_totals
+        never treats those hours as empty. Also drops minute and day buckets
+        left by earlier versions, which nothing reads.
+        """
+        chunk = timedelta(hours=chunk_hours or settings.ROLLUP_BACKFILL_CHUNK_HOURS)
+        await db.execute(delete(Metric).where(Metric.granularity != "hour"))
+        await db.commit()
+
+        first_check = await db.scalar(select(func.min(Check.checked_at)))
+        if first_check is None:
+            return
+        first_bucket = await db.scalar(select(func.min(Metric.period_start)))
+        start = bucket_start(first_check)
+        end = bucket_start(first_bucket or datetime.utcnow())
+        while start < end:
+            await RollupService.compact(db, start, min(start + chunk, end))
+            await db.commit()
+            start += chunk
+
+    @staticmethod
+    async def read_totals(db: AsyncSession, monitor_ids: Optional[Iterable[uuid.UUID]], since: datetime, until: datetime) -> Dict[uuid.UUID, Totals]:
+        """Totals per monitor for [since, until) from hour buckets plus raw checks at the partial edges.
+
+        monitor_ids=None reads every monitor without an IN filter.
+        """
+        if monitor_ids is not None:
+            monitor_ids = list(monitor_ids)
+            if not monitor_ids:
+                return {}
+
+        first_full_hour = bucket_start(since)
+        if first_full_hour < since:
+            first_full_hour += HOUR
+        last_full_hour = bucket_start(until)
+
+        totals: Dict[uuid.UUID, Totals] = {}
+
+        if first_full_hour < last_full_hour:
+            query = select(
+                Metric.monitor_id,
+                func.sum(Metric.total_checks),
+                func.sum(Metric.total_checks - Metric.failed_checks),
+                func.sum(Metric.avg_response_time * Metric.response_time_count),
+                func.sum(Metric.response_time_count)
+            ).where(
+                and_(
+                    Metric.granularity == "hour",
+                    Metric.period_start >= first_full_hour,
+                    Metric.period_start < last_full_hour
+                )
+            ).group_by(Metric.monitor_id)
+            if monitor_ids is not None:
+                query = query.where(Metric.monitor_id.in_(monitor_ids))
+            edges = or_(
+                and_(Check.checked_at >= since, Check.checked_at < first_full_hour),
+                and_(Check.checked_at >= last_full_hour, Check.checked_at < until)
+            )
+            result = await db.execute(query)
+            for monitor_id, total, up, rt_sum, rt_count in result.all():
+                totals[monitor_id] = (total or 0, up or 0, rt_sum or 0.0, rt_count or 0)
+        else:
+            edges = and_(Check.checked_at >= since, Check.checked_at < until)
+
+        query = select(
+            Check.monitor_id,
+            func.count(Check.id),
+            func.count(Check.id).filter(Check.status == MonitorStatus.UP),
+            func.coalesce(func.sum(Check.response_time), 0.0),
+            func.count(Check.response_time)
+        ).where(edges).group_by(Check.monitor_id)
+        if monitor_ids is not None:
+            query = query.where(Check.monitor_id.in_(monitor_ids))
+        result = await db.execute(query)
+        for monitor_id, *values in result.all():
+            values = tuple(values)
+            totals[monitor_id] = _merge(totals[monitor_id], values) if monitor_id in totals else values
+
+        return totals
+
+    @staticmethod
+    async def _upsert(db: AsyncSession, totals: Dict[Tuple[uuid.UUID, datetime], Totals], replace: bool):
+        """Insert missing buckets and either add to or replace existing ones, in one statement per chunk"""
+        if db.bind.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        rows = []
+        for (monitor_id, period_start), (total, up, rt_sum, rt_count) in totals.items():
+            rows.append({
+                "id": uuid.uuid4(),
+                "monitor_id": monitor_id,
+                "granularity": "hour",
+                "period_start": period_start,
+                "period_end": period_start + HOUR,
+                "total_checks": total,
+                "failed_checks": total - up,
+                "uptime_percentage": round((up / total) * 100, 2) if total else 100.0,
+                "response_time_count": rt_count,
+                "avg_response_time": rt_sum / rt_count if rt_count else 0.0,
+                "created_at": datetime.utcnow()
+            })
+
+        for i in range(0, len(rows), KEY_CHUNK_SIZE):
+            statement = insert(Metric).values(rows[i:i + KEY_CHUNK_SIZE])
+            new = statement.excluded
+            if replace:
+                values = {
+                    column: new[column]
+                    for column in ("total_checks", "failed_checks", "uptime_percentage", "response_time_count", "avg_response_time")
+                }
+            else:
+                total = Metric.total_checks + new.total_checks
+                failed = Metric.failed_checks + new.failed_checks
+                rt_count = Metric.response_time_count + new.response_time_count
+                rt_sum = Metric.avg_response_time * Metric.response_time_count + new.avg_response_time * new.response_time_count
+                values = {
+                    "total_checks": total,
+                    "failed_checks": failed,
+                    "uptime_percentage": func.round(cast((total - failed) * 100.0 / total, Numeric), 2),
+                    "response_time_count": rt_count,
+                    "avg_response_time": case((rt_count > 0, rt_sum / rt_count), else_=0.0)
+                }
+            await db.execute(statement.on_conflict_do_update(
+                index_elements=[Metric.monitor_id, Metric.granularity, Metric.period_start],
+                set_=values
+            ))
+
+    @staticmethod
+    def _truncate_hour(db: AsyncSession, column):
+        if db.bind.dialect.name == "sqlite":
+            return func.strftime("%Y-%m-%d %H:00:00", column)
+        return func.date_trunc("hour", column)
+
+
+class RollupCompactionJob:
+    """Periodic compaction; the first run after startup backfills older history and a longer recent window"""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.last_run: Optional[datetime] = None
+
+    async def __call__(self):
+        if self.last_run is None:
+            lookback = settings.ROLLUP_BACKFILL_HOURS
+        else:
+            lookback = settings.ROLLUP_COMPACTION_LOOKBACK_HOURS
+
+        async with self.session_factory() as db:
+            if self.last_run is None:
+                await RollupService.backfill(db)
+            await RollupService.run_compaction(db, lookback)
+        self.last_run = datetime.utcnow()
@@ -0,0 +1,203 @@
+from app.utils.database import AsyncSessionLocal
+from app.utils.logger import logger
+from app.config import settings
+from typing import Optional, Dict, List as ListType, Tuple
+import asyncio
+import heapq
+import random
+import time
+import uuid
+
+
+class CheckScheduler:
+    """Single scheduler engine for all enabled monitors.
+
+    Monitors are kept in a heap keyed by their next-due time. A dispatcher pops
+    due entries and hands them to a fixed pool of workers through a bounded
+    queue, so the number of concurrent checks is capped globally no matter how
+    many monitors exist. Every check runs in its own database session.
+    """
+
+    def __init__(
+        self,
+        monitor_service,
+        session_factory=AsyncSessionLocal,
+        max_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        jitter: Optional[float] = None
+    ):
+        self.monitor_service = monitor_service
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency or settings.SCHEDULER_MAX_CONCURRENCY
+        self.queue_size = queue_size or settings.SCHEDULER_QUEUE_SIZE
+        self.jitter = settings.SCHEDULER_JITTER if jitter is None else jitter
+
+        self._heap: ListType[Tuple[float, int, str, int]] = []
+        self._intervals: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+        self._in_flight = set()
+        self._sequence = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._workers: ListType[asyncio.Task] = []
+
+        # Metrics
+        self.checks_dispatched = 0
+        self.checks_completed = 0
+        self.checks_failed = 0
+        self.checks_skipped = 0
+        self.lag_samples = 0
+        self.last_lag = 0.0
+        self.avg_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    async def start(self):
+        """Load all enabled monitors and start the dispatcher and worker pool"""
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._wakeup = asyncio.Event()
+
+        async with self.session_factory() as db:
+            monitors = await self.monitor_service.get_enabled_monitors(db)
+        for monitor in monitors:
+            self.schedule(monitor.id, monitor.interval)
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        logger.info(f"Check scheduler started: {len(self._intervals)} monitors, {self.max_concurrency} workers")
+
+    async def stop(self):
+        """Cancel the dispatcher and all workers"""
+        tasks = self._workers + ([self._dispatcher] if self._dispatcher else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._dispatcher = None
+        self._workers = []
+        self._in_flight.clear()
+        logger.info("Check scheduler stopped")
+
+    def schedule(self, monitor_id: uuid.UUID, interval: int, delay: Optional[float] = None):
+        """Add or reschedule a monitor. The first run is jittered across its interval unless a delay is given."""
+        key = str(monitor_id)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._intervals[key] = max(1, interval)
+
+        if delay is None:
+            delay = random.uniform(0, interval * self.jitter)
+        self._push(key, self._now() + delay, generation)
+
+        if self._wakeup:
+            self._wakeup.set()
+
+    def unschedule(self, monitor_id: uuid.UUID):
+        """Remove a monitor; its remaining heap entry is discarded lazily"""
+        key = str(monitor_id)
+        self._intervals.pop(key, None)
+        self._generations.pop(key, None)
+
+    def is_scheduled(self, monitor_id: uuid.UUID) -> bool:
+        return str(monitor_id) in self._intervals
+
+    def stats(self) -> Dict:
+        """Scheduler lag and queue depth metrics"""
+        now = self._now()
+        overdue = sum(1 for due, _, key, gen in self._heap if due <= now and self._generations.get(key) == gen)
+        return {
+            "running": self.running,
+            "scheduled_monitors": len(self._intervals),
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "in_flight": len(self._in_flight),
+            "overdue": overdue,
+            "lag_seconds": {
+                "last": round(self.last_lag, 4),
+                "avg": round(self.avg_lag, 4),
+                "max": round(self.max_lag, 4)
+            },
+            "checks_dispatched": self.checks_dispatched,
+            "checks_completed": self.checks_completed,
+            "checks_failed": self.checks_failed,
+            "checks_skipped": self.checks_skipped
+        }
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _push(self, key: str, due: float, generation: int):
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, key, generation))
+
+    async def _dispatch_loop(self):
+        while True:
+            now = self._now()
+            while self._heap and self._heap[0][0] <= now:
+                due, _, key, generation = heapq.heappop(self._heap)
+                if self._generations.get(key) != generation:
+                    continue  # stale entry for a removed or rescheduled monitor
+
+                interval = self._intervals[key]
+                next_due = due + interval
+                if next_due <= now:
+                    # Fell behind by a whole interval: skip ahead instead of bursting
+                    next_due = now + interval
+                self._push(key, next_due, generation)
+
+                if key in self._in_flight:
+                    self.checks_skipped += 1
+                    continue
+
+                self._in_flight.add(key)
+                self.checks_dispatched += 1
+                # Blocks when the worker pool is saturated; the wait shows up as lag
+                await self._queue.put((key, due))
+                now = self._now()
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self):
+        while True:
+            key, due = await self._queue.get()
+            self._record_lag(max(0.0, self._now() - due))
+            try:
+                await self._run_check(key)
+                self.checks_completed += 1
+            except Exception as e:
+                self.checks_failed += 1
+                logger.error(f"Error running scheduled check for {key}: {e}")
+            finally:
+                self._in_flight.discard(key)
+                self._queue.task_done()
+
+    async def _run_check(self, key: str):
+        async with self.session_factory() as db:
+            monitor = await self.monitor_service.get_monitor(db, uuid.UUID(key))
+            if not monitor or not monitor.enabled:
+                self.unschedule(key)
+                return
+
+            if key in self._intervals:
+                self._intervals[key] = max(1, monitor.interval)
+            await self.monitor_service.execute_check(db, monitor, batched=True)
+
+    def _record_lag(self, lag: float):
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.avg_lag = lag if self.lag_samples == 0 else 0.9 * self.avg_lag + 0.1 * lag
+        self.lag_samples += 1
@@ -0,0 +1,83 @@
+from fastapi.encoders import jsonable_encoder
+from app.config import settings
+from app.utils.logger import logger
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+import asyncio
+import hashlib
+import orjson
+import time
+
+
+class StatusPageSnapshot(NamedTuple):
+    body: bytes
+    etag: str
+    built_at: float
+
+
+class StatusPageCache:
+    """Materialized snapshot of the public status page payload.
+
+    The snapshot is rebuilt when monitors or incidents change, but never more
+    often than every `min_refresh` seconds, and at least every `max_age`
+    seconds so uptime figures keep moving. Concurrent requests share one
+    rebuild; everything else is served from memory.
+    """
+
+    def __init__(self, min_refresh: Optional[float] = None, max_age: Optional[float] = None):
+        self.min_refresh = settings.STATUS_PAGE_MIN_REFRESH if min_refresh is None else min_refresh
+        self.max_age = settings.STATUS_PAGE_MAX_AGE if max_age is None else max_age
+        self._snapshot: Optional[StatusPageSnapshot] = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.rebuilds = 0
+
+    def invalidate(self):
+        """Mark the snapshot stale; it is rebuilt on the next request after min_refresh"""
+        self._dirty = True
+
+    def clear(self):
+        """Drop the snapshot so the next request rebuilds immediately"""
+        self._snapshot = None
+        self._dirty = True
+
+    def _is_fresh(self) -> bool:
+        if self._snapshot is None:
+            return False
+        age = time.monotonic() - self._snapshot.built_at
+        if age < self.min_refresh:
+            return True
+        return not self._dirty and age < self.max_age
+
+    async def get(self, build: Callable[[], Awaitable[Dict]]) -> StatusPageSnapshot:
+        """Return the current snapshot, rebuilding it with `build` if stale"""
+        if self._is_fresh():
+            self.hits += 1
+            return self._snapshot
+
+        async with self._lock:
+            # Another request may have rebuilt it while we waited
+            if self._is_fresh():
+                self.hits += 1
+                return self._snapshot
+
+            self._dirty = False
+            try:
+                payload = await build()
+            except Exception:
+                self._dirty = True
+                raise
+            body = orjson.dumps(jsonable_encoder(payload))
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            self._snapshot = StatusPageSnapshot(body=body, etag=etag, built_at=time.monotonic())
+            self.rebuilds += 1
+            logger.debug(f"Rebuilt status page snapshot {etag}")
+            return self._snapshot
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
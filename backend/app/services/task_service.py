@@ -1,12 +1,32 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, update, and_, func
 from sqlalchemy.orm import selectinload
-from app.models import Board, List, Card, Activity
+from app.models import Board, List, Card, BoardTombstone, Activity
+from app.services.board_cache import board_cache
+from app.services.broadcaster import board_topic
+from app.services.event_bus import event_bus
+from app.utils.database import AsyncSessionLocal
 from app.utils.logger import logger
-from typing import Optional, List as ListType
+from app.utils.pagination import Page, keyset, fetch_page, stream_scalars
+from app.utils.positions import positions_between, spaced_positions
+from app.config import settings
+from typing import Any, Optional, AsyncIterator, Dict, List as ListType, Sequence, Set
 from datetime import datetime
 import uuid
 
+# Columns of the board read model (see BoardWithListsResponse)
+BOARD_COLUMNS = (Board.id, Board.name, Board.description, Board.version, Board.created_at, Board.updated_at)
+LIST_COLUMNS = (List.id, List.board_id, List.name, List.position, List.version, List.created_at)
+CARD_COLUMNS = (
+    Card.id, Card.list_id, Card.title, Card.description, Card.position,
+    Card.version, Card.completed, Card.created_at, Card.updated_at
+)
+
+# Parents (board ids for lists, list ids for cards) where this worker placed a
+# row closer than POSITION_REBALANCE_GAP to a neighbour; the rebalance job
+# only looks at these rather than scanning every board and list
+crowded_parents: Dict[type, Set[uuid.UUID]] = {List: set(), Card: set()}
+
 
 class TaskService:
     @staticmethod
@@ -42,6 +62,24 @@ class TaskService:
         result = await db.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    async def get_boards_page(db: AsyncSession, user_id: Optional[uuid.UUID] = None, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        """Get a page of boards after `cursor`, oldest first (keyset pagination)"""
+        query = select(Board).where(Board.deleted_at.is_(None))
+        if user_id:
+            query = query.where(Board.user_id == user_id)
+        query = keyset(query, Board.created_at, Board.id, cursor)
+        return await fetch_page(db, query, limit, lambda board: (board.created_at, board.id))
+
+    @staticmethod
+    async def iter_boards(db: AsyncSession, user_id: Optional[uuid.UUID] = None) -> AsyncIterator[Board]:
+        """Stream all boards in creation order without loading them all"""
+        query = select(Board).where(Board.deleted_at.is_(None))
+        if user_id:
+            query = query.where(Board.user_id == user_id)
+        async for board in stream_scalars(db, keyset(query, Board.created_at, Board.id)):
+            yield board
+
     @staticmethod
     async def get_board(db: AsyncSession, board_id: uuid.UUID) -> Optional[Board]:
         """Get board with all lists and cards"""
@@ -53,10 +91,98 @@ class TaskService:
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_board_payload(db: AsyncSession, board_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        """Board with lists and cards as plain dicts, shaped like BoardWithListsResponse
+
+        Selects only the response columns and builds the payload straight from
+        the rows, skipping ORM instances and schema validation. Used to render
+        board snapshots, which can hold thousands of cards.
+        """
+        result = await db.execute(
+            select(*BOARD_COLUMNS).where(and_(Board.id == board_id, Board.deleted_at.is_(None)))
+        )
+        board = result.mappings().one_or_none()
+        if board is None:
+            return None
+
+        result = await db.execute(
+            select(*LIST_COLUMNS)
+            .where(List.board_id == board_id)
+            .order_by(List.position)
+        )
+        lists = [{**row, "cards": []} for row in result.mappings()]
+        cards_by_list = {lst["id"]: lst["cards"] for lst in lists}
+
+        result = await db.execute(
+            select(*CARD_COLUMNS)
+            .join(List, Card.list_id == List.id)
+            .where(List.board_id == board_id)
+            .order_by(Card.position)
+        )
+        for row in result.mappings():
+            cards_by_list[row["list_id"]].append(dict(row))
+
+        return {**board, "lists": lists}
+
+    @staticmethod
+    async def get_board_changes(db: AsyncSession, board_id: uuid.UUID, since: int) -> Optional[Dict[str, Any]]:
+        """Lists and cards changed, and lists and cards removed, after board version `since`
+
+        Rows have the same shape as in get_board_payload (lists without their
+        cards). Clients apply them and sync again from the returned version.
+        When `since` is older than the board's pruned tombstones the removals
+        can't be reported, and the result is {"snapshot_required": True, ...}.
+        """
+        result = await db.execute(
+            select(*BOARD_COLUMNS, Board.sync_horizon).where(and_(Board.id == board_id, Board.deleted_at.is_(None)))
+        )
+        board = result.mappings().one_or_none()
+        if board is None:
+            return None
+        board = dict(board)
+        if since < board.pop("sync_horizon"):
+            return {"snapshot_required": True, "version": board["version"]}
+
+        result = await db.execute(
+            select(*LIST_COLUMNS)
+            .where(and_(List.board_id == board_id, List.version > since))
+            .order_by(List.position)
+        )
+        lists = [dict(row) for row in result.mappings()]
+
+        result = await db.execute(
+            select(*CARD_COLUMNS)
+            .join(List, Card.list_id == List.id)
+            .where(and_(List.board_id == board_id, Card.version > since))
+            .order_by(Card.position)
+        )
+        cards = [dict(row) for row in result.mappings()]
+
+        # An entity that left and came back is reported as changed, not deleted
+        present = {row["id"] for row in lists} | {row["id"] for row in cards}
+        result = await db.execute(
+            select(BoardTombstone.entity_type, BoardTombstone.entity_id.label("id"))
+            .where(and_(BoardTombstone.board_id == board_id, BoardTombstone.version > since))
+            .order_by(BoardTombstone.version)
+        )
+        deleted = [dict(row) for row in result.mappings() if row["id"] not in present]
+
+        return {"board": board, "version": board["version"], "lists": lists, "cards": cards, "deleted": deleted}
+
+    @staticmethod
+    async def board_exists(db: AsyncSession, board_id: uuid.UUID) -> bool:
+        """Check that a board exists and is not deleted, without loading it"""
+        query = select(Board.id).where(and_(Board.id == board_id, Board.deleted_at.is_(None)))
+        result = await db.execute(query)
+        return result.scalar_one_or_none() is not None
+
     @staticmethod
     async def update_board(db: AsyncSession, board_id: uuid.UUID, name: Optional[str] = None, description: Optional[str] = None) -> Optional[Board]:
         """Update board"""
-        board = await TaskService.get_board(db, board_id)
+        query = select(Board).where(and_(Board.id == board_id, Board.deleted_at.is_(None)))
+        result = await db.execute(query)
+        board = result.scalar_one_or_none()
         if not board:
             return None
 
@@ -65,79 +191,497 @@ class TaskService:
         if description is not None:
             board.description = description
         board.updated_at = datetime.utcnow()
+        board.version = Board.version + 1
 
         await db.commit()
         await db.refresh(board)
+        await TaskService._changed(board_id)
         return board
 
     @staticmethod
     async def delete_board(db: AsyncSession, board_id: uuid.UUID) -> bool:
         """Soft delete board"""
-        board = await TaskService.get_board(db, board_id)
-        if not board:
+        result = await db.execute(
+            update(Board)
+            .where(and_(Board.id == board_id, Board.deleted_at.is_(None)))
+            .values(deleted_at=datetime.utcnow(), version=Board.version + 1)
+        )
+        if not result.rowcount:
             return False
 
-        board.deleted_at = datetime.utcnow()
         await db.commit()
+        await TaskService._changed(board_id)
         logger.info(f"Deleted board: {board_id}")
         return True
 
     @staticmethod
-    async def create_list(db: AsyncSession, board_id: uuid.UUID, name: str, position: int = 0) -> Optional[List]:
-        """Create a new list"""
-        board = await TaskService.get_board(db, board_id)
-        if not board:
+    async def create_list(db: AsyncSession, board_id: uuid.UUID, name: str, position: Optional[float] = None) -> Optional[List]:
+        """Create a new list, appended after the board's last list unless `position` is given"""
+        version = await TaskService._bump_version(db, board_id)
+        if version is None:
             return None
 
-        list_obj = List(board_id=board_id, name=name, position=position)
+        if position is None:
+            position = await TaskService._place(db, List, List.board_id, board_id, version)
+        list_obj = List(board_id=board_id, name=name, position=position, version=version)
         db.add(list_obj)
         await db.commit()
         await db.refresh(list_obj)
+        await TaskService._changed(board_id)
 
         logger.info(f"Created list: {list_obj.id} in board {board_id}")
         return list_obj
 
     @staticmethod
-    async def create_card(db: AsyncSession, list_id: uuid.UUID, title: str, description: Optional[str] = None, position: int = 0) -> Optional[Card]:
-        """Create a new card"""
+    async def create_card(
+        db: AsyncSession,
+        list_id: uuid.UUID,
+        title: str,
+        description: Optional[str] = None,
+        position: Optional[float] = None,
+        after_card_id: Optional[uuid.UUID] = None,
+        before_card_id: Optional[uuid.UUID] = None
+    ) -> Optional[Card]:
+        """Create a new card
+
+        Placed at `position`, or right after/before a neighbouring card, or at
+        the end of the list. Raises ValueError if the neighbour is not in the list.
+        """
         query = select(List).where(List.id == list_id)
         result = await db.execute(query)
         list_obj = result.scalar_one_or_none()
 
         if not list_obj:
             return None
+        version = await TaskService._bump_version(db, list_obj.board_id)
+        if version is None:
+            return None
 
-        card = Card(list_id=list_id, title=title, description=description, position=position)
+        if position is None:
+            position = await TaskService._place(
+                db, Card, Card.list_id, list_id, version, after_id=after_card_id, before_id=before_card_id
+            )
+        card = Card(list_id=list_id, title=title, description=description, position=position, version=version)
         db.add(card)
         await db.commit()
         await db.refresh(card)
+        await TaskService._changed(list_obj.board_id)
 
         logger.info(f"Created card: {card.id} in list {list_id}")
         return card
 
     @staticmethod
-    async def move_card(db: AsyncSession, card_id: uuid.UUID, new_list_id: uuid.UUID, new_position: int) -> Optional[Card]:
-        """Move card to different list"""
+    async def move_card(
+        db: AsyncSession,
+        card_id: uuid.UUID,
+        new_list_id: uuid.UUID,
+        new_position: Optional[float] = None,
+        after_card_id: Optional[uuid.UUID] = None,
+        before_card_id: Optional[uuid.UUID] = None
+    ) -> Optional[Card]:
+        """Move card to a list, at `new_position`, next to a neighbouring card, or at the end
+
+        Only the moved card's row is written, unless its neighbours have run
+        out of room and the list has to be renumbered first. Raises ValueError
+        if the neighbour is not in the target list.
+        """
         query = select(Card).where(Card.id == card_id)
         result = await db.execute(query)
         card = result.scalar_one_or_none()
 
         if not card:
             return None
+        if card_id in (after_card_id, before_card_id):
+            raise ValueError("A card cannot be placed next to itself")
+
+        board_id = await db.scalar(select(List.board_id).where(List.id == new_list_id))
+        old_board_id = await db.scalar(select(List.board_id).where(List.id == card.list_id))
+        versions = await TaskService._bump_versions(db, board_id, old_board_id) if board_id else {}
+        version = versions.get(board_id)
+        if version is None:
+            raise ValueError(f"List {new_list_id} not found")
+
+        if new_position is None:
+            new_position = await TaskService._place(
+                db, Card, Card.list_id, new_list_id, version,
+                exclude_id=card_id, after_id=after_card_id, before_id=before_card_id
+            )
+
+        if old_board_id != board_id and old_board_id in versions:
+            await TaskService._tombstone(db, old_board_id, versions[old_board_id], "card", [card_id])
 
         card.list_id = new_list_id
         card.position = new_position
+        card.version = version
         card.updated_at = datetime.utcnow()
 
         await db.commit()
         await db.refresh(card)
+        await TaskService._changed(board_id, old_board_id)
 
         logger.info(f"Moved card: {card_id} to list {new_list_id}")
         return card
 
+    @staticmethod
+    async def create_cards(db: AsyncSession, list_id: uuid.UUID, cards: ListType[Dict]) -> Optional[ListType[Card]]:
+        """Create many cards with a single INSERT in one transaction
+
+        Each item has a title and optional description and position; items
+        without a position are appended after the list's last card, in order.
+        """
+        board_id = await db.scalar(select(List.board_id).where(List.id == list_id))
+        version = await TaskService._bump_version(db, board_id) if board_id else None
+        if version is None:
+            return None
+
+        appended = sum(1 for card in cards if card.get("position") is None)
+        positions = iter(await TaskService._place_many(db, Card, Card.list_id, list_id, version, appended) if appended else [])
+        rows = [
+            {
+                "list_id": list_id,
+                "version": version,
+                "title": card["title"],
+                "description": card.get("description"),
+                "position": card["position"] if card.get("position") is not None else next(positions)
+            }
+            for card in cards
+        ]
+        result = await db.scalars(insert(Card).returning(Card, sort_by_parameter_order=True), rows)
+        created = result.all()
+
+        await db.commit()
+        await TaskService._changed(board_id)
+        logger.info(f"Created {len(created)} cards in list {list_id}")
+        return created
+
+    @staticmethod
+    async def move_cards(
+        db: AsyncSession,
+        card_ids: ListType[uuid.UUID],
+        new_list_id: uuid.UUID,
+        after_card_id: Optional[uuid.UUID] = None,
+        before_card_id: Optional[uuid.UUID] = None
+    ) -> Optional[ListType[Card]]:
+        """Move several cards into a list as one contiguous run, in the given order
+
+        The run goes after/before a neighbouring card or at the end of the
+        list, and is written with a single bulk UPDATE. Returns None if the
+        list does not exist; raises ValueError for unknown or repeated cards.
+        """
+        if len(set(card_ids)) != len(card_ids):
+            raise ValueError("Card ids must be unique")
+        if after_card_id in card_ids or before_card_id in card_ids:
+            raise ValueError("A card cannot be placed next to itself")
+
+        board_id = await db.scalar(select(List.board_id).where(List.id == new_list_id))
+        if board_id is None:
+            return None
+
+        result = await db.execute(
+            select(Card.id, List.board_id).join(List, Card.list_id == List.id).where(Card.id.in_(card_ids))
+        )
+        old_board_ids = dict(result.all())
+        missing = [str(card_id) for card_id in card_ids if card_id not in old_board_ids]
+        if missing:
+            raise ValueError(f"Cards not found: {', '.join(missing)}")
+
+        versions = await TaskService._bump_versions(db, board_id, *old_board_ids.values())
+        version = versions.get(board_id)
+        if version is None:
+            return None
+        positions = await TaskService._place_many(
+            db, Card, Card.list_id, new_list_id, version, len(card_ids), card_ids, after_card_id, before_card_id
+        )
+        now = datetime.utcnow()
+        await db.execute(
+            update(Card),
+            [
+                {"id": card_id, "list_id": new_list_id, "position": position, "version": version, "updated_at": now}
+                for card_id, position in zip(card_ids, positions)
+            ]
+        )
+
+        moved_out: Dict[uuid.UUID, ListType[uuid.UUID]] = {}
+        for card_id, old_board_id in old_board_ids.items():
+            if old_board_id != board_id:
+                moved_out.setdefault(old_board_id, []).append(card_id)
+        for old_board_id, ids in moved_out.items():
+            if old_board_id in versions:
+                await TaskService._tombstone(db, old_board_id, versions[old_board_id], "card", ids)
+
+        await db.commit()
+        await TaskService._changed(board_id, *old_board_ids.values())
+        logger.info(f"Moved {len(card_ids)} cards to list {new_list_id}")
+        return await TaskService._load_in_order(db, Card, card_ids)
+
+    @staticmethod
+    async def reorder_cards(db: AsyncSession, list_id: uuid.UUID, card_ids: ListType[uuid.UUID]) -> Optional[ListType[Card]]:
+        """Set the order of every card in a list with one bulk UPDATE
+
+        `card_ids` must name each card in the list exactly once. Returns None
+        if the list does not exist.
+        """
+        board_id = await db.scalar(select(List.board_id).where(List.id == list_id))
+        version = await TaskService._bump_version(db, board_id) if board_id else None
+        if version is None:
+            return None
+
+        await TaskService._reorder(db, Card, Card.list_id, list_id, card_ids, version)
+        await db.commit()
+        await TaskService._changed(board_id)
+        return await TaskService._load_in_order(db, Card, card_ids)
+
+    @staticmethod
+    async def reorder_lists(db: AsyncSession, board_id: uuid.UUID, list_ids: ListType[uuid.UUID]) -> Optional[ListType[List]]:
+        """Set the order of every list in a board with one bulk UPDATE
+
+        `list_ids` must name each list in the board exactly once. Returns None
+        if the board does not exist.
+        """
+        version = await TaskService._bump_version(db, board_id)
+        if version is None:
+            return None
+
+        await TaskService._reorder(db, List, List.board_id, board_id, list_ids, version)
+        await db.commit()
+        await TaskService._changed(board_id)
+        return await TaskService._load_in_order(db, List, list_ids)
+
+    @staticmethod
+    async def _reorder(db: AsyncSession, model, parent_col, parent_id: uuid.UUID, ids: ListType[uuid.UUID], version: int):
+        result = await db.execute(select(model.id).where(parent_col == parent_id))
+        current = set(result.scalars().all())
+        if len(ids) != len(current) or set(ids) != current:
+            raise ValueError(f"Expected every {model.__tablename__[:-1]} in {parent_id} exactly once")
+        await TaskService._write_positions(db, model, ids, version)
+
+    @staticmethod
+    async def _write_positions(db: AsyncSession, model, ids: Sequence[uuid.UUID], version: int):
+        """Give `ids` evenly spaced positions in order with one bulk UPDATE (not committed)"""
+        if ids:
+            await db.execute(
+                update(model),
+                [
+                    {"id": row_id, "position": position, "version": version}
+                    for row_id, position in zip(ids, spaced_positions(len(ids)))
+                ]
+            )
+
+    @staticmethod
+    async def _changed(*board_ids: uuid.UUID):
+        """After a commit: drop cached snapshots and tell each board's subscribers to sync"""
+        await board_cache.invalidate(*board_ids)
+        for board_id in set(board_ids):
+            if board_id is not None:
+                await event_bus.publish(board_topic(board_id), {"type": "board_changed", "data": {"board_id": board_id}})
+
+    @staticmethod
+    async def _bump_version(db: AsyncSession, board_id: uuid.UUID) -> Optional[int]:
+        """Increment a live board's version and return it; None if the board is missing or deleted
+
+        The row lock taken by the UPDATE orders concurrent writers to the same
+        board, so versions are committed in increasing order. A write touching
+        several boards must lock them through _bump_versions instead.
+        """
+        result = await db.execute(
+            update(Board)
+            .where(and_(Board.id == board_id, Board.deleted_at.is_(None)))
+            # Keep updated_at for edits to the board itself rather than its contents
+            .values(version=Board.version + 1, updated_at=Board.updated_at)
+            .returning(Board.version)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def _bump_versions(db: AsyncSession, *board_ids: uuid.UUID) -> Dict[uuid.UUID, int]:
+        """Bump several boards' versions, locking them in id order
+
+        Writers that take the board row locks in a fixed order can't deadlock
+        each other, e.g. two cards moving between the same boards in opposite
+        directions. Missing and deleted boards are left out of the result.
+        """
+        versions = {}
+        for board_id in sorted({board_id for board_id in board_ids if board_id is not None}):
+            version = await TaskService._bump_version(db, board_id)
+            if version is not None:
+                versions[board_id] = version
+        return versions
+
+    @staticmethod
+    async def _tombstone(db: AsyncSession, board_id: uuid.UUID, version: int, entity_type: str, entity_ids: Sequence[uuid.UUID]):
+        """Record entities leaving a board at its already bumped `version` so incremental sync reports them as deleted (not committed)"""
+        await db.execute(
+            insert(BoardTombstone),
+            [
+                {"board_id": board_id, "entity_type": entity_type, "entity_id": entity_id, "version": version}
+                for entity_id in entity_ids
+            ]
+        )
+
+    @staticmethod
+    async def _load_in_order(db: AsyncSession, model, ids: ListType[uuid.UUID]) -> ListType:
+        # populate_existing: bulk UPDATEs bypass objects already in the session
+        result = await db.execute(
+            select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+        )
+        rows = {row.id: row for row in result.scalars().all()}
+        return [rows[row_id] for row_id in ids]
+
+    @staticmethod
+    async def _place(
+        db: AsyncSession,
+        model,
+        parent_col,
+        parent_id: uuid.UUID,
+        version: int,
+        exclude_id: Optional[uuid.UUID] = None,
+        after_id: Optional[uuid.UUID] = None,
+        before_id: Optional[uuid.UUID] = None
+    ) -> float:
+        """Position for one row among its siblings (lists of a board or cards of a list)"""
+        exclude_ids = [exclude_id] if exclude_id is not None else []
+        positions = await TaskService._place_many(db, model, parent_col, parent_id, version, 1, exclude_ids, after_id, before_id)
+        return positions[0]
+
+    @staticmethod
+    async def _place_many(
+        db: AsyncSession,
+        model,
+        parent_col,
+        parent_id: uuid.UUID,
+        version: int,
+        count: int,
+        exclude_ids: Sequence[uuid.UUID] = (),
+        after_id: Optional[uuid.UUID] = None,
+        before_id: Optional[uuid.UUID] = None
+    ) -> ListType[float]:
+        """Positions for a contiguous run of `count` rows among their siblings
+
+        Reads at most two neighbour positions through the (parent, position)
+        index. When the neighbours are too close to split, the siblings are
+        renumbered in the current transaction (stamped with `version`) and
+        the lookup is repeated.
+        """
+        args = (db, model, parent_col, parent_id, count, exclude_ids, after_id, before_id)
+        positions = await TaskService._between_neighbours(*args)
+        if positions is None:
+            await TaskService._renumber(db, model, parent_col, parent_id, version)
+            positions = await TaskService._between_neighbours(*args)
+        return positions
+
+    @staticmethod
+    async def _between_neighbours(db: AsyncSession, model, parent_col, parent_id, count, exclude_ids, after_id, before_id) -> Optional[ListType[float]]:
+        siblings = [parent_col == parent_id]
+        if exclude_ids:
+            siblings.append(model.id.not_in(exclude_ids))
+
+        async def neighbour_position(neighbour_id: uuid.UUID) -> float:
+            result = await db.execute(select(model.position).where(and_(model.id == neighbour_id, *siblings)))
+            position = result.scalar_one_or_none()
+            if position is None:
+                raise ValueError(f"{neighbour_id} is not in {parent_id}")
+            return position
+
+        # Ties with the neighbour count as "no room", so duplicate positions get renumbered
+        if after_id is not None:
+            lower = await neighbour_position(after_id)
+            result = await db.execute(
+                select(func.min(model.position)).where(and_(*siblings, model.id != after_id, model.position >= lower))
+            )
+            upper = result.scalar()
+        elif before_id is not None:
+            upper = await neighbour_position(before_id)
+            result = await db.execute(
+                select(func.max(model.position)).where(and_(*siblings, model.id != before_id, model.position <= upper))
+            )
+            lower = result.scalar()
+        else:
+            result = await db.execute(select(func.max(model.position)).where(and_(*siblings)))
+            lower, upper = result.scalar(), None
+
+        if lower is not None and upper is not None and (upper - lower) / (count + 1) < settings.POSITION_REBALANCE_GAP:
+            crowded_parents[model].add(parent_id)
+        return positions_between(lower, upper, count, settings.POSITION_MIN_GAP)
+
+    @staticmethod
+    async def _renumber(db: AsyncSession, model, parent_col, parent_id: uuid.UUID, version: int):
+        """Spread a parent's children evenly, keeping their order (not committed)"""
+        result = await db.execute(
+            select(model.id).where(parent_col == parent_id).order_by(model.position, model.id)
+        )
+        ids = result.scalars().all()
+        await TaskService._write_positions(db, model, ids, version)
+        logger.info(f"Renumbered {len(ids)} {model.__tablename__} in {parent_id}")
+
+    @staticmethod
+    async def rebalance_positions(db: AsyncSession, min_gap: Optional[float] = None, limit: int = 100) -> int:
+        """Renumber crowded boards and lists whose neighbouring positions are closer than `min_gap`
+
+        Runs in the background so that moves rarely hit an exhausted gap
+        themselves. Only parents recorded in crowded_parents since the last
+        run are checked, at most `limit` of each kind per run. Returns the
+        number of parents renumbered.
+        """
+        min_gap = settings.POSITION_REBALANCE_GAP if min_gap is None else min_gap
+        renumbered = 0
+        board_ids = set()
+
+        for model, parent_col in ((List, List.board_id), (Card, Card.list_id)):
+            candidates = list(crowded_parents[model])[:limit]
+            if not candidates:
+                continue
+            crowded_parents[model].difference_update(candidates)
+            gaps = select(
+                parent_col.label("parent_id"),
+                (model.position - func.lag(model.position).over(partition_by=parent_col, order_by=model.position)).label("gap")
+            ).where(parent_col.in_(candidates)).subquery()
+            result = await db.execute(
+                select(gaps.c.parent_id).where(gaps.c.gap < min_gap).distinct()
+            )
+            for parent_id in result.scalars().all():
+                if model is List:
+                    board_id = parent_id
+                else:
+                    board_id = await db.scalar(select(List.board_id).where(List.id == parent_id))
+                version = await TaskService._bump_version(db, board_id)
+                if version is None:  # deleted board
+                    continue
+                await TaskService._renumber(db, model, parent_col, parent_id, version)
+                # One board lock at a time, so this can't deadlock with writers
+                await db.commit()
+                renumbered += 1
+                board_ids.add(board_id)
+
+        if renumbered:
+            await TaskService._changed(*board_ids)
+        return renumbered
+
     @staticmethod
     async def get_board_activity(db: AsyncSession, board_id: uuid.UUID, limit: int = 50) -> ListType[Activity]:
-        """Get board activity log"""
-        query = select(Activity).where(Activity.board_id == board_id).order_by(Activity.timestamp.desc()).limit(limit)
-        result = await db.execute(query)
-        return result.scalars().all()
+        """Get board activity log, newest first"""
+        page = await TaskService.get_board_activity_page(db, board_id, limit=limit)
+        return page.items
+
+    @staticmethod
+    async def get_board_activity_page(db: AsyncSession, board_id: uuid.UUID, cursor: Optional[str] = None, limit: int = 50) -> Page:
+        """Newest-first page of board activity after `cursor`
+
+        Seeks the (board_id, timestamp, id) index, so deep pages cost the same
+        as the first one. Archived activity is not included.
+        """
+        query = select(Activity).where(Activity.board_id == board_id)
+        query = keyset(query, Activity.timestamp, Activity.id, cursor, descending=True)
+        return await fetch_page(db, query, limit, lambda activity: (activity.timestamp, activity.id))
+
+
+class PositionRebalanceJob:
+    """Periodic renumbering of crowded lists and boards"""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def __call__(self):
+        async with self.session_factory() as db:
+            renumbered = await TaskService.rebalance_positions(db)
+        if renumbered:
+            logger.info(f"Rebalanced positions in {renumbered} lists/boards")
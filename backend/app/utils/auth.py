@@ -5,14 +5,28 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import settings
+from app.utils.cache import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import time
 import uuid
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt is deliberately slow and CPU bound; the async variants run it on a
+# dedicated pool so logins never block the event loop or starve the default executor.
+# Created on first use, so a new app lifespan after a shutdown gets a fresh one.
+_password_hash_executor: Optional[ThreadPoolExecutor] = None
 
 # Security scheme
 security = HTTPBearer()
 
+# Verified token payloads keyed by SHA-256 of the token, so repeat requests
+# from the same session skip signature verification
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
@@ -24,6 +38,37 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_hash_executor() -> ThreadPoolExecutor:
+    """The password hashing pool, created if there is none"""
+    global _password_hash_executor
+    if _password_hash_executor is None:
+        _password_hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+    return _password_hash_executor
+
+
+def shutdown_password_hash_executor():
+    """Stop the password hashing pool; the next hash or verify starts a new one"""
+    global _password_hash_executor
+    if _password_hash_executor is not None:
+        _password_hash_executor.shutdown(wait=False)
+        _password_hash_executor = None
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor(), verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor(), get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -40,13 +85,29 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify JWT token and return payload"""
+    """Verify JWT token and return payload
+
+    Successful verifications are cached until the earlier of the token's exp
+    and TOKEN_CACHE_TTL; invalid tokens are never cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    if settings.TOKEN_CACHE_TTL > 0:
+        ttl = settings.TOKEN_CACHE_TTL
+        if "exp" in payload:
+            ttl = min(ttl, float(payload["exp"]) - time.time())
+        if ttl > 0:
+            token_cache.set(key, dict(payload), ttl=ttl)
+    return payload
+
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
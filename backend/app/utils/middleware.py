@@ -1,105 +1,158 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.services.audit_service import AuditService
-from app.utils.database import AsyncSessionLocal
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.audit_queue import AuditLogQueue
+from app.utils.auth import verify_token
 from app.utils.logger import logger
+from app.utils.rate_limit import RateLimiter, RateLimitRule, InMemoryRateLimitStore
+from app.config import settings
+from typing import Optional
 import time
 import json
+import uuid
 
+BODY_METHODS = ("POST", "PUT", "PATCH")
 
-class AuditMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all API requests for audit trail"""
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+def bearer_user_id(scope: Scope) -> Optional[str]:
+    """User id (`sub`) from a valid bearer token in the request headers, else None"""
+    for name, value in scope.get("headers") or []:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                payload = verify_token(token)
+                return payload.get("sub") if payload else None
+            return None
+    return None
 
-        # Extract request info
-        method = request.method
-        endpoint = str(request.url.path)
-        ip_address = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
 
-        # Read request body (for audit logging)
-        request_body = None
-        if method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.body()
-                if body:
-                    request_body = json.loads(body.decode())
-                # Reset the request body for downstream processing
-                async def receive():
-                    return {"type": "http.request", "body": body}
-                request._receive = receive
-            except:
-                pass
+class AuditMiddleware:
+    """Middleware to log all API requests for audit trail
+
+    Plain ASGI: the request body is teed as the application reads it, keeping
+    at most max_body_capture bytes, so requests are never buffered up front.
+    Events are handed to an AuditLogQueue and written by its background writer,
+    so responses never wait on audit persistence.
+    """
 
-        # Process request
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp, queue: AuditLogQueue, max_body_capture: Optional[int] = None):
+        self.app = app
+        self.queue = queue
+        self.max_body_capture = settings.AUDIT_MAX_BODY_CAPTURE if max_body_capture is None else max_body_capture
 
-        # Calculate processing time
-        process_time = time.time() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Log to audit trail (async, don't block response)
-        if not endpoint.startswith("/ws"):  # Skip websocket endpoints
+        start_time = time.time()
+        method = scope["method"]
+        captured = bytearray()
+        truncated = False
+        response_status = 500
+
+        async def tee_receive() -> Message:
+            nonlocal truncated
+            message = await receive()
+            if message["type"] == "http.request" and not truncated:
+                chunk = message.get("body", b"")
+                if len(captured) + len(chunk) > self.max_body_capture:
+                    truncated = True
+                    captured.clear()
+                else:
+                    captured.extend(chunk)
+            return message
+
+        async def send_with_timing(message: Message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                # Add processing time header
+                process_time = time.time() - start_time
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-process-time", str(process_time).encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, tee_receive if method in BODY_METHODS else receive, send_with_timing)
+        finally:
+            await self._log(scope, bytes(captured), truncated, response_status)
+
+    async def _log(self, scope: Scope, body: bytes, truncated: bool, response_status: int):
+        endpoint = scope["path"]
+        if endpoint.startswith("/ws"):  # Skip websocket endpoints
+            return
+
+        request_body = None
+        details = None
+        if truncated:
+            details = f"Request body larger than {self.max_body_capture} bytes, not captured"
+        elif body:
             try:
-                async with AsyncSessionLocal() as db:
-                    # Extract resource type and action from endpoint
-                    parts = endpoint.split("/")
-                    resource_type = parts[2] if len(parts) > 2 else "unknown"
-                    action = f"{method.lower()}_{resource_type}"
-
-                    await AuditService.log_request(
-                        db=db,
-                        action=action,
-                        resource_type=resource_type,
-                        method=method,
-                        endpoint=endpoint,
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_body=request_body,
-                        response_status=response.status_code
-                    )
-            except Exception as e:
-                logger.error(f"Failed to log audit trail: {e}")
-
-        # Add processing time header
-        response.headers["X-Process-Time"] = str(process_time)
-
-        return response
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple rate limiting middleware"""
-
-    def __init__(self, app, max_requests: int = 100, window: int = 60):
-        super().__init__(app)
-        self.max_requests = max_requests
-        self.window = window
-        self.requests = {}
-
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host if request.client else "unknown"
-
-        # Clean old entries
-        current_time = time.time()
-        self.requests = {
-            ip: [req_time for req_time in times if current_time - req_time < self.window]
-            for ip, times in self.requests.items()
-        }
-
-        # Check rate limit
-        if client_ip in self.requests:
-            if len(self.requests[client_ip]) >= self.max_requests:
-                return Response(
-                    content="Rate limit exceeded",
-                    status_code=429,
-                    headers={"Retry-After": str(self.window)}
-                )
-
-        # Add current request
-        if client_ip not in self.requests:
-            self.requests[client_ip] = []
-        self.requests[client_ip].append(current_time)
-
-        response = await call_next(request)
-        return response
+                request_body = json.loads(body)
+            except ValueError:
+                pass
+
+        headers = dict(scope.get("headers") or [])
+        user_agent = headers.get(b"user-agent")
+        client = scope.get("client")
+        try:
+            user_id = uuid.UUID(bearer_user_id(scope) or "")
+        except ValueError:
+            user_id = None
+
+        # Queue for the audit trail (written in the background, doesn't block response)
+        try:
+            # Extract resource type and action from endpoint
+            parts = endpoint.split("/")
+            resource_type = parts[2] if len(parts) > 2 else "unknown"
+            method = scope["method"]
+
+            await self.queue.enqueue(
+                user_id=user_id,
+                action=f"{method.lower()}_{resource_type}",
+                resource_type=resource_type,
+                method=method,
+                endpoint=endpoint,
+                ip_address=client[0] if client else None,
+                user_agent=user_agent.decode("latin-1") if user_agent else None,
+                request_body=request_body,
+                response_status=response_status,
+                details=details
+            )
+        except Exception as e:
+            logger.error(f"Failed to log audit trail: {e}")
+
+
+class RateLimitMiddleware:
+    """Rate limiting middleware
+
+    Delegates to a RateLimiter (sliding window counters, per-user/per-IP and
+    per-route rules, in-process or Redis store). Passing only max_requests and
+    window builds an in-process limiter with a single per-client rule.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None, max_requests: int = 100, window: int = 60):
+        self.app = app
+        self.limiter = limiter or RateLimiter(InMemoryRateLimitStore(), RateLimitRule(max_requests, window))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
+        # Unauthenticated clients are limited by IP
+        result = await self.limiter.check(scope["method"], scope["path"], client_ip, bearer_user_id(scope))
+        if not result.allowed:
+            response = PlainTextResponse(
+                "Rate limit exceeded",
+                status_code=429,
+                headers={"Retry-After": str(result.retry_after), "X-RateLimit-Limit": str(result.limit)}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,92 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, and_, or_
+from typing import Any, AsyncIterator, Callable, List as ListType, NamedTuple, Optional, Tuple
+from datetime import datetime
+import base64
+import json
+import uuid
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class Page(NamedTuple):
+    items: ListType[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """Opaque cursor for the position just after (sort_value, row_id)"""
+    raw = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset(query: Select, sort_column, id_column, cursor: Optional[str] = None, descending: bool = False) -> Select:
+    """Order a query by (sort_column, id_column) and start it after `cursor`
+
+    The id column breaks ties between rows with the same sort value, so pages
+    never skip or repeat rows, and the seek uses the (sort, id) order instead
+    of scanning past OFFSET rows.
+    """
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.where(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id)
+            ))
+        else:
+            query = query.where(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id)
+            ))
+
+    if descending:
+        return query.order_by(sort_column.desc(), id_column.desc())
+    return query.order_by(sort_column.asc(), id_column.asc())
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    limit: int,
+    cursor_key: Callable[[Any], Tuple[datetime, uuid.UUID]]
+) -> Page:
+    """Run a keyset-ordered query and return one page plus the cursor for the next one"""
+    result = await db.execute(query.limit(limit + 1))
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(*cursor_key(items[-1]))
+    return Page(items=items, next_cursor=next_cursor)
+
+
+async def stream_scalars(db: AsyncSession, query: Select, chunk_size: int = 500) -> AsyncIterator[Any]:
+    """Iterate a query with a server-side cursor, `chunk_size` rows at a time"""
+    result = await db.stream_scalars(query.execution_options(yield_per=chunk_size))
+    async for row in result:
+        yield row
+
+
+async def ndjson_stream(rows: AsyncIterator[Any], schema, batch_size: int = 100) -> AsyncIterator[bytes]:
+    """Serialize rows through a pydantic schema as newline-delimited JSON, a batch per chunk"""
+    lines = []
+    async for row in rows:
+        lines.append(schema.model_validate(row).model_dump_json())
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
@@ -0,0 +1,43 @@
+from app.utils.logger import logger
+from typing import Awaitable, Callable, Optional
+import asyncio
+
+
+class PeriodicTask:
+    """Runs a background job every `interval` seconds until stopped"""
+
+    def __init__(self, name: str, interval: float, func: Callable[[], Awaitable], initial_delay: float = 0.0):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.initial_delay = initial_delay
+        self.runs = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"Started periodic job '{self.name}' every {self.interval}s")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info(f"Stopped periodic job '{self.name}'")
+
+    async def _loop(self):
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            try:
+                await self.func()
+                self.runs += 1
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Periodic job '{self.name}' failed: {e}")
+            await asyncio.sleep(self.interval)
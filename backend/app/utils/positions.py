@@ -0,0 +1,43 @@
+from typing import List as ListType, Optional
+
+# Spacing between neighbours for appended items and after a rebalance
+POSITION_STEP = 1024.0
+
+
+def position_between(lower: Optional[float], upper: Optional[float], min_gap: float) -> Optional[float]:
+    """Fractional position strictly between two neighbours
+
+    None for `lower` means "first", None for `upper` means "last". Returns
+    None when the neighbours are closer than `min_gap`, meaning the siblings
+    need to be renumbered before anything can be placed between them.
+    """
+    positions = positions_between(lower, upper, 1, min_gap)
+    return positions[0] if positions else None
+
+
+def positions_between(lower: Optional[float], upper: Optional[float], count: int, min_gap: float) -> Optional[ListType[float]]:
+    """`count` increasing positions spread evenly between two neighbours
+
+    Same conventions as position_between(); used to place a run of items
+    (e.g. a multi-card move) contiguously.
+    """
+    if lower is None and upper is None:
+        return [POSITION_STEP * (i + 1) for i in range(count)]
+    if lower is None:
+        return [upper - POSITION_STEP * (count - i) for i in range(count)]
+    if upper is None:
+        return [lower + POSITION_STEP * (i + 1) for i in range(count)]
+
+    step = (upper - lower) / (count + 1)
+    if step < min_gap:
+        return None
+    positions = [lower + step * (i + 1) for i in range(count)]
+    bounds = [lower] + positions + [upper]
+    if any(a >= b for a, b in zip(bounds, bounds[1:])):
+        return None
+    return positions
+
+
+def spaced_positions(count: int) -> ListType[float]:
+    """Evenly spaced positions for `count` siblings, used when rebalancing"""
+    return [POSITION_STEP * (i + 1) for i in range(count)]
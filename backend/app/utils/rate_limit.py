@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from app.utils.logger import logger
+from app.config import settings
+from typing import Dict, List as ListType, NamedTuple, Optional, Protocol, Tuple
+import math
+import time
+
+
+class RateLimitRule(NamedTuple):
+    limit: int
+    window: float  # seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimitRule":
+        """Parse "<requests>/<seconds>", e.g. "100/60" """
+        limit, window = spec.split("/")
+        return cls(int(limit), float(window))
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int  # seconds; 0 when allowed
+
+
+def _estimate(rule: RateLimitRule, now: float, current: int, previous: int) -> Tuple[float, float]:
+    """Sliding window estimate: the previous window's count weighted by how much of it still overlaps"""
+    elapsed = now % rule.window
+    weight = 1.0 - elapsed / rule.window
+    return previous * weight + current, elapsed
+
+
+def _result(rule: RateLimitRule, allowed: bool, estimate: float, current: int, previous: int, elapsed: float) -> RateLimitResult:
+    if allowed:
+        return RateLimitResult(True, rule.limit, max(int(rule.limit - estimate), 0), 0)
+
+    if current >= rule.limit or not previous:
+        wait = rule.window - elapsed
+    else:
+        # Time until the previous window's weight drops enough to admit one more request
+        wait = (1.0 - (rule.limit - current) / previous) * rule.window - elapsed
+    return RateLimitResult(False, rule.limit, 0, max(math.ceil(wait), 1))
+
+
+class RateLimitStore(Protocol):
+    async def hit(self, key: str, rule: RateLimitRule, now: float) -> RateLimitResult:
+        ...
+
+    async def release(self, key: str, rule: RateLimitRule, now: float):
+        """Give back an allowed hit from `now`, for a request another rule rejected"""
+        ...
+
+
+class InMemoryRateLimitStore:
+    """Per-process sliding window counters.
+
+    Each key holds two counters (current and previous window), so a request is
+    O(1). Keys are kept in LRU order; idle keys (no hit for two windows, when
+    their counters no longer matter) and keys beyond max_keys are evicted from
+    the cold end as new requests arrive.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window_index, current, previous, last_seen, window]
+        self._counters: "OrderedDict[str, list]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    async def hit(self, key: str, rule: RateLimitRule, now: float) -> RateLimitResult:
+        window_index = int(now // rule.window)
+        entry = self._counters.get(key)
+        if entry is None:
+            entry = [window_index, 0, 0, now, rule.window]
+            self._counters[key] = entry
+        else:
+            self._counters.move_to_end(key)
+            if entry[0] != window_index:
+                # Roll forward; anything older than the previous window no longer counts
+                entry[2] = entry[1] if entry[0] == window_index - 1 else 0
+                entry[1] = 0
+                entry[0] = window_index
+        entry[3] = now
+
+        estimate, elapsed = _estimate(rule, now, entry[1], entry[2])
+        allowed = estimate < rule.limit
+        if allowed:
+            entry[1] += 1
+        result = _result(rule, allowed, estimate + (1 if allowed else 0), entry[1], entry[2], elapsed)
+
+        self._evict(now)
+        return result
+
+    async def release(self, key: str, rule: RateLimitRule, now: float):
+        entry = self._counters.get(key)
+        if entry is not None and entry[0] == int(now // rule.window) and entry[1] > 0:
+            entry[1] -= 1
+
+    def _evict(self, now: float):
+        while self._counters:
+            key, entry = next(iter(self._counters.items()))
+            if len(self._counters) <= self.max_keys and now - entry[3] < 2 * entry[4]:
+                break
+            del self._counters[key]
+            self.evictions += 1
+
+
+class RedisRateLimitStore:
+    """Sliding window counters shared by all workers through Redis.
+
+    The current window's counter is incremented atomically and expires after
+    two windows, so idle keys clean themselves up. A rejected request gives
+    its increment back. If Redis is unreachable requests are allowed (fail
+    open) rather than taking the API down with it.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self.errors = 0
+
+    async def hit(self, key: str, rule: RateLimitRule, now: float) -> RateLimitResult:
+        window_index = int(now // rule.window)
+        current_key = f"{self.prefix}{key}:{window_index}"
+        previous_key = f"{self.prefix}{key}:{window_index - 1}"
+
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.incr(current_key)
+                pipe.expire(current_key, math.ceil(rule.window * 2))
+                pipe.get(previous_key)
+                current, _, previous = await pipe.execute()
+            previous = int(previous or 0)
+
+            estimate, elapsed = _estimate(rule, now, current - 1, previous)
+            allowed = estimate < rule.limit
+            if not allowed:
+                current = await self.client.decr(current_key)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Rate limit store unavailable, allowing request: {e}")
+            return RateLimitResult(True, rule.limit, rule.limit, 0)
+
+        return _result(rule, allowed, estimate + (1 if allowed else 0), current, previous, elapsed)
+
+    async def release(self, key: str, rule: RateLimitRule, now: float):
+        try:
+            await self.client.decr(f"{self.prefix}{key}:{int(now // rule.window)}")
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Rate limit store unavailable, could not release hit: {e}")
+
+
+class RateLimiter:
+    """Applies a global per-client rule plus optional per-route rules.
+
+    Clients are identified by user id when the request carries a valid token
+    (user_rule) and by IP address otherwise (default_rule). Route rules are
+    keyed by "METHOD /path/prefix" or "/path/prefix"; the longest matching
+    prefix applies, counted separately per client. A request counts against
+    its rules only if all of them allow it: when one rejects, the hits
+    already taken on the others are given back.
+    """
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        default_rule: RateLimitRule,
+        user_rule: Optional[RateLimitRule] = None,
+        route_rules: Optional[Dict[str, RateLimitRule]] = None
+    ):
+        self.store = store
+        self.default_rule = default_rule
+        self.user_rule = user_rule or default_rule
+        self._route_rules: ListType[Tuple[Optional[str], str, RateLimitRule]] = []
+        for spec, rule in (route_rules or {}).items():
+            method, _, path = spec.rpartition(" ")
+            self._route_rules.append((method.upper() or None, path, rule))
+        self._route_rules.sort(key=lambda r: len(r[1]), reverse=True)
+
+        # Metrics
+        self.allowed = 0
+        self.rejected = 0
+
+    def route_rule(self, method: str, path: str) -> Optional[Tuple[str, RateLimitRule]]:
+        for rule_method, prefix, rule in self._route_rules:
+            if path.startswith(prefix) and (rule_method is None or rule_method == method):
+                return f"{rule_method or '*'} {prefix}", rule
+        return None
+
+    async def check(self, method: str, path: str, client_ip: str, user_id: Optional[str] = None) -> RateLimitResult:
+        now = time.time()
+        identity = f"user:{user_id}" if user_id else f"ip:{client_ip}"
+
+        rules = [(identity, self.user_rule if user_id else self.default_rule)]
+        route = self.route_rule(method, path)
+        if route is not None:
+            route_key, rule = route
+            rules.append((f"route:{route_key}:{identity}", rule))
+
+        taken = []
+        results = []
+        for key, rule in rules:
+            result = await self.store.hit(key, rule, now)
+            if not result.allowed:
+                for taken_key, taken_rule in taken:
+                    await self.store.release(taken_key, taken_rule, now)
+                self.rejected += 1
+                return result
+            taken.append((key, rule))
+            results.append(result)
+
+        self.allowed += 1
+        # Report the rule closest to its limit
+        return min(results, key=lambda r: r.remaining)
+
+    def stats(self) -> Dict:
+        return {
+            "backend": type(self.store).__name__,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "tracked_keys": len(self.store) if isinstance(self.store, InMemoryRateLimitStore) else None
+        }
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the application's rate limiter from settings"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        import redis.asyncio as redis
+        store = RedisRateLimitStore(redis.from_url(settings.REDIS_URL))
+    else:
+        store = InMemoryRateLimitStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+    return RateLimiter(
+        store,
+        default_rule=RateLimitRule.parse(settings.RATE_LIMIT_DEFAULT),
+        user_rule=RateLimitRule.parse(settings.RATE_LIMIT_PER_USER),
+        route_rules={route: RateLimitRule.parse(spec) for route, spec in settings.RATE_LIMIT_ROUTES.items()}
+    )
@@ -0,0 +1,99 @@
+"""
+Benchmark: rendering a large board snapshot (default 5,000 cards in 10
+lists) the old way, ORM objects -> BoardWithListsResponse.model_validate ->
+model_dump_json, versus the row path used by TaskService.get_board_payload,
+plain row dicts -> orjson.dumps.
+
+Both paths start from data already in memory (ORM instances for the old
+path, row mappings for the new one), so the numbers cover object
+materialization and serialization, not database time. Peak memory is
+measured with tracemalloc.
+
+Run from the backend directory:
+    python -m benchmarks.bench_board_payload --cards 5000 --lists 10 --repeat 5
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+import orjson
+from app.api.tasks import BoardWithListsResponse
+from app.models import Board, List, Card
+
+
+def make_rows(cards: int, lists: int):
+    now = datetime.utcnow()
+    board = {"id": uuid.uuid4(), "name": "Big board", "description": "Benchmark", "created_at": now, "updated_at": now}
+    list_rows = [
+        {"id": uuid.uuid4(), "board_id": board["id"], "name": f"List {i}", "position": 1024.0 * (i + 1), "created_at": now}
+        for i in range(lists)
+    ]
+    card_rows = [
+        {
+            "id": uuid.uuid4(),
+            "list_id": list_rows[i % lists]["id"],
+            "title": f"Card {i}",
+            "description": "Something that needs doing" if i % 3 else None,
+            "position": 1024.0 * (i // lists + 1),
+            "completed": i % 5 == 0,
+            "created_at": now,
+            "updated_at": now
+        }
+        for i in range(cards)
+    ]
+    return board, list_rows, card_rows
+
+
+def orm_path(board_row, list_rows, card_rows) -> bytes:
+    """What selectinload + model_validate did: build instances, then validate and dump"""
+    board = Board(**board_row)
+    lists = {row["id"]: List(**row) for row in list_rows}
+    for row in card_rows:
+        lists[row["list_id"]].cards.append(Card(**row))
+    board.lists = list(lists.values())
+    return BoardWithListsResponse.model_validate(board).model_dump_json().encode()
+
+
+def row_path(board_row, list_rows, card_rows) -> bytes:
+    """What get_board_payload + orjson do"""
+    lists = [{**row, "cards": []} for row in list_rows]
+    cards_by_list = {lst["id"]: lst["cards"] for lst in lists}
+    for row in card_rows:
+        cards_by_list[row["list_id"]].append(dict(row))
+    return orjson.dumps({**board_row, "lists": lists})
+
+
+def measure(label: str, func, rows, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(*rows)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<24} {min(timings) * 1000:>8.1f} ms  peak {peak / 2**20:>6.1f} MiB  body {len(body) / 1024:>7.0f} KiB")
+    return body
+
+
+def main(cards: int, lists: int, repeat: int):
+    rows = make_rows(cards, lists)
+    print(f"Board with {cards:,} cards in {lists} lists (best of {repeat})")
+    before = measure("ORM + model_dump_json", orm_path, rows, repeat)
+    after = measure("rows + orjson", row_path, rows, repeat)
+    assert orjson.loads(before) == orjson.loads(after)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=5000)
+    parser.add_argument("--lists", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    main(args.cards, args.lists, args.repeat)
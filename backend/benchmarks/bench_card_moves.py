@@ -0,0 +1,96 @@
+"""
+Benchmark: rows written by random card moves within one large list, with
+dense integer positions (every card between the old and new slot is
+renumbered) versus fractional positions (only the moved card is written,
+plus an occasional renumber of the whole list when a gap is exhausted).
+
+The list is simulated in memory with the same position_between() and
+POSITION_MIN_GAP the service uses, so the numbers are rows, not SQL timings.
+The "hotspot" pattern keeps inserting right after the first card, which is
+the worst case for fractional positions.
+
+Run from the backend directory:
+    python -m benchmarks.bench_card_moves --cards 10000 --moves 10000
+"""
+import argparse
+import logging
+import random
+import time
+from bisect import bisect_left
+from app.config import settings
+from app.utils.positions import position_between, spaced_positions
+
+
+def pick_move(rng: random.Random, size: int, pattern: str):
+    """Index of the card to move and the index it lands at once removed"""
+    source = rng.randrange(size)
+    target = 1 if pattern == "hotspot" else rng.randrange(size)
+    return source, min(target, size - 1)
+
+
+def dense_moves(cards: int, moves: int, pattern: str, seed: int):
+    rng = random.Random(seed)
+    order = list(range(cards))  # position == index
+    rows = []
+    for _ in range(moves):
+        source, target = pick_move(rng, cards, pattern)
+        order.insert(target, order.pop(source))
+        rows.append(abs(source - target) + 1)
+    return rows, 0
+
+
+def fractional_moves(cards: int, moves: int, pattern: str, seed: int):
+    rng = random.Random(seed)
+    positions = spaced_positions(cards)  # kept sorted
+    rows = []
+    renumbers = 0
+    for _ in range(moves):
+        source, target = pick_move(rng, cards, pattern)
+        positions.pop(source)
+        lower = positions[target - 1] if target > 0 else None
+        upper = positions[target] if target < len(positions) else None
+        written = 1
+
+        position = position_between(lower, upper, settings.POSITION_MIN_GAP)
+        if position is None:
+            positions = spaced_positions(len(positions))
+            lower = positions[target - 1] if target > 0 else None
+            upper = positions[target] if target < len(positions) else None
+            position = position_between(lower, upper, settings.POSITION_MIN_GAP)
+            written += len(positions)
+            renumbers += 1
+
+        positions.insert(bisect_left(positions, position), position)
+        rows.append(written)
+    return rows, renumbers
+
+
+def report(label: str, func, cards: int, moves: int, pattern: str, seed: int):
+    start = time.perf_counter()
+    rows, renumbers = func(cards, moves, pattern, seed)
+    elapsed = time.perf_counter() - start
+
+    rows.sort()
+    print(
+        f"{label:<12} {sum(rows):>12,} rows  {sum(rows) / moves:>8.1f}/move  "
+        f"p50 {rows[len(rows) // 2]:>6}  max {rows[-1]:>6}  "
+        f"renumbers {renumbers:>4}  ({elapsed * 1000:.0f} ms simulated)"
+    )
+
+
+def main(cards: int, moves: int, seed: int):
+    for pattern in ("random", "hotspot"):
+        print(f"{moves:,} {pattern} moves in a list of {cards:,} cards")
+        report("dense", dense_moves, cards, moves, pattern, seed)
+        report("fractional", fractional_moves, cards, moves, pattern, seed)
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=10000)
+    parser.add_argument("--moves", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    main(args.cards, args.moves, args.seed)
@@ -0,0 +1,73 @@
+"""
+Benchmark: health checks per second with a new AsyncClient per check versus
+the shared HealthCheckClient pool, against a local keep-alive stub server.
+
+Run from the backend directory:
+    python -m benchmarks.bench_health_checks --checks 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import time
+import httpx
+from app.services.http_client import HealthCheckClient
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok"
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            if not request:
+                break
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run(label: str, checks: int, concurrency: int, check):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await check()
+            assert response.status_code == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(checks)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {checks / elapsed:>10.1f} checks/sec  ({elapsed:.2f}s)")
+
+
+async def main(checks: int, concurrency: int):
+    server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://localhost:{port}/health"
+
+    async def per_check_client():
+        async with httpx.AsyncClient(timeout=10) as client:
+            return await client.get(url)
+
+    pool = HealthCheckClient(max_connections_per_host=concurrency)
+
+    async def shared_client():
+        return await pool.get(url, timeout=10)
+
+    async with server:
+        await run("new AsyncClient per check", checks, concurrency, per_check_client)
+        await run("shared HealthCheckClient", checks, concurrency, shared_client)
+        await pool.aclose()
+    print(f"DNS cache: {pool.dns.hits} hits, {pool.dns.misses} misses")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.checks, args.concurrency))
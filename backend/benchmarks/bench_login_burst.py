@@ -0,0 +1,91 @@
+"""
+Load test: latency of a cheap endpoint while a burst of logins is verifying
+bcrypt passwords, with bcrypt called inline on the event loop versus on the
+password hashing pool (verify_password_async).
+
+Run from the backend directory:
+    python -m benchmarks.bench_login_burst --logins 40 --rounds 12
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import httpx
+from fastapi import FastAPI, HTTPException
+from app.utils.auth import pwd_context, verify_password, verify_password_async
+
+
+def build_app(hashed: str, offload: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login(credentials: dict):
+        if offload:
+            valid = await verify_password_async(credentials["password"], hashed)
+        else:
+            valid = verify_password(credentials["password"], hashed)
+        if not valid:
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def run(label: str, app: FastAPI, logins: int, login_concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(login_concurrency)
+
+        async def one_login():
+            async with semaphore:
+                response = await client.post("/login", json={"password": "correct horse"})
+                assert response.status_code == 200
+
+        async def ping_until(done: asyncio.Event, interval: float = 0.01):
+            # Latency is measured from when each ping was due, so time spent
+            # unable to even send it (a blocked loop) is counted too
+            due = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+                await client.get("/ping")
+                latencies.append(time.perf_counter() - due)
+                due += interval
+
+        done = asyncio.Event()
+        pinger = asyncio.create_task(ping_until(done))
+        start = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await pinger
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{label:<22} logins {logins / elapsed:>6.1f}/s   /ping p50 {p50:>7.1f} ms  "
+        f"p99 {p99:>7.1f} ms  max {latencies[-1] * 1000:>7.1f} ms  ({len(latencies)} pings)"
+    )
+
+
+async def main(logins: int, login_concurrency: int, rounds: int):
+    hashed = pwd_context.handler("bcrypt").using(rounds=rounds).hash("correct horse")
+    await run("bcrypt on event loop", build_app(hashed, offload=False), logins, login_concurrency)
+    await run("bcrypt on hash pool", build_app(hashed, offload=True), logins, login_concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent logins")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt work factor")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.logins, args.concurrency, args.rounds))
@@ -0,0 +1,155 @@
+"""
+Benchmark: requests per second through the audit and rate limit middleware
+stack, comparing the previous BaseHTTPMiddleware implementations with the
+plain ASGI ones. Requests are driven in-process through httpx's ASGI
+transport, so the numbers isolate framework and middleware overhead.
+
+Run from the backend directory:
+    python -m benchmarks.bench_middleware --requests 5000 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+import httpx
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.services.audit_queue import AuditLogQueue
+from app.utils.middleware import AuditMiddleware, RateLimitMiddleware
+
+
+class NullSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params=None):
+        pass
+
+    async def commit(self):
+        pass
+
+
+class LegacyAuditMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware version, kept here for comparison"""
+
+    def __init__(self, app, queue: AuditLogQueue):
+        super().__init__(app)
+        self.queue = queue
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        method = request.method
+        endpoint = str(request.url.path)
+
+        request_body = None
+        if method in ["POST", "PUT", "PATCH"]:
+            body = await request.body()
+            if body:
+                request_body = json.loads(body.decode())
+
+            async def receive():
+                return {"type": "http.request", "body": body}
+            request._receive = receive
+
+        response = await call_next(request)
+        process_time = time.time() - start_time
+
+        parts = endpoint.split("/")
+        resource_type = parts[2] if len(parts) > 2 else "unknown"
+        await self.queue.enqueue(
+            action=f"{method.lower()}_{resource_type}",
+            resource_type=resource_type,
+            method=method,
+            endpoint=endpoint,
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            request_body=request_body,
+            response_status=response.status_code
+        )
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware version, kept here for comparison"""
+
+    def __init__(self, app, max_requests: int = 100, window: int = 60):
+        super().__init__(app)
+        self.max_requests = max_requests
+        self.window = window
+        self.requests = {}
+
+    async def dispatch(self, request: Request, call_next):
+        client_ip = request.client.host if request.client else "unknown"
+        current_time = time.time()
+        self.requests = {
+            ip: [t for t in times if current_time - t < self.window]
+            for ip, times in self.requests.items()
+        }
+        if len(self.requests.get(client_ip, [])) >= self.max_requests:
+            return Response(content="Rate limit exceeded", status_code=429)
+        self.requests.setdefault(client_ip, []).append(current_time)
+        return await call_next(request)
+
+
+def build_app(audit_cls, rate_limit_cls, queue: AuditLogQueue) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/items")
+    async def list_items():
+        return [{"id": i, "name": f"item {i}"} for i in range(10)]
+
+    @app.post("/api/items")
+    async def create_item(item: dict):
+        return item
+
+    app.add_middleware(audit_cls, queue=queue)
+    # High limit: measure the bookkeeping, not the rejections
+    app.add_middleware(rate_limit_cls, max_requests=10 ** 9, window=60)
+    return app
+
+
+async def run(label: str, app: FastAPI, queue: AuditLogQueue, requests: int, concurrency: int):
+    await queue.start()
+    semaphore = asyncio.Semaphore(concurrency)
+    payload = {"name": "benchmark", "tags": ["a", "b", "c"], "description": "x" * 512}
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 12345))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                if i % 2:
+                    response = await client.post("/api/items", json=payload)
+                else:
+                    response = await client.get("/api/items")
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    await queue.stop()
+    print(f"{label:<28} {requests / elapsed:>10.1f} req/sec  ({elapsed:.2f}s, {queue.written} audit rows)")
+
+
+async def main(requests: int, concurrency: int):
+    def make_queue():
+        return AuditLogQueue(session_factory=NullSession, max_size=requests, batch_size=500)
+
+    queue = make_queue()
+    await run("BaseHTTPMiddleware", build_app(LegacyAuditMiddleware, LegacyRateLimitMiddleware, queue), queue, requests, concurrency)
+    queue = make_queue()
+    await run("pure ASGI middleware", build_app(AuditMiddleware, RateLimitMiddleware, queue), queue, requests, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,50 @@
+"""
+Benchmark: per-request authentication overhead of get_current_user with and
+without the verified-token cache, for a dashboard session that reuses the
+same bearer token.
+
+Run from the backend directory:
+    python -m benchmarks.bench_token_cache --requests 20000 --sessions 50
+"""
+import argparse
+import asyncio
+import logging
+import time
+from fastapi.security import HTTPAuthorizationCredentials
+from app.config import settings
+from app.utils.auth import create_access_token, get_current_user, token_cache
+
+
+async def run(label: str, tokens, requests: int):
+    credentials = [HTTPAuthorizationCredentials(scheme="Bearer", credentials=t) for t in tokens]
+    token_cache.clear()
+    token_cache.hits = token_cache.misses = 0
+
+    start = time.perf_counter()
+    for i in range(requests):
+        await get_current_user(credentials[i % len(credentials)])
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<16} {elapsed / requests * 1e6:>8.1f} us/request  "
+        f"({token_cache.hits} hits, {token_cache.misses} misses)"
+    )
+
+
+async def main(requests: int, sessions: int):
+    tokens = [create_access_token({"sub": f"user-{i}", "email": f"user{i}@example.com"}) for i in range(sessions)]
+
+    ttl = settings.TOKEN_CACHE_TTL
+    settings.TOKEN_CACHE_TTL = 0
+    await run("without cache", tokens, requests)
+    settings.TOKEN_CACHE_TTL = ttl
+    await run("with cache", tokens, requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.requests, args.sessions))
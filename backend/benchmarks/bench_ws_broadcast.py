@@ -0,0 +1,125 @@
+"""
+Benchmark: WebSocket broadcast latency with many connected clients
+(default 10,000), a few of which have stopped reading. Compares the old
+ConnectionManager.broadcast, which awaited send_text on each socket in
+turn, with Broadcaster, which queues one serialized frame per client and
+lets each connection's writer task send it.
+
+Clients are in-process fakes: a fast client's send takes one event loop
+hop, a slow client's send sleeps for --slow-delay seconds. Latency is
+measured from publish to the moment each fast client's send completes.
+
+Run from the backend directory:
+    python -m benchmarks.bench_ws_broadcast --clients 10000 --slow 10 --messages 20
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from app.services.broadcaster import Broadcaster
+
+
+class FakeClient:
+    def __init__(self, delay: float, latencies: list):
+        self.delay = delay
+        self.latencies = latencies
+        self.published_at = 0.0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        await asyncio.sleep(self.delay)
+        if not self.delay:
+            self.latencies.append(time.perf_counter() - self.published_at)
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+class SequentialManager:
+    """The old ConnectionManager.broadcast loop"""
+
+    def __init__(self, clients):
+        self.active_connections = clients
+
+    async def broadcast(self, message: dict):
+        message_str = json.dumps(message)
+        for connection in self.active_connections:
+            try:
+                await connection.send_text(message_str)
+            except Exception:
+                pass
+
+
+def make_clients(count: int, slow: int, slow_delay: float, latencies: list):
+    # Spread the slow clients through the list, as they would be in practice
+    stride = count // slow if slow else count + 1
+    return [FakeClient(slow_delay if slow and i % stride == 0 else 0, latencies) for i in range(count)]
+
+
+def report(label: str, latencies: list, elapsed: float):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{label:<22} p50 {p50 * 1000:>9.1f} ms  p99 {p99 * 1000:>9.1f} ms  "
+        f"max {latencies[-1] * 1000:>9.1f} ms  total {elapsed:>6.2f} s"
+    )
+
+
+async def run_sequential(args):
+    latencies = []
+    clients = make_clients(args.clients, args.slow, args.slow_delay, latencies)
+    manager = SequentialManager(clients)
+
+    start = time.perf_counter()
+    for i in range(args.messages):
+        now = time.perf_counter()
+        for client in clients:
+            client.published_at = now
+        await manager.broadcast({"type": "check", "data": {"n": i}})
+    report("sequential awaits", latencies, time.perf_counter() - start)
+
+
+async def run_broadcaster(args):
+    latencies = []
+    clients = make_clients(args.clients, args.slow, args.slow_delay, latencies)
+    broadcaster = Broadcaster(queue_size=args.messages + 1, slow_consumer_policy="disconnect", send_timeout=60)
+    for client in clients:
+        await broadcaster.connect(client)
+
+    start = time.perf_counter()
+    fast = args.clients - args.slow
+    for i in range(args.messages):
+        now = time.perf_counter()
+        for client in clients:
+            client.published_at = now
+        broadcaster.publish({"type": "check", "data": {"n": i}})
+        # Wait for the fast clients to receive this message before the next one
+        while len(latencies) < fast * (i + 1):
+            await asyncio.sleep(0)
+    report("per-client queues", latencies, time.perf_counter() - start)
+    await broadcaster.close_all()
+
+
+async def main(args):
+    print(
+        f"{args.clients:,} clients, {args.slow} slow ({args.slow_delay * 1000:.0f} ms per send), "
+        f"{args.messages} messages"
+    )
+    await run_sequential(args)
+    await run_broadcaster(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--slow", type=int, default=10)
+    parser.add_argument("--slow-delay", type=float, default=0.05)
+    parser.add_argument("--messages", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args))
@@ -0,0 +1,17 @@
+-- Fractional list and card positions (PostgreSQL).
+--
+-- Tables are created on startup with create_all, which doesn't change
+-- existing tables. Run this once against a database created before
+-- positions became floats. Existing integer positions keep their order;
+-- siblings sharing a position are spread out the first time something
+-- is placed next to them.
+
+BEGIN;
+
+ALTER TABLE lists ALTER COLUMN position TYPE DOUBLE PRECISION;
+ALTER TABLE cards ALTER COLUMN position TYPE DOUBLE PRECISION;
+
+CREATE INDEX IF NOT EXISTS ix_lists_board_id_position ON lists (board_id, position);
+CREATE INDEX IF NOT EXISTS ix_cards_list_id_position ON cards (list_id, position);
+
+COMMIT;
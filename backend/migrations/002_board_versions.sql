@@ -0,0 +1,28 @@
+-- Board versions and incremental sync (PostgreSQL).
+--
+-- Adds the version columns and indexes that create_all won't add to
+-- existing tables, and the tombstone table with its indexes. Existing rows
+-- start at version 0, so clients' first sync returns everything once.
+
+BEGIN;
+
+ALTER TABLE boards ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE boards ADD COLUMN IF NOT EXISTS sync_horizon INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE lists ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE cards ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_lists_board_id_version ON lists (board_id, version);
+CREATE INDEX IF NOT EXISTS ix_cards_list_id_version ON cards (list_id, version);
+
+CREATE TABLE IF NOT EXISTS board_tombstones (
+    id UUID PRIMARY KEY,
+    board_id UUID NOT NULL REFERENCES boards (id),
+    entity_type VARCHAR(50) NOT NULL,
+    entity_id UUID NOT NULL,
+    version INTEGER NOT NULL,
+    created_at TIMESTAMP WITHOUT TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS ix_board_tombstones_board_id_version ON board_tombstones (board_id, version);
+CREATE INDEX IF NOT EXISTS ix_board_tombstones_created_at ON board_tombstones (created_at);
+
+COMMIT;
@@ -0,0 +1,116 @@
+"""
+Unit tests for board activity pagination and retention
+"""
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.task_service import TaskService
+from app.services.activity_retention import ActivityRetentionService
+from app.models import Board, BoardTombstone, Activity, ActivityArchive
+from app.config import settings
+from datetime import datetime, timedelta
+import uuid
+
+
+async def add_activity(db_session: AsyncSession, board_id, timestamps):
+    activities = [
+        Activity(
+            board_id=board_id,
+            action="update",
+            entity_type="card",
+            entity_id=uuid.uuid4(),
+            details=f"Activity {i}",
+            timestamp=timestamp
+        )
+        for i, timestamp in enumerate(timestamps)
+    ]
+    db_session.add_all(activities)
+    await db_session.commit()
+    return activities
+
+
+async def count(db_session: AsyncSession, model) -> int:
+    return await db_session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+class TestBoardActivityPages:
+    """Tests for keyset pagination of board activity"""
+
+    async def test_pages_cover_history_newest_first(self, db_session: AsyncSession, sample_board: Board):
+        """Test that following cursors returns every entry once, newest first, including equal timestamps"""
+        now = datetime.utcnow()
+        await add_activity(db_session, sample_board.id, [now - timedelta(minutes=i // 2) for i in range(7)])
+        expected = await TaskService.get_board_activity(db_session, sample_board.id, limit=100)
+
+        seen, cursor = [], None
+        while True:
+            page = await TaskService.get_board_activity_page(db_session, sample_board.id, cursor=cursor, limit=3)
+            seen.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert [a.id for a in seen] == [a.id for a in expected]
+        assert len(seen) == len({a.id for a in seen})
+        assert all(a.timestamp >= b.timestamp for a, b in zip(seen, seen[1:]))
+
+    async def test_other_boards_excluded(self, db_session: AsyncSession, sample_board: Board):
+        """Test that activity from other boards is not returned"""
+        other = await TaskService.create_board(db_session, "Other")
+        await add_activity(db_session, sample_board.id, [datetime.utcnow()])
+
+        page = await TaskService.get_board_activity_page(db_session, other.id)
+
+        assert all(a.board_id == other.id for a in page.items)
+
+
+@pytest.mark.asyncio
+class TestActivityRetention:
+    """Tests for archiving and purging old activity"""
+
+    async def test_archive_moves_only_old_rows(self, db_session: AsyncSession, sample_board: Board):
+        """Test that rows older than the cutoff move to the archive in batches"""
+        now = datetime.utcnow()
+        old = await add_activity(db_session, sample_board.id, [now - timedelta(days=100 + i) for i in range(5)])
+        await add_activity(db_session, sample_board.id, [now - timedelta(days=1)])
+        live_before = await count(db_session, Activity)
+
+        moved = await ActivityRetentionService.archive(db_session, now - timedelta(days=90), batch_size=2)
+
+        assert moved == 5
+        assert await count(db_session, Activity) == live_before - 5
+        result = await db_session.execute(select(ActivityArchive.id))
+        assert set(result.scalars().all()) == {a.id for a in old}
+
+    async def test_run_retention_purges_archive(self, db_session: AsyncSession, sample_board: Board, monkeypatch):
+        """Test the periodic job archives past the retention window and purges the archive past its own"""
+        monkeypatch.setattr(settings, "ACTIVITY_RETENTION_DAYS", 30)
+        monkeypatch.setattr(settings, "ACTIVITY_ARCHIVE_RETENTION_DAYS", 365)
+        now = datetime.utcnow()
+        await add_activity(db_session, sample_board.id, [now - timedelta(days=400), now - timedelta(days=40)])
+
+        stats = await ActivityRetentionService.run_retention(db_session, now)
+
+        assert stats == {"archived": 2, "purged": 1, "tombstones_pruned": 0}
+        assert await count(db_session, ActivityArchive) == 1
+
+    async def test_prune_tombstones_raises_sync_horizon(self, db_session: AsyncSession, sample_board: Board):
+        """Test that old tombstones are deleted and the board's sync horizon moves past them"""
+        now = datetime.utcnow()
+        db_session.add_all([
+            BoardTombstone(board_id=sample_board.id, entity_type="card", entity_id=uuid.uuid4(), version=3, created_at=now - timedelta(days=60)),
+            BoardTombstone(board_id=sample_board.id, entity_type="card", entity_id=uuid.uuid4(), version=5, created_at=now - timedelta(days=45)),
+            BoardTombstone(board_id=sample_board.id, entity_type="card", entity_id=uuid.uuid4(), version=8, created_at=now)
+        ])
+        await db_session.commit()
+
+        pruned = await ActivityRetentionService.prune_tombstones(db_session, now - timedelta(days=30), batch_size=1)
+
+        assert pruned == 2
+        result = await db_session.execute(select(BoardTombstone.version))
+        assert result.scalars().all() == [8]
+        await db_session.refresh(sample_board)
+        assert sample_board.sync_horizon == 5
+        assert (await TaskService.get_board_changes(db_session, sample_board.id, 4))["snapshot_required"]
+        assert "snapshot_required" not in await TaskService.get_board_changes(db_session, sample_board.id, 5)
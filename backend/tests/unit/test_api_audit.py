@@ -0,0 +1,82 @@
+"""
+Unit tests for Audit log API endpoints
+"""
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from app.main import app
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.audit_service import AuditLog
+import json
+import uuid
+
+
+@pytest.mark.asyncio
+class TestAuditLogAPI:
+    """Tests for listing and exporting audit logs"""
+
+    async def test_logs_are_scoped_to_current_user(self, db_session: AsyncSession):
+        """Test that list and export only return the caller's own audit logs"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        me, other = uuid.uuid4(), uuid.uuid4()
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": str(me)}
+        db_session.add_all([
+            AuditLog(user_id=me, action="get_boards", resource_type="boards", ip_address="10.0.0.1"),
+            AuditLog(user_id=other, action="get_boards", resource_type="boards", ip_address="10.0.0.2"),
+            AuditLog(user_id=None, action="get_status-page", resource_type="status-page", ip_address="10.0.0.3")
+        ])
+        await db_session.commit()
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            listed = await client.get("/api/audit-logs", params={"user_id": str(other)})
+            exported = await client.get("/api/audit-logs/export")
+
+        assert listed.status_code == status.HTTP_200_OK
+        assert [log["user_id"] for log in listed.json()] == [str(me)]
+        rows = [json.loads(line) for line in exported.text.splitlines()]
+        assert [row["user_id"] for row in rows] == [str(me)]
+
+        app.dependency_overrides.clear()
+
+    async def test_user_without_id_is_rejected(self, db_session: AsyncSession):
+        """Test that a caller whose id is not a user UUID gets no audit logs"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": None}
+        db_session.add(AuditLog(user_id=uuid.uuid4(), action="get_boards", resource_type="boards"))
+        await db_session.commit()
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            listed = await client.get("/api/audit-logs")
+            exported = await client.get("/api/audit-logs/export")
+
+        assert listed.status_code == status.HTTP_403_FORBIDDEN
+        assert exported.status_code == status.HTTP_403_FORBIDDEN
+
+        app.dependency_overrides.clear()
+
+    async def test_auth_metrics_report_token_cache(self):
+        """Test that the token cache hit and miss counters are exposed"""
+        from app.utils.auth import get_current_active_user, token_cache, create_access_token, verify_token
+
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": str(uuid.uuid4())}
+        token_cache.clear()
+        hits, misses = token_cache.hits, token_cache.misses
+        token = create_access_token({"sub": "user-1"})
+        verify_token(token)
+        verify_token(token)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/metrics/auth")
+
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()["token_cache"]
+        assert (stats["hits"] - hits, stats["misses"] - misses, stats["size"]) == (1, 1, 1)
+
+        token_cache.clear()
+        app.dependency_overrides.clear()
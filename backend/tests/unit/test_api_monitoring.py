@@ -0,0 +1,201 @@
+"""
+Unit tests for Monitoring API endpoints
+"""
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import event
+from app.main import app
+from app.api.monitoring import monitor_service
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Monitor, Check, MonitorStatus
+import json
+
+
+@pytest.mark.asyncio
+class TestStatusPageAPI:
+    """Tests for the public status page endpoint"""
+
+    async def test_status_page_query_count_is_constant(self, db_session: AsyncSession, test_engine):
+        """Test that the status page cost does not grow with the number of monitors"""
+        from app.utils.database import get_db
+
+        app.dependency_overrides[get_db] = lambda: db_session
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        query_counts = []
+        created = 0
+        for monitor_count in (2, 6):
+            while created < monitor_count:
+                monitor = Monitor(name=f"Service {created}", url="https://example.com")
+                db_session.add(monitor)
+                await db_session.flush()
+                db_session.add(Check(monitor_id=monitor.id, status=MonitorStatus.UP, response_time=12.0))
+                created += 1
+            await db_session.commit()
+
+            monitor_service.status_page_cache.clear()
+            statements.clear()
+            event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+            async with AsyncClient(app=app, base_url="http://test") as client:
+                response = await client.get("/api/status-page")
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()["monitors"]) == monitor_count
+            assert all(m["uptime_24h"] == 100.0 for m in response.json()["monitors"])
+            query_counts.append(len(statements))
+
+        assert query_counts[0] == query_counts[1]
+
+        app.dependency_overrides.clear()
+
+    async def test_status_page_is_served_from_snapshot(self, db_session: AsyncSession, test_engine):
+        """Test that repeated requests do not query the database"""
+        from app.utils.database import get_db
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        db_session.add(Monitor(name="API", url="https://example.com"))
+        await db_session.commit()
+        monitor_service.status_page_cache.clear()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.get("/api/status-page")
+            event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+            second = await client.get("/api/status-page")
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert "max-age" in second.headers["cache-control"]
+        assert statements == []
+
+        app.dependency_overrides.clear()
+
+    async def test_status_page_not_modified(self, db_session: AsyncSession):
+        """Test that a matching If-None-Match returns 304 without a body"""
+        from app.utils.database import get_db
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        monitor_service.status_page_cache.clear()
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.get("/api/status-page")
+            response = await client.get("/api/status-page", headers={"If-None-Match": first.headers["etag"]})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == first.headers["etag"]
+
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+class TestDashboardAPI:
+    """Tests for the dashboard metrics endpoint"""
+
+    async def test_dashboard_is_cached_per_user(self, db_session: AsyncSession, test_engine):
+        """Test that a user's repeated request is answered from cache while other users are not"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        user = {"id": "user-a"}
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: user
+        monitor_service.dashboard_cache.clear()
+        db_session.add(Monitor(name="API", url="https://example.com", status=MonitorStatus.UP))
+        await db_session.commit()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.get("/api/metrics/dashboard")
+            event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+            second = await client.get("/api/metrics/dashboard")
+            cached_queries = len(statements)
+            user["id"] = "user-b"
+            await client.get("/api/metrics/dashboard")
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json()["monitors_up"] == 1
+        assert second.json() == first.json()
+        assert cached_queries == 0
+        assert len(statements) > 0
+
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+class TestMonitorListAPI:
+    """Tests for cursor pagination and NDJSON export of monitors"""
+
+    async def test_cursor_pagination(self, db_session: AsyncSession):
+        """Test that X-Next-Cursor walks through every monitor"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": "user-a"}
+        db_session.add_all([Monitor(name=f"API {i}", url="https://example.com") for i in range(5)])
+        await db_session.commit()
+
+        names = []
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.get("/api/monitors", params={"limit": 3})
+            names += [m["name"] for m in first.json()]
+            second = await client.get("/api/monitors", params={"limit": 3, "cursor": first.headers["x-next-cursor"]})
+            names += [m["name"] for m in second.json()]
+
+        assert sorted(names) == [f"API {i}" for i in range(5)]
+        assert "x-next-cursor" not in second.headers
+
+        app.dependency_overrides.clear()
+
+    async def test_invalid_cursor(self, db_session: AsyncSession):
+        """Test that a malformed cursor is rejected"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": "user-a"}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/monitors", params={"cursor": "garbage"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        app.dependency_overrides.clear()
+
+    async def test_ndjson_export(self, db_session: AsyncSession):
+        """Test that the export streams one JSON document per monitor"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": "user-a"}
+        db_session.add_all([Monitor(name=f"API {i}", url="https://example.com") for i in range(3)])
+        await db_session.commit()
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/monitors/export")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["name"] for row in rows] == ["API 0", "API 1", "API 2"]
+
+        app.dependency_overrides.clear()
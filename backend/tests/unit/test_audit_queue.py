@@ -0,0 +1,173 @@
+"""
+Unit tests for the background audit log writer (no database required)
+"""
+import pytest
+import asyncio
+from app.services.audit_queue import AuditLogQueue
+
+
+class RecordingSession:
+    """Fake session that records inserted audit rows"""
+
+    def __init__(self, batches, fail: bool = False, delay: float = 0.0, error=RuntimeError("database unavailable")):
+        self.batches = batches
+        self.fail = fail
+        self.delay = delay
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params=None):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise self.error
+        if any(row["action"] == "poison" for row in params):
+            raise ValueError("value too long for column")
+        self.batches.append(list(params))
+
+    async def commit(self):
+        pass
+
+
+def make_queue(batches, **kwargs):
+    session = kwargs.pop("session", None)
+    return AuditLogQueue(session_factory=session or (lambda: RecordingSession(batches)), **kwargs)
+
+
+@pytest.mark.asyncio
+class TestAuditLogQueue:
+    """Tests for AuditLogQueue batching, overflow and shutdown"""
+
+    async def test_events_written_in_batches(self):
+        """Test that queued events are inserted in batches of batch_size"""
+        batches = []
+        queue = make_queue(batches, batch_size=4, flush_interval=60)
+
+        for i in range(10):
+            assert await queue.enqueue(action="get_boards", resource_type="boards", response_status=200)
+        written = await queue.flush()
+
+        assert written == 10
+        assert [len(b) for b in batches] == [4, 4, 2]
+        assert all(set(row) >= {"id", "timestamp", "action", "request_body"} for row in batches[0])
+        assert queue.stats()["written"] == 10
+
+    async def test_batch_size_wakes_writer(self):
+        """Test that a full batch is written without waiting for flush_interval"""
+        batches = []
+        queue = make_queue(batches, batch_size=5, flush_interval=60)
+        await queue.start()
+        try:
+            for _ in range(5):
+                await queue.enqueue(action="post_cards", resource_type="cards")
+            await asyncio.sleep(0.05)
+        finally:
+            await queue.stop()
+
+        assert [len(b) for b in batches] == [5]
+
+    async def test_drop_policy(self):
+        """Test that events beyond max_size are dropped immediately"""
+        queue = make_queue([], max_size=3, batch_size=3, overflow_policy="drop")
+
+        results = [await queue.enqueue(action="get_boards", resource_type="boards") for _ in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert queue.stats()["dropped"] == 2
+        assert queue.depth == 3
+
+    async def test_block_policy_waits_for_room(self):
+        """Test that the block policy waits for the writer instead of dropping"""
+        batches = []
+        queue = make_queue(batches, max_size=2, batch_size=2, flush_interval=0.01, overflow_policy="block", block_timeout=1.0)
+        await queue.start()
+        try:
+            results = [await queue.enqueue(action="get_boards", resource_type="boards") for _ in range(6)]
+        finally:
+            await queue.stop()
+
+        assert all(results)
+        assert sum(len(b) for b in batches) == 6
+
+    async def test_block_policy_times_out(self):
+        """Test that the block policy drops after block_timeout when nothing drains"""
+        queue = make_queue([], max_size=1, overflow_policy="block", block_timeout=0.01)
+
+        assert await queue.enqueue(action="a", resource_type="r")
+        assert not await queue.enqueue(action="a", resource_type="r")
+        assert queue.dropped == 1
+
+    async def test_stop_flushes_pending_events(self):
+        """Test that shutdown writes events still in the queue"""
+        batches = []
+        queue = make_queue(batches, batch_size=100, flush_interval=60)
+        await queue.start()
+        for _ in range(7):
+            await queue.enqueue(action="delete_cards", resource_type="cards")
+
+        await queue.stop()
+
+        assert sum(len(b) for b in batches) == 7
+        assert queue.depth == 0
+
+    async def test_failed_batch_is_retried(self):
+        """Test that rows from a failed write are kept and written later"""
+        batches = []
+        session = RecordingSession(batches, fail=True)
+        queue = make_queue(batches, session=lambda: session)
+        await queue.enqueue(action="get_boards", resource_type="boards")
+
+        assert await queue.flush() == 0
+        assert queue.depth == 1
+
+        session.fail = False
+        assert await queue.flush() == 1
+        assert queue.stats()["write_errors"] == 1
+
+
+    async def test_long_values_truncated_to_column_size(self):
+        """Test that request-supplied strings are cut to their column lengths when queued"""
+        batches = []
+        queue = make_queue(batches)
+        await queue.enqueue(action="get_boards", resource_type="b" * 80, endpoint="/api/" + "x" * 1000, user_agent="u" * 2000)
+
+        await queue.flush()
+
+        row = batches[0][0]
+        assert (len(row["resource_type"]), len(row["endpoint"]), len(row["user_agent"])) == (50, 500, 500)
+
+    async def test_bad_row_isolated_and_dropped(self):
+        """Test that a rejected row doesn't hold back its batch and is dropped after max_attempts"""
+        batches = []
+        queue = make_queue(batches, max_attempts=2)
+        await queue.enqueue(action="get_boards", resource_type="boards")
+        await queue.enqueue(action="poison", resource_type="boards")
+        await queue.enqueue(action="get_lists", resource_type="lists")
+
+        assert await queue.flush() == 2
+        assert queue.depth == 1
+        assert await queue.flush() == 0
+
+        assert queue.depth == 0
+        assert [row["action"] for batch in batches for row in batch] == ["get_boards", "get_lists"]
+        assert queue.stats()["failed"] == 1
+
+    async def test_outage_keeps_batch_whole(self):
+        """Test that a connection failure retries the batch as is, without counting row attempts"""
+        batches = []
+        session = RecordingSession(batches, fail=True, error=ConnectionRefusedError("connection refused"))
+        queue = make_queue(batches, session=lambda: session, max_attempts=1)
+        for _ in range(3):
+            await queue.enqueue(action="get_boards", resource_type="boards")
+
+        for _ in range(3):
+            assert await queue.flush() == 0
+        assert queue.depth == 3
+
+        session.fail = False
+        assert await queue.flush() == 3
+        assert len(batches) == 1
@@ -0,0 +1,108 @@
+"""
+Unit tests for token verification and the verified-token cache
+"""
+import pytest
+import asyncio
+import time
+from datetime import timedelta
+from unittest.mock import patch
+from app.utils import auth
+from app.utils.auth import (
+    create_access_token, verify_token, token_cache, pwd_context,
+    verify_password, get_password_hash_async, verify_password_async, shutdown_password_hash_executor
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    token_cache.clear()
+    token_cache.hits = token_cache.misses = 0
+    yield
+    token_cache.clear()
+
+
+class TestVerifiedTokenCache:
+    """Tests for caching verified JWT payloads"""
+
+    def test_repeat_verification_is_cached(self):
+        """Test that the second verification of a token skips jwt.decode"""
+        token = create_access_token({"sub": "user-1"})
+
+        with patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+            first = verify_token(token)
+            second = verify_token(token)
+
+        assert first == second
+        assert first["sub"] == "user-1"
+        assert decode.call_count == 1
+        assert (token_cache.hits, token_cache.misses) == (1, 1)
+
+    def test_cached_payload_is_not_shared(self):
+        """Test that callers mutating a payload do not change the cached copy"""
+        token = create_access_token({"sub": "user-1"})
+        verify_token(token)["sub"] = "someone-else"
+
+        assert verify_token(token)["sub"] == "user-1"
+
+    def test_invalid_tokens_are_not_cached(self):
+        """Test that failed verifications return None and are not stored"""
+        assert verify_token("not-a-token") is None
+        assert verify_token(create_access_token({"sub": "user-1"}) + "x") is None
+        assert len(token_cache) == 0
+
+    def test_cache_entry_does_not_outlive_exp(self):
+        """Test that tokens expiring sooner than the cache TTL are cached only until exp"""
+        token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=-1))
+        assert verify_token(token) is None
+
+        token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=2))
+        verify_token(token)
+        _, expires_at = next(iter(token_cache._data.values()))
+
+        assert expires_at - time.monotonic() <= 2
+
+
+@pytest.mark.asyncio
+class TestAsyncPasswordHashing:
+    """Tests for bcrypt running on the password hashing pool"""
+
+    async def test_hash_and_verify(self):
+        """Test that async hashing round-trips with the sync verifier"""
+        hashed = await get_password_hash_async("correct horse")
+
+        assert verify_password("correct horse", hashed)
+        assert await verify_password_async("correct horse", hashed)
+        assert not await verify_password_async("wrong", hashed)
+
+    async def test_event_loop_is_not_blocked(self):
+        """Test that the loop keeps ticking while several verifications run"""
+        hashed = pwd_context.handler("bcrypt").using(rounds=10).hash("secret")
+        start = time.perf_counter()
+        verify_password("secret", hashed)
+        single_verify = time.perf_counter() - start
+
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(verify_password_async("secret", hashed) for _ in range(4)))
+        task.cancel()
+
+        assert all(results)
+        assert max(gaps) < single_verify / 2
+
+    async def test_hashing_works_after_shutdown(self):
+        """Test that a second app lifespan in the same process can still hash passwords"""
+        await get_password_hash_async("first")
+        shutdown_password_hash_executor()
+
+        hashed = await get_password_hash_async("second")
+        assert await verify_password_async("second", hashed)
+
@@ -0,0 +1,173 @@
+"""
+Unit tests for the board snapshot cache and its write-through invalidation
+"""
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.main import app
+from app.services.board_cache import BoardCache, board_cache
+from app.services.task_service import TaskService
+from app.models import Board, List, Card
+import json
+import orjson
+import uuid
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis.asyncio the board cache uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def eval(self, script, numkeys, key, generation_key, body, generation, ttl):
+        # SET_IF_GENERATION
+        if int(self.data.get(generation_key, 0)) == generation:
+            self.data[key] = body
+            return 1
+        return 0
+
+
+@pytest.mark.asyncio
+class TestBoardCache:
+    """Tests for BoardCache backends and generation checks"""
+
+    @pytest.fixture(params=["memory", "redis"])
+    def cache(self, request):
+        if request.param == "memory":
+            return BoardCache(maxsize=10, ttl=60)
+        return BoardCache(maxsize=10, ttl=60, redis_client=FakeRedis())
+
+    async def test_set_get_invalidate(self, cache):
+        """Test storing, reading and invalidating a snapshot"""
+        board_id = uuid.uuid4()
+        await cache.set(board_id, b'{"id": 1}')
+
+        assert await cache.get(board_id) == b'{"id": 1}'
+        await cache.invalidate(board_id)
+        assert await cache.get(board_id) is None
+        assert cache.stats()["hits"] == 1
+
+    async def test_stale_load_is_not_stored(self, cache):
+        """Test that a snapshot loaded before an invalidation is discarded"""
+        board_id = uuid.uuid4()
+        generation = await cache.generation(board_id)
+        await cache.invalidate(board_id)
+
+        await cache.set(board_id, b"stale", generation)
+
+        assert await cache.get(board_id) is None
+
+    async def test_generations_are_shared_through_redis(self):
+        """Test that an invalidation on one worker stops another worker's stale rebuild"""
+        shared = FakeRedis()
+        worker_a = BoardCache(maxsize=10, ttl=60, redis_client=shared)
+        worker_b = BoardCache(maxsize=10, ttl=60, redis_client=shared)
+        board_id = uuid.uuid4()
+
+        generation = await worker_a.generation(board_id)
+        await worker_b.invalidate(board_id)
+        await worker_a.set(board_id, b"stale", generation)
+        assert await worker_a.get(board_id) is None
+
+        await worker_a.set(board_id, b"fresh", await worker_a.generation(board_id))
+        assert await worker_b.get(board_id) == b"fresh"
+
+
+@pytest.mark.asyncio
+class TestBoardReadModel:
+    """Tests for cached board reads and write-through invalidation"""
+
+    async def _get_board(self, client, board_id):
+        return await client.get(f"/api/boards/{board_id}")
+
+    async def test_repeat_reads_are_served_from_cache(self, db_session: AsyncSession, test_engine, sample_card):
+        """Test that a second GET of the board runs no queries"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": None}
+        board_id = (await db_session.get(List, sample_card.list_id)).board_id
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await self._get_board(client, board_id)
+            event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+            second = await self._get_board(client, board_id)
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.json() == first.json()
+        assert first.json()["lists"][0]["cards"][0]["title"] == "Test Card"
+        assert statements == []
+
+        app.dependency_overrides.clear()
+
+    async def test_row_payload_matches_schema(self, db_session: AsyncSession, sample_board, sample_list, sample_card):
+        """Test that the payload built from rows serializes like BoardWithListsResponse"""
+        from app.api.tasks import BoardWithListsResponse
+
+        await TaskService.create_list(db_session, sample_board.id, name="Empty")
+        await TaskService.create_card(db_session, sample_list.id, title="Second", description="details")
+
+        payload = await TaskService.get_board_payload(db_session, sample_board.id)
+        board = await TaskService.get_board(db_session, sample_board.id)
+        expected = BoardWithListsResponse.model_validate(board).model_dump_json()
+
+        assert json.loads(orjson.dumps(payload)) == json.loads(expected)
+        assert await TaskService.get_board_payload(db_session, uuid.uuid4()) is None
+
+    async def test_writes_invalidate_snapshot(self, db_session: AsyncSession, sample_board, sample_list, sample_card):
+        """Test that list, card and board writes drop the cached snapshot"""
+        board_id = sample_board.id
+
+        await board_cache.set(board_id, b"{}")
+        await TaskService.create_list(db_session, board_id, name="Doing", position=1)
+        assert await board_cache.get(board_id) is None
+
+        await board_cache.set(board_id, b"{}")
+        await TaskService.create_card(db_session, sample_list.id, title="New")
+        assert await board_cache.get(board_id) is None
+
+        await board_cache.set(board_id, b"{}")
+        await TaskService.move_card(db_session, sample_card.id, sample_list.id, 3)
+        assert await board_cache.get(board_id) is None
+
+        await board_cache.set(board_id, b"{}")
+        await TaskService.update_board(db_session, board_id, name="Renamed")
+        assert await board_cache.get(board_id) is None
+
+        await board_cache.set(board_id, b"{}")
+        assert await TaskService.delete_board(db_session, board_id)
+        assert await board_cache.get(board_id) is None
+
+    async def test_existence_checks(self, db_session: AsyncSession, sample_board):
+        """Test board_exists and delete_board without loading the board graph"""
+        assert await TaskService.board_exists(db_session, sample_board.id)
+        assert not await TaskService.board_exists(db_session, uuid.uuid4())
+
+        assert await TaskService.delete_board(db_session, sample_board.id)
+        assert not await TaskService.board_exists(db_session, sample_board.id)
+        assert not await TaskService.delete_board(db_session, sample_board.id)
@@ -0,0 +1,135 @@
+"""
+Unit tests for board versions and incremental board sync
+"""
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.main import app
+from app.services.task_service import TaskService
+from app.models import Board, List
+import uuid
+
+
+async def board_version(db_session: AsyncSession, board_id) -> int:
+    payload = await TaskService.get_board_payload(db_session, board_id)
+    return payload["version"]
+
+
+@pytest.mark.asyncio
+class TestBoardVersions:
+    """Tests for version stamping and get_board_changes"""
+
+    async def test_writes_bump_version(self, db_session: AsyncSession, sample_board: Board, sample_list: List):
+        """Test that each write bumps the board version and stamps the rows it touched"""
+        start = await board_version(db_session, sample_board.id)
+
+        card = await TaskService.create_card(db_session, sample_list.id, title="First")
+        assert card.version == start + 1
+
+        other = await TaskService.create_list(db_session, sample_board.id, "Done")
+        assert other.version == start + 2
+
+        moved = await TaskService.move_card(db_session, card.id, other.id)
+        assert moved.version == start + 3
+        assert await board_version(db_session, sample_board.id) == start + 3
+
+    async def test_changes_since_version(self, db_session: AsyncSession, sample_board: Board, sample_list: List):
+        """Test that only rows changed after `since` are returned"""
+        first = await TaskService.create_card(db_session, sample_list.id, title="First")
+        since = await board_version(db_session, sample_board.id)
+        second = await TaskService.create_card(db_session, sample_list.id, title="Second")
+
+        changes = await TaskService.get_board_changes(db_session, sample_board.id, since)
+
+        assert changes["version"] == since + 1
+        assert [card["id"] for card in changes["cards"]] == [second.id]
+        assert changes["lists"] == []
+        assert changes["deleted"] == []
+
+        everything = await TaskService.get_board_changes(db_session, sample_board.id, 0)
+        assert {card["id"] for card in everything["cards"]} >= {first.id, second.id}
+        assert await TaskService.get_board_changes(db_session, uuid.uuid4(), 0) is None
+
+    async def test_cards_leaving_board_are_deleted(self, db_session: AsyncSession, sample_board: Board, sample_list: List):
+        """Test that a card moved to another board shows up as deleted, and as changed once it is back"""
+        card = await TaskService.create_card(db_session, sample_list.id, title="Traveller")
+        elsewhere = await TaskService.create_board(db_session, "Elsewhere")
+        elsewhere_list = await TaskService.create_list(db_session, elsewhere.id, "Inbox")
+        since = await board_version(db_session, sample_board.id)
+
+        await TaskService.move_card(db_session, card.id, elsewhere_list.id)
+        changes = await TaskService.get_board_changes(db_session, sample_board.id, since)
+        assert changes["deleted"] == [{"entity_type": "card", "id": card.id}]
+        assert changes["cards"] == []
+
+        await TaskService.move_cards(db_session, [card.id], sample_list.id)
+        changes = await TaskService.get_board_changes(db_session, sample_board.id, since)
+        assert changes["deleted"] == []
+        assert [row["id"] for row in changes["cards"]] == [card.id]
+
+    async def test_cross_board_moves_lock_boards_in_id_order(self, db_session: AsyncSession, sample_board: Board, sample_list: List, monkeypatch):
+        """Test that moves between boards bump each board once, in id order, whichever way they go"""
+        card = await TaskService.create_card(db_session, sample_list.id, title="Traveller")
+        elsewhere = await TaskService.create_board(db_session, "Elsewhere")
+        elsewhere_list = await TaskService.create_list(db_session, elsewhere.id, "Inbox")
+        bumped = []
+        bump_version = TaskService._bump_version
+
+        async def recording_bump(db, board_id):
+            bumped.append(board_id)
+            return await bump_version(db, board_id)
+
+        monkeypatch.setattr(TaskService, "_bump_version", recording_bump)
+        before = await board_version(db_session, sample_board.id)
+        await TaskService.move_card(db_session, card.id, elsewhere_list.id)
+        await TaskService.move_cards(db_session, [card.id], sample_list.id)
+
+        in_order = sorted([sample_board.id, elsewhere.id])
+        assert bumped == in_order + in_order
+        assert await board_version(db_session, sample_board.id) == before + 2
+
+    async def test_reorder_stamps_every_row(self, db_session: AsyncSession, sample_board: Board, sample_list: List):
+        """Test that renumbering a list reports every renumbered card"""
+        cards = await TaskService.create_cards(db_session, sample_list.id, [{"title": t} for t in "abc"])
+        since = await board_version(db_session, sample_board.id)
+
+        await TaskService.reorder_cards(db_session, sample_list.id, [c.id for c in reversed(cards)])
+
+        changes = await TaskService.get_board_changes(db_session, sample_board.id, since)
+        assert [row["title"] for row in changes["cards"]] == ["c", "b", "a"]
+
+
+@pytest.mark.asyncio
+class TestBoardChangesAPI:
+    """Tests for GET /api/boards/{id}/changes"""
+
+    async def test_changes_endpoint(self, db_session: AsyncSession, sample_board: Board, sample_list: List):
+        """Test syncing from the version of a full board fetch"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": None}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            board = (await client.get(f"/api/boards/{sample_board.id}")).json()
+            await TaskService.create_card(db_session, sample_list.id, title="Live")
+            changes = await client.get(f"/api/boards/{sample_board.id}/changes", params={"since": board["version"]})
+            missing = await client.get(f"/api/boards/{uuid.uuid4()}/changes", params={"since": 0})
+            invalid = await client.get(f"/api/boards/{sample_board.id}/changes", params={"since": -1})
+            sample_board.sync_horizon = board["version"] + 1
+            await db_session.commit()
+            pruned = await client.get(f"/api/boards/{sample_board.id}/changes", params={"since": board["version"]})
+
+        app.dependency_overrides.clear()
+
+        assert changes.status_code == status.HTTP_200_OK
+        data = changes.json()
+        assert data["version"] == board["version"] + 1
+        assert [card["title"] for card in data["cards"]] == ["Live"]
+        assert data["board"]["id"] == str(sample_board.id)
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+        assert invalid.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert pruned.status_code == status.HTTP_410_GONE
+        assert pruned.json()["detail"] == "snapshot_required"
@@ -0,0 +1,325 @@
+"""
+Unit tests for the WebSocket broadcaster
+"""
+import pytest
+import asyncio
+import json
+from starlette.testclient import TestClient
+from app.main import app
+from app.services.broadcaster import Broadcaster, SLOW_CONSUMER_CLOSE_CODE, board_topic, monitor_topic
+from app.services.event_bus import InProcessEventBus
+from app.services.task_service import TaskService
+from app.api import websocket
+from app.models import List
+from app.config import settings
+import uuid
+
+
+class FakeWebSocket:
+    """Records frames; `block` makes sends hang like a client that stopped reading"""
+
+    def __init__(self, block: bool = False, fail: bool = False):
+        self.frames = []
+        self.block = block
+        self.fail = fail
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        if self.fail:
+            raise ConnectionResetError("gone")
+        if self.block:
+            await asyncio.Event().wait()
+        self.frames.append(frame)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+async def settle():
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+class TestBroadcaster:
+    """Tests for fan-out, slow consumers and failed sockets"""
+
+    async def test_publish_serializes_once(self):
+        """Test that every client receives the same serialized frame"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1)
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for ws in sockets:
+            await broadcaster.connect(ws)
+
+        assert broadcaster.publish({"type": "check", "data": {"ok": True}}) == 3
+        await settle()
+
+        assert json.loads(sockets[0].frames[0]) == {"type": "check", "data": {"ok": True}}
+        assert sockets[0].frames[0] is sockets[1].frames[0] is sockets[2].frames[0]
+        await broadcaster.close_all()
+
+    async def test_slow_client_does_not_delay_others(self):
+        """Test that a client whose sends hang doesn't hold up delivery to the rest"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=30)
+        slow, fast = FakeWebSocket(block=True), FakeWebSocket()
+        await broadcaster.connect(slow)
+        await broadcaster.connect(fast)
+
+        for i in range(5):
+            broadcaster.publish({"n": i})
+        await settle()
+
+        assert len(fast.frames) == 5
+        assert slow.frames == []
+        await broadcaster.close_all()
+
+    async def test_disconnect_policy(self):
+        """Test that a client whose queue overflows is disconnected and removed"""
+        broadcaster = Broadcaster(queue_size=2, slow_consumer_policy="disconnect", send_timeout=30)
+        slow = FakeWebSocket(block=True)
+        await broadcaster.connect(slow)
+
+        queued = [broadcaster.publish({"n": i}) for i in range(4)]
+        await settle()
+
+        assert queued == [1, 1, 0, 0]  # two frames fill the queue, the third disconnects
+        assert slow.close_code == SLOW_CONSUMER_CLOSE_CODE
+        assert broadcaster.stats()["connections"] == 0
+        assert broadcaster.slow_disconnects == 1
+
+    async def test_drop_oldest_policy(self):
+        """Test that drop_oldest keeps the client and the newest frames"""
+        broadcaster = Broadcaster(queue_size=2, slow_consumer_policy="drop_oldest", send_timeout=30)
+        ws = FakeWebSocket(block=True)
+        connection = await broadcaster.connect(ws)
+
+        for i in range(5):
+            broadcaster.publish({"n": i})
+
+        assert [json.loads(connection.queue.get_nowait())["n"] for _ in range(2)] == [3, 4]
+        assert broadcaster.dropped == 3
+        assert broadcaster.stats()["connections"] == 1
+        await broadcaster.close_all()
+
+    async def test_failed_socket_removed(self):
+        """Test that a socket whose send fails is closed and dropped from the broadcaster"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1)
+        await broadcaster.connect(FakeWebSocket(fail=True))
+
+        broadcaster.publish({"n": 1})
+        await settle()
+
+        assert broadcaster.stats()["connections"] == 0
+        assert broadcaster.send_errors == 1
+
+    async def test_unknown_policy(self):
+        """Test that an unknown slow consumer policy is rejected"""
+        with pytest.raises(ValueError):
+            Broadcaster(slow_consumer_policy="buffer_forever")
+
+
+@pytest.mark.asyncio
+class TestTopics:
+    """Tests for topic subscriptions"""
+
+    async def test_publish_reaches_only_subscribers(self):
+        """Test that a topic's messages go only to its subscribers, tagged with the topic"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1)
+        board_id = uuid.uuid4()
+        watching, other = FakeWebSocket(), FakeWebSocket()
+        connection = await broadcaster.connect(watching)
+        await broadcaster.connect(other)
+
+        assert broadcaster.subscribe(connection, [f"board:{str(board_id).upper()}"]) == [board_topic(board_id)]
+        assert broadcaster.publish({"type": "board_changed"}, board_topic(board_id)) == 1
+        assert broadcaster.publish({"type": "check"}, monitor_topic(uuid.uuid4())) == 0
+        await settle()
+
+        assert [json.loads(f) for f in watching.frames] == [{"type": "board_changed", "topic": board_topic(board_id), "seq": 1}]
+        assert other.frames == []
+        await broadcaster.close_all()
+
+    async def test_unsubscribe_and_disconnect_clean_index(self):
+        """Test that topics with no subscribers left are removed from the index"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1)
+        first = await broadcaster.connect(FakeWebSocket())
+        second = await broadcaster.connect(FakeWebSocket())
+        topic = monitor_topic(uuid.uuid4())
+        broadcaster.subscribe(first, [topic, "status_page"])
+        broadcaster.subscribe(second, [topic])
+
+        assert broadcaster.unsubscribe(first, [topic]) == [topic]
+        assert broadcaster.stats()["subscriptions"] == 2
+        await broadcaster.disconnect(second)
+
+        assert set(broadcaster.topics) == {"status_page"}
+        await broadcaster.close_all()
+
+    async def test_invalid_topics_rejected(self, monkeypatch):
+        """Test that unknown topic names and too many subscriptions raise ValueError"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1)
+        connection = await broadcaster.connect(FakeWebSocket())
+
+        with pytest.raises(ValueError):
+            broadcaster.subscribe(connection, ["board:not-a-uuid"])
+        monkeypatch.setattr(settings, "WS_MAX_SUBSCRIPTIONS", 1)
+        with pytest.raises(ValueError):
+            broadcaster.subscribe(connection, [board_topic(uuid.uuid4()), board_topic(uuid.uuid4())])
+        assert connection.topics == set()
+        await broadcaster.close_all()
+
+    async def test_board_writes_notify_subscribers(self, db_session, sample_list: List, monkeypatch):
+        """Test that a card change is announced on its board's topic"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1)
+        bus = InProcessEventBus()
+        await bus.start(broadcaster.publish)
+        monkeypatch.setattr("app.services.task_service.event_bus", bus)
+        ws = FakeWebSocket()
+        broadcaster.subscribe(await broadcaster.connect(ws), [board_topic(sample_list.board_id)])
+
+        await TaskService.create_card(db_session, sample_list.id, title="Live")
+        await settle()
+
+        assert json.loads(ws.frames[0]) == {
+            "type": "board_changed",
+            "data": {"board_id": str(sample_list.board_id)},
+            "topic": board_topic(sample_list.board_id),
+            "seq": 1
+        }
+        await broadcaster.close_all()
+
+
+@pytest.mark.asyncio
+class TestReplay:
+    """Tests for per-topic replay buffers and resuming streams"""
+
+    async def test_resume_replays_only_the_gap(self):
+        """Test that frames published while a client was away are replayed from its last sequence"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1, replay_size=10)
+        topic = board_topic(uuid.uuid4())
+        connection = await broadcaster.connect(FakeWebSocket())
+        broadcaster.subscribe(connection, [topic])
+        broadcaster.publish({"n": 1}, topic)
+        position = broadcaster.position(topic)
+        await broadcaster.disconnect(connection)
+
+        broadcaster.publish({"n": 2}, topic)
+        broadcaster.publish({"n": 3}, topic)
+
+        missed = broadcaster.replay(topic, position["epoch"], position["seq"])
+        assert [json.loads(f)["n"] for f in missed] == [2, 3]
+        assert [json.loads(f)["seq"] for f in missed] == [2, 3]
+        assert broadcaster.replay(topic, position["epoch"], 3) == []
+
+    async def test_gap_too_large_or_other_epoch(self):
+        """Test that a resume is refused when frames were evicted or the epoch doesn't match"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1, replay_size=2)
+        topic = monitor_topic(uuid.uuid4())
+        connection = await broadcaster.connect(FakeWebSocket())
+        broadcaster.subscribe(connection, [topic])
+        for n in range(4):
+            broadcaster.publish({"n": n}, topic)
+        epoch = broadcaster.position(topic)["epoch"]
+
+        assert broadcaster.replay(topic, epoch, 1) is None
+        assert len(broadcaster.replay(topic, epoch, 2)) == 2
+        assert broadcaster.replay(topic, "elsewhere", 3) is None
+        assert broadcaster.replay(topic, epoch, 9) is None
+        assert broadcaster.replay_misses == 3
+        await broadcaster.close_all()
+
+    async def test_eviction_keeps_subscribed_topics(self):
+        """Test that only buffers of topics without subscribers are evicted"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1, replay_size=5, replay_topics=2)
+        connection = await broadcaster.connect(FakeWebSocket())
+        topics = [board_topic(uuid.uuid4()) for _ in range(3)]
+        broadcaster.subscribe(connection, topics[:1])
+        broadcaster.subscribe(connection, topics[1:])
+        broadcaster.unsubscribe(connection, topics[1:2])
+
+        broadcaster.subscribe(connection, ["status_page"])
+
+        assert set(broadcaster.buffers) == {topics[0], topics[2], "status_page"}
+        await broadcaster.close_all()
+
+    async def test_subscribe_with_since(self, monkeypatch):
+        """Test the subscribe message: replayed frames follow the reply, a stale position asks for a snapshot"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1, replay_size=10)
+        monkeypatch.setattr(websocket, "manager", broadcaster)
+        topic = board_topic(uuid.uuid4())
+        first = await broadcaster.connect(FakeWebSocket())
+        websocket.handle_message(first, json.dumps({"action": "subscribe", "topics": [topic]}), websocket.TASK_TOPICS)
+        broadcaster.publish({"n": 1}, topic)
+        epoch = broadcaster.position(topic)["epoch"]
+        await broadcaster.disconnect(first)
+        broadcaster.publish({"n": 2}, topic)
+
+        second = await broadcaster.connect(FakeWebSocket())
+        replies = websocket.handle_message(second, json.dumps({
+            "action": "subscribe", "topics": [topic], "since": {topic: {"epoch": epoch, "seq": 1}}
+        }), websocket.TASK_TOPICS)
+        subscribed, *missed = [json.loads(r) for r in replies]
+        assert subscribed["streams"] == {topic: {"epoch": epoch, "seq": 2}}
+        assert missed == [{"n": 2, "topic": topic, "seq": 2}]
+
+        replies = websocket.handle_message(second, json.dumps({
+            "action": "subscribe", "topics": [topic], "since": {topic: {"epoch": "stale", "seq": 1}}
+        }), websocket.TASK_TOPICS)
+        assert json.loads(replies[-1]) == {"type": "snapshot_required", "topic": topic, "stream": {"epoch": epoch, "seq": 2}}
+        await broadcaster.close_all()
+
+
+    async def test_resume_several_topics_within_queue_room(self, monkeypatch):
+        """Test that resuming many topics at once never overfills the send queue"""
+        broadcaster = Broadcaster(queue_size=10, slow_consumer_policy="disconnect", send_timeout=1, replay_size=10)
+        monkeypatch.setattr(websocket, "manager", broadcaster)
+        topics = [board_topic(uuid.uuid4()) for _ in range(3)]
+        first = await broadcaster.connect(FakeWebSocket())
+        broadcaster.subscribe(first, topics)
+        epochs = {topic: broadcaster.position(topic)["epoch"] for topic in topics}
+        await broadcaster.disconnect(first)
+        for topic in topics:
+            for n in range(4):
+                broadcaster.publish({"n": n}, topic)
+
+        second = await broadcaster.connect(FakeWebSocket(block=True))
+        replies = websocket.handle_message(second, json.dumps({
+            "action": "subscribe", "topics": topics, "since": {topic: {"epoch": epochs[topic], "seq": 0} for topic in topics}
+        }), websocket.TASK_TOPICS)
+        for reply in replies:
+            second.offer(reply)
+
+        types = [json.loads(r).get("type") for r in replies]
+        assert len(replies) <= 10
+        assert types.count("snapshot_required") == 1
+        assert types.count(None) == 8  # two topics replayed in full
+        assert not second.closed and broadcaster.slow_disconnects == 0
+        await broadcaster.close_all()
+
+
+class TestWebSocketEndpoint:
+    """Tests for the /ws endpoints"""
+
+    def test_ping_pong(self):
+        """Test that pings are answered through the connection's send queue"""
+        client = TestClient(app)
+        with client.websocket_connect("/ws/tasks") as ws:
+            ws.send_text("ping")
+            assert ws.receive_json() == {"type": "pong"}
+
+    def test_subscribe_messages(self):
+        """Test subscribing and unsubscribing over the socket, and topics the endpoint doesn't serve"""
+        client = TestClient(app)
+        topic = board_topic(uuid.uuid4())
+        with client.websocket_connect("/ws/tasks") as ws:
+            ws.send_json({"action": "subscribe", "topics": [topic]})
+            reply = ws.receive_json()
+            assert (reply["type"], reply["topics"], reply["streams"][topic]["seq"]) == ("subscribed", [topic], 0)
+            ws.send_json({"action": "subscribe", "topics": ["status_page"]})
+            assert ws.receive_json()["type"] == "error"
+            ws.send_json({"action": "unsubscribe", "topics": [topic]})
+            assert ws.receive_json() == {"type": "unsubscribed", "topics": [topic]}
+            ws.send_text("hello")
+            assert ws.receive_json()["type"] == "error"
@@ -0,0 +1,131 @@
+"""
+Unit tests for bulk card and list operations
+"""
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.main import app
+from app.services.task_service import TaskService
+from app.models import List, Card
+from app.utils.positions import spaced_positions
+import uuid
+
+
+async def card_titles(db_session: AsyncSession, list_id):
+    result = await db_session.execute(select(Card.title).where(Card.list_id == list_id).order_by(Card.position))
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+class TestBulkTaskService:
+    """Tests for TaskService bulk operations"""
+
+    async def test_create_cards_single_insert(self, test_engine, db_session: AsyncSession, sample_list: List):
+        """Test that a batch of cards is created with one INSERT, appended in order"""
+        await TaskService.create_card(db_session, sample_list.id, title="existing")
+        inserts = []
+
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                inserts.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", count_inserts)
+        try:
+            cards = await TaskService.create_cards(
+                db_session, sample_list.id, [{"title": f"card {i}"} for i in range(50)]
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count_inserts)
+
+        assert len(inserts) == 1
+        assert [card.title for card in cards] == [f"card {i}" for i in range(50)]
+        assert await card_titles(db_session, sample_list.id) == ["existing"] + [f"card {i}" for i in range(50)]
+
+    async def test_create_cards_unknown_list(self, db_session: AsyncSession):
+        """Test bulk create in a list that doesn't exist"""
+        assert await TaskService.create_cards(db_session, uuid.uuid4(), [{"title": "x"}]) is None
+
+    async def test_move_cards_keeps_run_together(self, db_session: AsyncSession, sample_board, sample_list: List):
+        """Test that several cards move into another list as one run, in the given order"""
+        done = await TaskService.create_list(db_session, sample_board.id, "Done")
+        todo = await TaskService.create_cards(db_session, sample_list.id, [{"title": t} for t in "abcd"])
+        finished = await TaskService.create_cards(db_session, done.id, [{"title": t} for t in "xy"])
+
+        moved = await TaskService.move_cards(
+            db_session, [todo[3].id, todo[1].id], done.id, after_card_id=finished[0].id
+        )
+
+        assert [card.title for card in moved] == ["d", "b"]
+        assert all(card.list_id == done.id for card in moved)
+        assert await card_titles(db_session, sample_list.id) == ["a", "c"]
+        assert await card_titles(db_session, done.id) == ["x", "d", "b", "y"]
+
+    async def test_move_cards_rejects_bad_ids(self, db_session: AsyncSession, sample_list: List):
+        """Test that unknown, repeated or self-referencing cards are rejected"""
+        cards = await TaskService.create_cards(db_session, sample_list.id, [{"title": t} for t in "ab"])
+
+        with pytest.raises(ValueError):
+            await TaskService.move_cards(db_session, [cards[0].id, uuid.uuid4()], sample_list.id)
+        with pytest.raises(ValueError):
+            await TaskService.move_cards(db_session, [cards[0].id, cards[0].id], sample_list.id)
+        with pytest.raises(ValueError):
+            await TaskService.move_cards(db_session, [cards[0].id], sample_list.id, before_card_id=cards[0].id)
+        assert await TaskService.move_cards(db_session, [cards[0].id], uuid.uuid4()) is None
+
+    async def test_reorder_cards(self, db_session: AsyncSession, sample_list: List):
+        """Test reordering a whole list, which must name every card exactly once"""
+        cards = await TaskService.create_cards(db_session, sample_list.id, [{"title": t} for t in "abc"])
+
+        with pytest.raises(ValueError):
+            await TaskService.reorder_cards(db_session, sample_list.id, [cards[0].id, cards[1].id])
+
+        reordered = await TaskService.reorder_cards(db_session, sample_list.id, [c.id for c in reversed(cards)])
+
+        assert [card.title for card in reordered] == ["c", "b", "a"]
+        assert [card.position for card in reordered] == spaced_positions(3)
+        assert await card_titles(db_session, sample_list.id) == ["c", "b", "a"]
+
+    async def test_reorder_lists(self, db_session: AsyncSession, sample_board, sample_list: List):
+        """Test reordering the lists of a board"""
+        done = await TaskService.create_list(db_session, sample_board.id, "Done")
+
+        reordered = await TaskService.reorder_lists(db_session, sample_board.id, [done.id, sample_list.id])
+
+        assert [lst.name for lst in reordered] == ["Done", sample_list.name]
+        assert reordered[0].position < reordered[1].position
+        assert await TaskService.reorder_lists(db_session, uuid.uuid4(), []) is None
+
+
+@pytest.mark.asyncio
+class TestBulkTaskAPI:
+    """Tests for the bulk card and list endpoints"""
+
+    async def test_bulk_create_and_move(self, db_session: AsyncSession, sample_board, sample_list: List):
+        """Test creating cards in bulk and moving them with one request each"""
+        from app.utils.database import get_db
+        from app.utils.auth import get_current_active_user
+
+        done = await TaskService.create_list(db_session, sample_board.id, "Done")
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_active_user] = lambda: {"id": None}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            created = await client.post(
+                f"/api/lists/{sample_list.id}/cards/bulk",
+                json={"cards": [{"title": "one"}, {"title": "two", "description": "second"}]}
+            )
+            card_ids = [card["id"] for card in created.json()]
+            moved = await client.put("/api/cards/move", json={"card_ids": card_ids, "list_id": str(done.id)})
+            rejected = await client.put(
+                f"/api/lists/{done.id}/cards/order", json={"card_ids": card_ids[:1]}
+            )
+
+        app.dependency_overrides.clear()
+
+        assert created.status_code == status.HTTP_201_CREATED
+        assert [card["title"] for card in created.json()] == ["one", "two"]
+        assert moved.status_code == status.HTTP_200_OK
+        assert [card["list_id"] for card in moved.json()] == [str(done.id)] * 2
+        assert rejected.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,48 @@
+"""
+Unit tests for the in-process TTL cache (no database required)
+"""
+import time
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache expiry, LRU eviction and counters"""
+
+    def test_get_and_set(self):
+        """Test that stored values are returned and counted as hits"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entries_expire(self):
+        """Test that an entry is gone after its TTL"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1, ttl=0)
+        cache.set("b", 2, expires_at=time.monotonic() - 1)
+
+        assert cache.get("a") is None
+        assert "b" not in cache
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that maxsize is enforced by dropping the oldest unused entry"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_none_is_a_valid_value(self):
+        """Test that a cached None is distinguishable from a miss"""
+        cache = TTLCache()
+        cache.set("a", None)
+
+        assert "a" in cache
+        assert cache.get("a", "missing") is None
@@ -0,0 +1,227 @@
+"""
+Unit tests for CheckResultSink (no database required)
+"""
+import pytest
+import asyncio
+from datetime import datetime
+from app.services.check_sink import CheckResultSink
+from app.models import Metric, MonitorStatus
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+import uuid
+
+
+class RecordingSession:
+    """Fake session that records executed statements and their parameter lists"""
+
+    def __init__(self, log, fail: bool = False, reject=None):
+        self.log = log
+        self.fail = fail
+        self.reject = reject  # rows with this monitor_id make the statement fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params=None):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        if self.reject is not None and any(row.get("monitor_id") == self.reject for row in params):
+            raise ValueError("invalid input value")
+        self.log.append((statement.table.name, list(params)))
+
+    async def commit(self):
+        pass
+
+    def begin_nested(self):
+        return Savepoint(self.log)
+
+
+class Savepoint:
+    """Fake SAVEPOINT that discards statements logged inside it on error"""
+
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        self.mark = len(self.log)
+        return self
+
+    async def __aexit__(self, exc_type, *args):
+        if exc_type is not None:
+            del self.log[self.mark:]
+        return False
+
+
+def make_check(monitor_id: uuid.UUID, status: MonitorStatus = MonitorStatus.UP):
+    return {
+        "id": uuid.uuid4(),
+        "monitor_id": monitor_id,
+        "status": status,
+        "response_time": 12.5,
+        "status_code": 200,
+        "error_message": None,
+        "checked_at": datetime.utcnow()
+    }
+
+
+@pytest.mark.asyncio
+class TestCheckResultSink:
+    """Tests for batched check result writes"""
+
+    async def test_flush_writes_all_rows_in_one_statement(self):
+        """Test that buffered checks are inserted with a single statement"""
+        log = []
+        sink = CheckResultSink(session_factory=lambda: RecordingSession(log), batch_size=100)
+        monitor_id = uuid.uuid4()
+
+        for _ in range(10):
+            await sink.submit(make_check(monitor_id), MonitorStatus.UP, datetime.utcnow())
+        written = await sink.flush()
+
+        assert written == 10
+        assert [table for table, _ in log] == ["checks", "monitors"]
+        assert len(log[0][1]) == 10
+
+    async def test_only_latest_monitor_status_is_written(self):
+        """Test that monitor updates are coalesced per monitor"""
+        log = []
+        sink = CheckResultSink(session_factory=lambda: RecordingSession(log), batch_size=100)
+        monitor_id = uuid.uuid4()
+
+        await sink.submit(make_check(monitor_id), MonitorStatus.UP, datetime.utcnow())
+        await sink.submit(make_check(monitor_id, MonitorStatus.DOWN), MonitorStatus.DOWN, datetime.utcnow())
+        await sink.flush()
+
+        monitor_updates = log[1][1]
+        assert len(monitor_updates) == 1
+        assert monitor_updates[0]["status"] == MonitorStatus.DOWN
+
+    async def test_batch_size_triggers_flush(self):
+        """Test that reaching batch_size flushes without waiting for the interval"""
+        log = []
+        sink = CheckResultSink(session_factory=lambda: RecordingSession(log), batch_size=5, flush_interval=60)
+        await sink.start()
+        try:
+            for _ in range(5):
+                await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+            await asyncio.sleep(0.05)
+        finally:
+            await sink.stop()
+
+        assert sink.rows_written == 5
+        assert sink.flushes == 1
+
+    async def test_stop_flushes_pending_rows(self):
+        """Test that shutdown writes everything still buffered"""
+        log = []
+        sink = CheckResultSink(session_factory=lambda: RecordingSession(log), batch_size=100, flush_interval=60)
+        await sink.start()
+        await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+
+        await sink.stop()
+
+        assert sink.pending == 0
+        assert sink.rows_written == 1
+
+    async def test_stop_gives_up_when_database_is_down(self):
+        """Test that shutdown with an unreachable database reports the rows as lost instead of raising"""
+        def unreachable():
+            raise OperationalError("INSERT INTO checks", {}, ConnectionError("connection refused"))
+
+        sink = CheckResultSink(session_factory=unreachable, batch_size=100, flush_interval=0.01)
+        await sink.start()
+        await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+
+        await sink.stop(timeout=0.05)
+
+        assert not sink.running
+        assert sink.pending == 1
+        assert sink.flush_errors >= 2
+
+    async def test_commit_hooks_run_after_commit(self):
+        """Test that commit hooks get the written checks, and don't run when the flush fails"""
+        committed = []
+
+        async def hook(checks):
+            committed.append(len(checks))
+
+        session = RecordingSession([], fail=True)
+        sink = CheckResultSink(session_factory=lambda: session, batch_size=100)
+        sink.add_commit_hook(hook)
+        await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+
+        with pytest.raises(ConnectionError):
+            await sink.flush()
+        assert committed == []
+
+        session.fail = False
+        await sink.flush()
+        assert committed == [1]
+
+    async def test_failing_flush_hook_does_not_drop_checks(self):
+        """Test that a flush hook error is isolated in its savepoint and the checks still commit"""
+        log = []
+
+        async def hook(db, checks):
+            await db.execute(insert(Metric), [{"monitor_id": checks[0]["monitor_id"]}])
+            raise ValueError("rollup constraint violated")
+
+        sink = CheckResultSink(session_factory=lambda: RecordingSession(log), batch_size=100)
+        sink.add_flush_hook(hook)
+        for _ in range(3):
+            await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+
+        written = await sink.flush()
+
+        assert written == 3
+        assert sink.pending == 0
+        assert sink.stats()["dropped"] == 0
+        assert sink.stats()["hook_errors"] == 1
+        assert [table for table, _ in log] == ["checks", "monitors"]
+
+    async def test_failed_flush_keeps_rows(self):
+        """Test that rows are retained when the database write fails"""
+        sink = CheckResultSink(session_factory=lambda: RecordingSession([], fail=True), batch_size=100)
+        await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+
+        with pytest.raises(ConnectionError):
+            await sink.flush()
+
+        assert sink.pending == 1
+        assert sink.flush_errors == 1
+
+    async def test_rejected_row_is_isolated_and_dropped(self):
+        """Test that a batch the database rejects is retried in halves and only the bad row is lost"""
+        log = []
+        bad = uuid.uuid4()
+        sink = CheckResultSink(session_factory=lambda: RecordingSession(log, reject=bad), batch_size=100)
+        good = [uuid.uuid4() for _ in range(7)]
+        for monitor_id in good[:3] + [bad] + good[3:]:
+            await sink.submit(make_check(monitor_id), MonitorStatus.UP, datetime.utcnow())
+
+        written = await sink.flush()
+
+        assert written == 7
+        assert sink.pending == 0
+        assert sink.stats()["dropped"] == 1
+        inserted = [row["monitor_id"] for table, rows in log if table == "checks" for row in rows]
+        updated = [row["id"] for table, rows in log if table == "monitors" for row in rows]
+        assert sorted(inserted) == sorted(good)
+        assert sorted(updated) == sorted(good)
+
+    async def test_back_pressure_when_buffer_is_full(self):
+        """Test that submit waits once max_pending rows are buffered"""
+        sink = CheckResultSink(session_factory=lambda: RecordingSession([]), batch_size=2, max_pending=2)
+        await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+        await sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow())
+
+        blocked = asyncio.create_task(sink.submit(make_check(uuid.uuid4()), MonitorStatus.UP, datetime.utcnow()))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        await sink.flush()
+        await asyncio.wait_for(blocked, 1)
+        assert sink.pending == 1
@@ -0,0 +1,83 @@
+"""
+Unit tests for coalescing of live monitor updates
+"""
+import pytest
+import asyncio
+from app.services.coalescer import UpdateCoalescer
+from app.services.broadcaster import monitor_topic, MONITORS_TOPIC
+
+
+class Recorder:
+    def __init__(self):
+        self.frames = []
+
+    def __call__(self, message, topic):
+        self.frames.append((topic, message))
+        return 1
+
+
+def check(monitor_id: str, status: str):
+    return {"type": "check", "data": {"monitor_id": monitor_id, "status": status}}
+
+
+@pytest.mark.asyncio
+class TestUpdateCoalescer:
+    """Tests for batching check updates"""
+
+    async def test_latest_check_per_monitor_wins(self):
+        """Test that a window emits each monitor's latest check, plus one batched frame"""
+        published = Recorder()
+        coalescer = UpdateCoalescer(published, window=60)
+
+        coalescer.publish(check("a", "down"), monitor_topic("a"))
+        coalescer.publish(check("b", "up"), monitor_topic("b"))
+        coalescer.publish(check("a", "up"), monitor_topic("a"))
+        assert published.frames == []
+        coalescer.flush()
+
+        assert published.frames == [
+            (monitor_topic("a"), check("a", "up")),
+            (monitor_topic("b"), check("b", "up")),
+            (MONITORS_TOPIC, {"type": "checks", "data": [check("a", "up")["data"], check("b", "up")["data"]]})
+        ]
+        stats = coalescer.stats()
+        assert (stats["updates"], stats["superseded"], stats["frames"], stats["summary_frames"]) == (3, 1, 2, 1)
+        assert stats["messages_saved"] == 1
+
+    async def test_other_messages_pass_through(self):
+        """Test that non-check messages are published immediately"""
+        published = Recorder()
+        coalescer = UpdateCoalescer(published, window=60)
+        coalescer.publish({"type": "status_page_changed", "data": {}}, "status_page")
+
+        assert published.frames == [("status_page", {"type": "status_page_changed", "data": {}})]
+        assert coalescer.stats()["pending"] == 0
+
+    async def test_zero_window_still_feeds_monitors_topic(self):
+        """Test that with coalescing off each check goes to its topic and, on its own, to the monitors topic"""
+        published = Recorder()
+        coalescer = UpdateCoalescer(published, window=0)
+        coalescer.publish(check("a", "down"), monitor_topic("a"))
+        coalescer.publish(check("a", "up"), monitor_topic("a"))
+
+        assert published.frames == [
+            (monitor_topic("a"), check("a", "down")),
+            (MONITORS_TOPIC, {"type": "checks", "data": [check("a", "down")["data"]]}),
+            (monitor_topic("a"), check("a", "up")),
+            (MONITORS_TOPIC, {"type": "checks", "data": [check("a", "up")["data"]]})
+        ]
+        stats = coalescer.stats()
+        assert stats["pending"] == 0
+        assert (stats["updates"], stats["frames"], stats["summary_frames"]) == (2, 2, 2)
+        assert stats["messages_saved"] == 0
+
+    async def test_window_flushes_on_its_own(self):
+        """Test that held updates go out once the window closes"""
+        published = Recorder()
+        coalescer = UpdateCoalescer(published, window=0.01)
+
+        coalescer.publish(check("a", "up"), monitor_topic("a"))
+        await asyncio.sleep(0.05)
+
+        assert [topic for topic, _ in published.frames] == [monitor_topic("a"), MONITORS_TOPIC]
+        assert coalescer.stats()["flushes"] == 1
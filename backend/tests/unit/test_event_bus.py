@@ -0,0 +1,122 @@
+"""
+Unit tests for the cross-worker event bus
+"""
+import pytest
+import asyncio
+from app.services.event_bus import InProcessEventBus, RedisEventBus
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel: str):
+        self.redis.subscribers.setdefault(channel, []).append(self)
+
+    async def listen(self):
+        while True:
+            yield {"type": "message", "data": await self.queue.get()}
+
+    async def aclose(self):
+        for subscribers in self.redis.subscribers.values():
+            if self in subscribers:
+                subscribers.remove(self)
+
+
+class FakeRedis:
+    """In-process stand-in for the publish/pubsub subset of redis.asyncio"""
+
+    def __init__(self, fail: bool = False):
+        self.subscribers = {}
+        self.fail = fail
+
+    async def publish(self, channel: str, data: bytes) -> int:
+        if self.fail:
+            raise ConnectionError("redis down")
+        for pubsub in self.subscribers.get(channel, []):
+            pubsub.queue.put_nowait(data)
+        return len(self.subscribers.get(channel, []))
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self)
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, message, topic):
+        self.events.append((topic, message))
+
+
+async def settle():
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+class TestInProcessEventBus:
+    """Tests for the single-worker bus"""
+
+    async def test_delivers_to_handler(self):
+        """Test that published events reach the handler once started, and are dropped before"""
+        bus = InProcessEventBus()
+        received = Recorder()
+
+        await bus.publish("status_page", {"type": "early"})
+        await bus.start(received)
+        await bus.publish("status_page", {"type": "status_page_changed"})
+
+        assert received.events == [("status_page", {"type": "status_page_changed"})]
+        assert bus.stats()["published"] == 2
+
+
+@pytest.mark.asyncio
+class TestRedisEventBus:
+    """Tests for the Redis pub/sub bus"""
+
+    async def test_events_reach_every_worker_once(self):
+        """Test that an event published by one worker is delivered once by each worker, including itself"""
+        redis = FakeRedis()
+        workers = [RedisEventBus(redis), RedisEventBus(redis)]
+        received = [Recorder(), Recorder()]
+        for bus, handler in zip(workers, received):
+            await bus.start(handler)
+        await settle()
+
+        await workers[0].publish("board:1", {"type": "board_changed", "data": {"board_id": "1"}})
+        await settle()
+
+        for handler in received:
+            assert handler.events == [("board:1", {"type": "board_changed", "data": {"board_id": "1"}})]
+        for bus in workers:
+            await bus.stop()
+        assert redis.subscribers["events"] == []
+
+    async def test_publish_failure_delivers_locally(self):
+        """Test that when Redis is down this worker's clients still get the event"""
+        bus = RedisEventBus(FakeRedis(fail=True))
+        received = Recorder()
+        await bus.start(received)
+
+        await bus.publish(None, {"type": "ping"})
+
+        assert received.events == [(None, {"type": "ping"})]
+        assert bus.stats()["errors"] == 1
+        await bus.stop()
+
+    async def test_malformed_event_skipped(self):
+        """Test that an unparseable payload is counted and the listener keeps going"""
+        redis = FakeRedis()
+        bus = RedisEventBus(redis)
+        received = Recorder()
+        await bus.start(received)
+        await settle()
+
+        await redis.publish("events", b"not json")
+        await bus.publish("status_page", {"type": "status_page_changed"})
+        await settle()
+
+        assert received.events == [("status_page", {"type": "status_page_changed"})]
+        assert bus.stats()["errors"] == 1
+        await bus.stop()
@@ -0,0 +1,115 @@
+"""
+Unit tests for the shared health check HTTP client (local stub server, no database required)
+"""
+import pytest
+import pytest_asyncio
+import asyncio
+import httpx
+from app.services.http_client import HealthCheckClient, CachingDNSBackend
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+class StubServer:
+    """Keep-alive HTTP server that counts accepted connections"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(self.delay)
+                writer.write(RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def stub_server():
+    stub = StubServer()
+    server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+    stub.url = f"http://localhost:{server.sockets[0].getsockname()[1]}/health"
+    async with server:
+        yield stub
+
+
+@pytest.mark.asyncio
+class TestHealthCheckClient:
+    """Tests for HealthCheckClient connection reuse"""
+
+    async def test_connections_are_reused(self, stub_server):
+        """Test that sequential checks share one keep-alive connection"""
+        client = HealthCheckClient()
+        try:
+            for _ in range(10):
+                response = await client.get(stub_server.url, timeout=5)
+                assert response.status_code == 200
+        finally:
+            await client.aclose()
+
+        assert stub_server.connections == 1
+
+    async def test_dns_lookups_are_cached(self, stub_server):
+        """Test that the hostname is resolved once for many connections"""
+        client = HealthCheckClient(max_connections_per_host=5)
+        try:
+            await asyncio.gather(*(client.get(stub_server.url, timeout=5) for _ in range(5)))
+        finally:
+            await client.aclose()
+
+        assert client.dns.misses == 1
+
+    async def test_per_request_timeout(self, stub_server):
+        """Test that the per-monitor timeout is applied to each request"""
+        stub_server.delay = 0.5
+        client = HealthCheckClient()
+        try:
+            with pytest.raises(httpx.TimeoutException):
+                await client.get(stub_server.url, timeout=0.05)
+        finally:
+            await client.aclose()
+
+    async def test_per_host_connection_limit(self, stub_server):
+        """Test that concurrent checks to one host are capped"""
+        stub_server.delay = 0.02
+        client = HealthCheckClient(max_connections_per_host=2)
+        try:
+            await asyncio.gather(*(client.get(stub_server.url, timeout=5) for _ in range(10)))
+        finally:
+            await client.aclose()
+
+        assert stub_server.connections <= 2
+
+    async def test_elapsed_excludes_host_slot_wait(self, stub_server):
+        """Test that response times don't include queueing behind other checks to the host"""
+        stub_server.delay = 0.1
+        client = HealthCheckClient(max_connections_per_host=1)
+        try:
+            responses = await asyncio.gather(*(client.get(stub_server.url, timeout=5) for _ in range(3)))
+        finally:
+            await client.aclose()
+
+        assert max(response.elapsed.total_seconds() for response in responses) < 0.19
+        assert client._host_limits == {}
+
+    async def test_dns_cache_is_bounded(self):
+        """Test that the DNS cache keeps at most maxsize hostnames"""
+        dns = CachingDNSBackend(ttl=60, maxsize=2)
+
+        async def lookup(host, port):
+            return "127.0.0.1"
+
+        dns._lookup = lookup
+        for host in ("a.example", "b.example", "c.example"):
+            await dns.resolve(host, 80)
+
+        assert len(dns._cache) == 2
+        assert dns.misses == 3
+
@@ -0,0 +1,131 @@
+"""
+Unit tests for the ASGI audit and rate limit middleware (no database required)
+"""
+import pytest
+import asyncio
+from httpx import AsyncClient
+from fastapi import FastAPI
+from app.services.audit_queue import AuditLogQueue
+from app.utils.auth import create_access_token
+from app.utils.middleware import AuditMiddleware, RateLimitMiddleware
+import uuid
+
+
+class SlowSession:
+    """Fake session whose writes take a long time"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params=None):
+        await asyncio.sleep(1.0)
+
+    async def commit(self):
+        pass
+
+
+def make_app(queue: AuditLogQueue, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/boards")
+    async def create_board(payload: dict):
+        return payload
+
+    @app.get("/api/boards")
+    async def list_boards():
+        return []
+
+    app.add_middleware(AuditMiddleware, queue=queue, **kwargs)
+    return app
+
+
+def queued_rows(queue: AuditLogQueue):
+    rows = []
+    while not queue._queue.empty():
+        rows.append(queue._queue.get_nowait()[1])
+    return rows
+
+
+@pytest.mark.asyncio
+class TestAuditMiddleware:
+    """Tests for AuditMiddleware"""
+
+    async def test_request_does_not_wait_for_audit_write(self):
+        """Test that responses are sent while audit persistence is slow"""
+        queue = AuditLogQueue(session_factory=SlowSession)
+        app = make_app(queue)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await asyncio.wait_for(client.post("/api/boards", json={"name": "Roadmap"}), 0.5)
+
+        assert response.status_code == 200
+        assert response.json() == {"name": "Roadmap"}
+        assert "x-process-time" in response.headers
+        [row] = queued_rows(queue)
+        assert row["action"] == "post_boards"
+        assert row["request_body"] == {"name": "Roadmap"}
+        assert row["response_status"] == 200
+
+    async def test_large_body_is_not_captured(self):
+        """Test that bodies above the capture cap reach the app but are not stored"""
+        queue = AuditLogQueue(session_factory=SlowSession)
+        app = make_app(queue, max_body_capture=64)
+        payload = {"name": "x" * 200}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post("/api/boards", json=payload)
+
+        assert response.json() == payload
+        [row] = queued_rows(queue)
+        assert row["request_body"] is None
+        assert "not captured" in row["details"]
+
+    async def test_get_requests_are_logged(self):
+        """Test that requests without a body are logged with their status"""
+        queue = AuditLogQueue(session_factory=SlowSession)
+        app = make_app(queue)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            await client.get("/api/boards", headers={"User-Agent": "pytest"})
+            await client.get("/api/missing")
+
+        rows = queued_rows(queue)
+        assert [(r["action"], r["response_status"]) for r in rows] == [("get_boards", 200), ("get_missing", 404)]
+        assert rows[0]["user_agent"] == "pytest"
+
+    async def test_token_user_is_recorded(self):
+        """Test that requests are logged against the bearer token's user"""
+        queue = AuditLogQueue(session_factory=SlowSession)
+        app = make_app(queue)
+        user_id = uuid.uuid4()
+        token = create_access_token({"sub": str(user_id)})
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            await client.get("/api/boards", headers={"Authorization": f"Bearer {token}"})
+            await client.get("/api/boards", headers={"Authorization": "Bearer garbage"})
+
+        rows = queued_rows(queue)
+        assert [r["user_id"] for r in rows] == [user_id, None]
+
+
+@pytest.mark.asyncio
+class TestRateLimitMiddleware:
+    """Tests for RateLimitMiddleware"""
+
+    async def test_requests_over_limit_are_rejected(self):
+        """Test that the client gets 429 once max_requests is reached"""
+        app = FastAPI()
+
+        @app.get("/api/ping")
+        async def ping():
+            return {"ok": True}
+
+        app.add_middleware(RateLimitMiddleware, max_requests=3, window=60)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            statuses = [(await client.get("/api/ping")).status_code for _ in range(5)]
+
+        assert statuses == [200, 200, 200, 429, 429]
@@ -0,0 +1,238 @@
+"""
+Unit tests for MonitorService
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.monitor_service import MonitorService
+from app.services.rollup_service import RollupService, bucket_start
+from app.models import Monitor, Check, Incident, Metric, MonitorStatus, IncidentStatus
+from datetime import datetime, timedelta
+import httpx
+
+
+@pytest.mark.asyncio
+class TestMonitorServiceUptime:
+    """Tests for MonitorService uptime aggregation"""
+
+    async def test_uptime_without_checks(self, db_session: AsyncSession):
+        """Test uptime of a monitor that has never been checked"""
+        monitor = Monitor(name="API", url="https://example.com")
+        db_session.add(monitor)
+        await db_session.commit()
+
+        uptime = await MonitorService().calculate_uptime(db_session, monitor.id)
+
+        assert uptime == {"uptime_percentage": 100.0, "total_checks": 0, "failed_checks": 0, "avg_response_time": 0}
+
+    async def test_uptime_aggregates_window(self, db_session: AsyncSession):
+        """Test uptime, failures and average response time within the window"""
+        monitor = Monitor(name="API", url="https://example.com")
+        db_session.add(monitor)
+        await db_session.commit()
+
+        for response_time in (10.0, 20.0, 30.0):
+            db_session.add(Check(monitor_id=monitor.id, status=MonitorStatus.UP, response_time=response_time))
+        db_session.add(Check(monitor_id=monitor.id, status=MonitorStatus.DOWN))
+        db_session.add(Check(
+            monitor_id=monitor.id,
+            status=MonitorStatus.DOWN,
+            checked_at=datetime.utcnow() - timedelta(hours=30)
+        ))
+        await db_session.commit()
+
+        uptime = await MonitorService().calculate_uptime(db_session, monitor.id, hours=24)
+
+        assert uptime["total_checks"] == 4
+        assert uptime["failed_checks"] == 1
+        assert uptime["uptime_percentage"] == 75.0
+        assert uptime["avg_response_time"] == 20.0
+
+    async def test_bulk_uptime_matches_single_monitor(self, db_session: AsyncSession):
+        """Test that the grouped uptime query agrees with per-monitor uptime"""
+        service = MonitorService()
+        monitors = [Monitor(name=f"API {i}", url="https://example.com") for i in range(3)]
+        db_session.add_all(monitors)
+        await db_session.commit()
+
+        for i, monitor in enumerate(monitors):
+            for j in range(i + 2):
+                status = MonitorStatus.DOWN if j == 0 else MonitorStatus.UP
+                db_session.add(Check(monitor_id=monitor.id, status=status, response_time=10.0 * j or None))
+        await db_session.commit()
+
+        bulk = await service.calculate_uptime_bulk(db_session, [m.id for m in monitors], hours=1)
+
+        for monitor in monitors:
+            assert bulk[monitor.id] == await service.calculate_uptime(db_session, monitor.id, hours=1)
+
+
+@pytest.mark.asyncio
+class TestMonitorServiceDashboard:
+    """Tests for the aggregate dashboard metrics"""
+
+    async def test_dashboard_metrics(self, db_session: AsyncSession):
+        """Test status counts, active incidents and average uptime"""
+        up = Monitor(name="Up", url="https://example.com", status=MonitorStatus.UP)
+        down = Monitor(name="Down", url="https://example.com", status=MonitorStatus.DOWN)
+        unchecked = Monitor(name="New", url="https://example.com")
+        db_session.add_all([up, down, unchecked])
+        await db_session.commit()
+
+        db_session.add(Check(monitor_id=up.id, status=MonitorStatus.UP))
+        db_session.add(Check(monitor_id=down.id, status=MonitorStatus.UP))
+        db_session.add(Check(monitor_id=down.id, status=MonitorStatus.DOWN))
+        db_session.add(Incident(monitor_id=down.id, title="Down", status=IncidentStatus.INVESTIGATING))
+        db_session.add(Incident(monitor_id=down.id, title="Earlier", status=IncidentStatus.RESOLVED))
+        await db_session.commit()
+
+        metrics = await MonitorService().get_dashboard_metrics(db_session)
+
+        assert metrics == {
+            "total_monitors": 3,
+            "monitors_up": 1,
+            "monitors_down": 1,
+            "monitors_degraded": 0,
+            "active_incidents": 1,
+            "avg_uptime": round((100.0 + 50.0 + 100.0) / 3, 2)
+        }
+
+    async def test_dashboard_metrics_without_monitors(self, db_session: AsyncSession):
+        """Test the dashboard of an empty installation"""
+        metrics = await MonitorService().get_dashboard_metrics(db_session)
+
+        assert metrics["total_monitors"] == 0
+        assert metrics["avg_uptime"] == 100.0
+
+
+@pytest.mark.asyncio
+class TestRollupService:
+    """Tests for uptime rollups"""
+
+    def test_bucket_start(self):
+        """Test truncating timestamps to hour buckets"""
+        timestamp = datetime(2024, 5, 17, 13, 45, 30, 123)
+
+        assert bucket_start(timestamp) == datetime(2024, 5, 17, 13)
+
+    async def test_fold_adds_to_compacted_bucket(self, db_session: AsyncSession):
+        """Test that folding into a bucket compaction already wrote adds to it in place"""
+        monitor = Monitor(name="API", url="https://example.com")
+        db_session.add(monitor)
+        await db_session.commit()
+        hour = bucket_start(datetime.utcnow()) - timedelta(hours=3)
+        db_session.add(Check(monitor_id=monitor.id, status=MonitorStatus.UP, response_time=10.0, checked_at=hour))
+        await db_session.commit()
+
+        await RollupService.compact(db_session, hour, hour + timedelta(hours=1))
+        await RollupService.fold_checks(db_session, [
+            {"monitor_id": monitor.id, "status": MonitorStatus.DOWN, "response_time": None, "checked_at": hour},
+            {"monitor_id": monitor.id, "status": MonitorStatus.UP, "response_time": 30.0, "checked_at": hour}
+        ])
+        await db_session.commit()
+
+        metric = (await db_session.execute(select(Metric).where(Metric.monitor_id == monitor.id))).scalar_one()
+        await db_session.refresh(metric)
+        assert (metric.total_checks, metric.failed_checks, metric.response_time_count) == (3, 1, 2)
+        assert metric.avg_response_time == 20.0
+        assert metric.uptime_percentage == 66.67
+
+    async def test_backfill_covers_checks_before_first_rollup(self, db_session: AsyncSession):
+        """Test that checks older than the first hour bucket are rolled up, and old minute buckets dropped"""
+        monitor = Monitor(name="API", url="https://example.com")
+        db_session.add(monitor)
+        await db_session.commit()
+        now = datetime.utcnow()
+        for days in (10, 5):
+            db_session.add(Check(monitor_id=monitor.id, status=MonitorStatus.UP, checked_at=now - timedelta(days=days)))
+        db_session.add(Metric(
+            monitor_id=monitor.id, granularity="minute", uptime_percentage=100.0, avg_response_time=0.0,
+            total_checks=1, failed_checks=0, period_start=now, period_end=now
+        ))
+        await db_session.commit()
+        await RollupService.fold_checks(db_session, [
+            {"monitor_id": monitor.id, "status": MonitorStatus.UP, "response_time": 5.0, "checked_at": now - timedelta(hours=2)}
+        ])
+        await db_session.commit()
+
+        await RollupService.backfill(db_session, chunk_hours=48)
+        metrics = (await db_session.execute(select(Metric).order_by(Metric.period_start))).scalars().all()
+
+        assert [m.granularity for m in metrics] == ["hour"] * 3
+        assert [m.period_start for m in metrics[:2]] == [
+            bucket_start(now - timedelta(days=10)), bucket_start(now - timedelta(days=5))
+        ]
+
+    async def test_rollup_window_matches_raw_checks(self, db_session: AsyncSession):
+        """Test that uptime read from compacted rollups equals uptime from raw checks"""
+        monitor = Monitor(name="API", url="https://example.com")
+        db_session.add(monitor)
+        await db_session.commit()
+
+        now = datetime.utcnow()
+        for i in range(60):
+            status = MonitorStatus.DOWN if i % 5 == 0 else MonitorStatus.UP
+            db_session.add(Check(
+                monitor_id=monitor.id,
+                status=status,
+                response_time=None if status == MonitorStatus.DOWN else float(i),
+                checked_at=now - timedelta(minutes=45 * i)
+            ))
+        await db_session.commit()
+
+        await RollupService.run_compaction(db_session, lookback_hours=72)
+        since = now - timedelta(hours=30)
+        totals = await RollupService.read_totals(db_session, [monitor.id], since, now + timedelta(seconds=1))
+
+        expected = [i for i in range(60) if now - timedelta(minutes=45 * i) >= since]
+        total, up, _, _ = totals[monitor.id]
+        assert total == len(expected)
+        assert up == len([i for i in expected if i % 5 != 0])
+
+
+class SharedSession:
+    """Hands the sink the test's session without closing it"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self.db
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeHttpClient:
+    async def get(self, url, headers=None, timeout=None):
+        response = httpx.Response(200)
+        response.elapsed = timedelta(milliseconds=12)
+        return response
+
+
+@pytest.mark.asyncio
+class TestBatchedStatusChanges:
+    """Tests for status page invalidation when check results are written in batches"""
+
+    async def test_status_page_invalidated_after_sink_commit(self, db_session: AsyncSession):
+        """Test that a batched status change only marks the status page stale once it is written"""
+        monitor = Monitor(name="API", url="https://example.com", status=MonitorStatus.DOWN)
+        db_session.add(monitor)
+        await db_session.commit()
+        service = MonitorService()
+        service.http_client = FakeHttpClient()
+        service.result_sink.session_factory = lambda: SharedSession(db_session)
+        service.result_sink.flush_interval = 60
+        await service.result_sink.start()
+        await service.status_page_cache.get(lambda: _payload())
+
+        await service.execute_check(db_session, monitor, batched=True)
+        assert not service.status_page_cache._dirty
+
+        await service.result_sink.flush()
+        assert service.status_page_cache._dirty
+        await service.result_sink.stop()
+
+
+async def _payload():
+    return {"monitors": []}
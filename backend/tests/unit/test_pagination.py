@@ -0,0 +1,92 @@
+"""
+Unit tests for keyset pagination helpers and paged service queries
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.services.monitor_service import MonitorService
+from app.services.task_service import TaskService
+from app.services.audit_service import AuditService, AuditLog
+from app.models import Monitor, Board
+from datetime import datetime, timedelta
+import uuid
+
+
+class TestCursor:
+    """Tests for opaque cursor encoding"""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the position it was built from"""
+        position = (datetime(2024, 5, 1, 12, 30, 15, 123456), uuid.uuid4())
+
+        assert decode_cursor(encode_cursor(*position)) == position
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors raise ValueError"""
+        for cursor in ("", "not-a-cursor", encode_cursor(datetime.utcnow(), uuid.uuid4())[:-4]):
+            with pytest.raises(ValueError):
+                decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+class TestKeysetPagination:
+    """Tests for cursor-paged service queries"""
+
+    async def test_monitor_pages_cover_every_row_once(self, db_session: AsyncSession):
+        """Test that walking pages returns all monitors in order, including tied timestamps"""
+        created_at = datetime(2024, 1, 1)
+        monitors = [
+            Monitor(name=f"API {i}", url="https://example.com", created_at=created_at + timedelta(seconds=i // 3))
+            for i in range(10)
+        ]
+        db_session.add_all(monitors)
+        await db_session.commit()
+
+        service = MonitorService()
+        seen, cursor = [], None
+        while True:
+            page = await service.get_monitors_page(db_session, cursor=cursor, limit=4)
+            seen.extend(page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        expected = sorted(monitors, key=lambda m: (m.created_at, m.id))
+        assert [m.id for m in seen] == [m.id for m in expected]
+
+    async def test_board_pages_skip_deleted(self, db_session: AsyncSession):
+        """Test that board pages exclude soft-deleted boards"""
+        boards = [Board(name=f"Board {i}") for i in range(3)]
+        boards[1].deleted_at = datetime.utcnow()
+        db_session.add_all(boards)
+        await db_session.commit()
+
+        page = await TaskService.get_boards_page(db_session, limit=10)
+
+        assert {b.id for b in page.items} == {boards[0].id, boards[2].id}
+        assert page.next_cursor is None
+
+    async def test_audit_log_pages_are_newest_first(self, db_session: AsyncSession):
+        """Test descending keyset order for audit logs"""
+        now = datetime.utcnow()
+        logs = [
+            AuditLog(action="GET", resource_type="boards", timestamp=now - timedelta(minutes=i))
+            for i in range(5)
+        ]
+        db_session.add_all(logs)
+        await db_session.commit()
+
+        first = await AuditService.get_audit_logs_page(db_session, limit=3)
+        second = await AuditService.get_audit_logs_page(db_session, cursor=first.next_cursor, limit=3)
+
+        assert [log.id for log in first.items + second.items] == [log.id for log in logs]
+        assert second.next_cursor is None
+
+    async def test_stream_yields_all_rows(self, db_session: AsyncSession):
+        """Test that the streaming iterator returns every monitor"""
+        db_session.add_all([Monitor(name=f"API {i}", url="https://example.com") for i in range(7)])
+        await db_session.commit()
+
+        streamed = [m async for m in MonitorService().iter_monitors(db_session)]
+
+        assert len(streamed) == 7
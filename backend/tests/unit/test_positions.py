@@ -0,0 +1,140 @@
+"""
+Unit tests for fractional list and card positions
+"""
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.task_service import TaskService, crowded_parents
+from app.models import List, Card
+from app.utils.positions import POSITION_STEP, position_between, spaced_positions
+
+
+class TestPositionBetween:
+    """Tests for position_between"""
+
+    def test_between_neighbours(self):
+        """Test that the midpoint is returned between two neighbours"""
+        assert position_between(1024.0, 2048.0, 1e-6) == 1536.0
+
+    def test_open_ends(self):
+        """Test positions at the start, at the end and in an empty parent"""
+        assert position_between(None, None, 1e-6) == POSITION_STEP
+        assert position_between(None, 1024.0, 1e-6) == 0.0
+        assert position_between(1024.0, None, 1e-6) == 2048.0
+
+    def test_exhausted_gap(self):
+        """Test that neighbours closer than min_gap need renumbering"""
+        assert position_between(1.0, 1.0, 1e-6) is None
+        assert position_between(1.0, 1.0 + 1e-9, 1e-6) is None
+
+    def test_repeated_splits_stay_ordered(self):
+        """Test that splitting the same gap keeps producing increasing positions until exhausted"""
+        lower, upper = 1024.0, 2048.0
+        splits = 0
+        while True:
+            middle = position_between(lower, upper, 1e-6)
+            if middle is None:
+                break
+            assert lower < middle < upper
+            upper = middle
+            splits += 1
+        assert splits > 20
+
+    def test_spaced_positions(self):
+        """Test evenly spaced positions for a rebalance"""
+        assert spaced_positions(3) == [POSITION_STEP, 2 * POSITION_STEP, 3 * POSITION_STEP]
+
+
+@pytest.mark.asyncio
+class TestCardPlacement:
+    """Tests for placing cards with TaskService"""
+
+    async def _cards(self, db_session: AsyncSession, list_id):
+        result = await db_session.execute(select(Card.title).where(Card.list_id == list_id).order_by(Card.position))
+        return result.scalars().all()
+
+    async def _fill(self, db_session: AsyncSession, list_id, titles):
+        cards = {}
+        for title in titles:
+            cards[title] = await TaskService.create_card(db_session, list_id, title=title)
+        return cards
+
+    async def test_create_appends(self, db_session: AsyncSession, sample_list: List):
+        """Test that cards without a position are appended in creation order"""
+        await self._fill(db_session, sample_list.id, ["a", "b", "c"])
+
+        assert await self._cards(db_session, sample_list.id) == ["a", "b", "c"]
+
+    async def test_move_writes_one_row(self, test_engine, db_session: AsyncSession, sample_list: List):
+        """Test that moving a card between neighbours updates only that card (plus the board version)"""
+        cards = await self._fill(db_session, sample_list.id, ["a", "b", "c", "d"])
+
+        updates = []
+
+        def count_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE cards"):
+                updates.append(1 if not executemany else len(parameters))
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", count_updates)
+        try:
+            await TaskService.move_card(db_session, cards["d"].id, sample_list.id, after_card_id=cards["a"].id)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count_updates)
+
+        assert sum(updates) == 1
+        assert await self._cards(db_session, sample_list.id) == ["a", "d", "b", "c"]
+
+    async def test_move_before_and_across_lists(self, db_session: AsyncSession, sample_board, sample_list: List):
+        """Test moving a card before a neighbour in another list"""
+        other = await TaskService.create_list(db_session, sample_board.id, "Done")
+        cards = await self._fill(db_session, sample_list.id, ["a", "b"])
+        done = await self._fill(db_session, other.id, ["x", "y"])
+
+        await TaskService.move_card(db_session, cards["a"].id, other.id, before_card_id=done["y"].id)
+
+        assert await self._cards(db_session, sample_list.id) == ["b"]
+        assert await self._cards(db_session, other.id) == ["x", "a", "y"]
+
+    async def test_exhausted_gap_renumbers(self, db_session: AsyncSession, sample_list: List):
+        """Test that moving into an exhausted gap renumbers the list and keeps the order"""
+        cards = await self._fill(db_session, sample_list.id, ["a", "b", "c"])
+        cards["b"].position = cards["a"].position  # duplicate positions, e.g. legacy rows
+        await db_session.commit()
+
+        await TaskService.move_card(db_session, cards["c"].id, sample_list.id, after_card_id=cards["a"].id)
+
+        titles = await self._cards(db_session, sample_list.id)
+        assert titles.index("c") == titles.index("a") + 1
+        result = await db_session.execute(select(Card.position).where(Card.list_id == sample_list.id))
+        assert len(set(result.scalars().all())) == 3
+
+    async def test_neighbour_in_other_list_rejected(self, db_session: AsyncSession, sample_board, sample_list: List):
+        """Test that a neighbour outside the target list is an error"""
+        other = await TaskService.create_list(db_session, sample_board.id, "Done")
+        cards = await self._fill(db_session, sample_list.id, ["a", "b"])
+
+        with pytest.raises(ValueError):
+            await TaskService.move_card(db_session, cards["a"].id, other.id, after_card_id=cards["b"].id)
+
+    async def test_rebalance_positions(self, db_session: AsyncSession, sample_list: List):
+        """Test that the rebalance job spreads out lists where a placement left a small gap"""
+        cards = await self._fill(db_session, sample_list.id, ["a", "b"])
+        cards["b"].position = cards["a"].position + 0.015
+        await db_session.commit()
+        await TaskService.create_card(db_session, sample_list.id, "c", after_card_id=cards["a"].id)
+
+        assert await TaskService.rebalance_positions(db_session, min_gap=0.01) == 1
+        result = await db_session.execute(
+            select(Card.position).where(Card.list_id == sample_list.id).order_by(Card.position)
+        )
+        assert result.scalars().all() == spaced_positions(3)
+        assert await TaskService.rebalance_positions(db_session, min_gap=0.01) == 0
+
+    async def test_rebalance_skips_untouched_lists(self, db_session: AsyncSession, sample_list: List):
+        """Test that the rebalance job doesn't scan lists no placement has crowded"""
+        cards = await self._fill(db_session, sample_list.id, ["a", "b"])
+        cards["b"].position = cards["a"].position + 0.001
+        await db_session.commit()
+        crowded_parents[Card].clear()
+
+        assert await TaskService.rebalance_positions(db_session, min_gap=0.01) == 0
@@ -0,0 +1,195 @@
+"""
+Unit tests for the sliding window rate limiter and its stores (no database or Redis required)
+"""
+import pytest
+import time
+from app.utils.rate_limit import (
+    RateLimiter, RateLimitRule, InMemoryRateLimitStore, RedisRateLimitStore
+)
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis.asyncio used by RedisRateLimitStore"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((name, args))
+            return self
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class BrokenRedis:
+    def pipeline(self, transaction: bool = True):
+        raise ConnectionError("redis down")
+
+
+RULE = RateLimitRule(limit=3, window=60)
+WINDOW_START = 6000.0  # a multiple of the window
+
+
+@pytest.mark.asyncio
+class TestRateLimitStores:
+    """Tests shared by the in-memory and Redis-backed stores"""
+
+    @pytest.fixture(params=["memory", "redis"])
+    def store(self, request):
+        if request.param == "memory":
+            return InMemoryRateLimitStore()
+        return RedisRateLimitStore(FakeRedis())
+
+    async def test_limit_within_window(self, store):
+        """Test that requests beyond the limit are rejected with a retry hint"""
+        results = [await store.hit("ip:1", RULE, WINDOW_START + i) for i in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert 0 < results[3].retry_after <= 60
+
+    async def test_previous_window_is_weighted(self, store):
+        """Test that the sliding window carries over part of the previous window"""
+        for i in range(3):
+            await store.hit("ip:1", RULE, WINDOW_START + i)
+
+        # A third into the next window two thirds of the previous count still apply
+        assert (await store.hit("ip:1", RULE, WINDOW_START + 80)).allowed
+        assert not (await store.hit("ip:1", RULE, WINDOW_START + 80)).allowed
+        # Two windows later the old count is gone
+        assert (await store.hit("ip:1", RULE, WINDOW_START + 180)).remaining == 2
+
+    async def test_keys_are_independent(self, store):
+        """Test that one client's usage does not affect another"""
+        for i in range(3):
+            await store.hit("ip:1", RULE, WINDOW_START)
+
+        assert (await store.hit("ip:2", RULE, WINDOW_START)).allowed
+
+
+@pytest.mark.asyncio
+class TestInMemoryRateLimitStore:
+    """Tests for bounded memory in the in-process store"""
+
+    async def test_idle_keys_are_evicted(self):
+        """Test that keys idle for two windows are dropped"""
+        store = InMemoryRateLimitStore()
+        for i in range(100):
+            await store.hit(f"ip:{i}", RULE, WINDOW_START)
+
+        await store.hit("ip:active", RULE, WINDOW_START + 121)
+
+        assert len(store) == 1
+
+    async def test_max_keys(self):
+        """Test that the number of tracked keys never exceeds max_keys"""
+        store = InMemoryRateLimitStore(max_keys=10)
+        for i in range(50):
+            await store.hit(f"ip:{i}", RULE, WINDOW_START)
+
+        assert len(store) == 10
+        assert store.evictions == 40
+
+
+@pytest.mark.asyncio
+class TestRedisRateLimitStore:
+    """Tests for Redis-specific behaviour"""
+
+    async def test_counters_expire_and_rejections_are_not_counted(self):
+        """Test that window keys get a TTL and rejected hits are given back"""
+        redis = FakeRedis()
+        store = RedisRateLimitStore(redis)
+        for _ in range(5):
+            await store.hit("ip:1", RULE, WINDOW_START)
+
+        key = f"ratelimit:ip:1:{int(WINDOW_START // 60)}"
+        assert redis.data[key] == 3
+        assert redis.ttls[key] == 120
+
+    async def test_fails_open(self):
+        """Test that requests are allowed when Redis is unreachable"""
+        store = RedisRateLimitStore(BrokenRedis())
+
+        result = await store.hit("ip:1", RULE, WINDOW_START)
+
+        assert result.allowed
+        assert store.errors == 1
+
+
+@pytest.mark.asyncio
+class TestRateLimiter:
+    """Tests for per-user and per-route rules"""
+
+    async def test_users_and_ips_have_separate_rules(self):
+        """Test that authenticated users are limited by user id with their own rule"""
+        limiter = RateLimiter(InMemoryRateLimitStore(), RateLimitRule(1, 60), user_rule=RateLimitRule(5, 60))
+
+        assert (await limiter.check("GET", "/api/boards", "10.0.0.1")).allowed
+        assert not (await limiter.check("GET", "/api/boards", "10.0.0.1")).allowed
+        results = [await limiter.check("GET", "/api/boards", "10.0.0.1", user_id="u1") for _ in range(5)]
+        assert all(r.allowed for r in results)
+
+    async def test_route_rules(self):
+        """Test that the longest matching route rule applies on top of the global rule"""
+        limiter = RateLimiter(
+            InMemoryRateLimitStore(),
+            RateLimitRule(100, 60),
+            route_rules={"POST /api/auth/login": RateLimitRule(2, 60), "/api/auth": RateLimitRule(50, 60)}
+        )
+
+        assert limiter.route_rule("POST", "/api/auth/login")[1] == RateLimitRule(2, 60)
+        assert limiter.route_rule("GET", "/api/auth/login")[1] == RateLimitRule(50, 60)
+        assert limiter.route_rule("GET", "/api/boards") is None
+
+        logins = [(await limiter.check("POST", "/api/auth/login", "10.0.0.1")).allowed for _ in range(3)]
+        assert logins == [True, True, False]
+        assert (await limiter.check("GET", "/api/boards", "10.0.0.1")).allowed
+        assert limiter.stats()["rejected"] == 1
+
+    async def test_rejected_requests_use_no_budget(self):
+        """Test that a request the global rule rejects isn't counted against its route rule"""
+        route = RateLimitRule(3, 60)
+        for store in (InMemoryRateLimitStore(), RedisRateLimitStore(FakeRedis())):
+            limiter = RateLimiter(store, RateLimitRule(2, 60), route_rules={"/api/auth": route})
+
+            assert (await limiter.check("GET", "/api/boards", "10.0.0.1")).allowed
+            assert (await limiter.check("GET", "/api/boards", "10.0.0.1")).allowed
+            assert not (await limiter.check("GET", "/api/auth/login", "10.0.0.1")).allowed
+
+            route_budget = await store.hit("route:* /api/auth:ip:10.0.0.1", route, time.time())
+            assert route_budget.remaining == route.limit - 1
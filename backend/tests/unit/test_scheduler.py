@@ -0,0 +1,153 @@
+"""
+Unit tests for CheckScheduler (no database required)
+"""
+import pytest
+import asyncio
+from types import SimpleNamespace
+from app.services.scheduler import CheckScheduler
+import uuid
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeMonitorService:
+    """Stands in for MonitorService and records executed checks"""
+
+    def __init__(self, monitors, check_duration: float = 0.0):
+        self.monitors = {m.id: m for m in monitors}
+        self.check_duration = check_duration
+        self.checks = []
+        self.running = 0
+        self.max_running = 0
+
+    async def get_enabled_monitors(self, db):
+        return [m for m in self.monitors.values() if m.enabled]
+
+    async def get_monitor(self, db, monitor_id):
+        return self.monitors.get(monitor_id)
+
+    async def execute_check(self, db, monitor, batched=False):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.check_duration)
+        self.checks.append(monitor.id)
+        self.running -= 1
+
+
+def make_monitor(interval: int = 1, enabled: bool = True):
+    return SimpleNamespace(id=uuid.uuid4(), interval=interval, enabled=enabled)
+
+
+@pytest.mark.asyncio
+class TestCheckScheduler:
+    """Tests for the centralized check scheduler"""
+
+    async def test_start_schedules_enabled_monitors_only(self):
+        """Test that only enabled monitors are loaded on start"""
+        service = FakeMonitorService([make_monitor(), make_monitor(), make_monitor(enabled=False)])
+        scheduler = CheckScheduler(service, session_factory=FakeSession, max_concurrency=2, queue_size=10)
+
+        await scheduler.start()
+        try:
+            assert scheduler.stats()["scheduled_monitors"] == 2
+        finally:
+            await scheduler.stop()
+
+    async def test_due_checks_are_executed(self):
+        """Test that a monitor scheduled with no delay is checked"""
+        monitor = make_monitor(interval=60)
+        service = FakeMonitorService([])
+        scheduler = CheckScheduler(service, session_factory=FakeSession, max_concurrency=2, queue_size=10)
+        await scheduler.start()
+        service.monitors[monitor.id] = monitor
+
+        try:
+            scheduler.schedule(monitor.id, monitor.interval, delay=0)
+            await asyncio.sleep(0.05)
+        finally:
+            await scheduler.stop()
+
+        assert service.checks == [monitor.id]
+        assert scheduler.checks_completed == 1
+
+    async def test_global_concurrency_cap(self):
+        """Test that no more than max_concurrency checks run at once"""
+        monitors = [make_monitor(interval=60) for _ in range(20)]
+        service = FakeMonitorService([], check_duration=0.02)
+        scheduler = CheckScheduler(service, session_factory=FakeSession, max_concurrency=3, queue_size=5)
+        await scheduler.start()
+        service.monitors = {m.id: m for m in monitors}
+
+        try:
+            for monitor in monitors:
+                scheduler.schedule(monitor.id, monitor.interval, delay=0)
+            await asyncio.sleep(0.3)
+        finally:
+            await scheduler.stop()
+
+        assert len(service.checks) == 20
+        assert service.max_running == 3
+
+    async def test_unschedule_stops_checks(self):
+        """Test that an unscheduled monitor is no longer dispatched"""
+        monitor = make_monitor(interval=60)
+        service = FakeMonitorService([])
+        scheduler = CheckScheduler(service, session_factory=FakeSession, max_concurrency=1, queue_size=10)
+        await scheduler.start()
+        service.monitors[monitor.id] = monitor
+
+        try:
+            scheduler.schedule(monitor.id, monitor.interval, delay=0.05)
+            scheduler.unschedule(monitor.id)
+            await asyncio.sleep(0.1)
+        finally:
+            await scheduler.stop()
+
+        assert service.checks == []
+        assert not scheduler.is_scheduled(monitor.id)
+
+    async def test_disabled_monitor_is_dropped(self):
+        """Test that a monitor disabled after scheduling is removed on its next run"""
+        monitor = make_monitor(interval=60, enabled=False)
+        service = FakeMonitorService([])
+        scheduler = CheckScheduler(service, session_factory=FakeSession, max_concurrency=1, queue_size=10)
+        await scheduler.start()
+        service.monitors[monitor.id] = monitor
+
+        try:
+            scheduler.schedule(monitor.id, monitor.interval, delay=0)
+            await asyncio.sleep(0.05)
+        finally:
+            await scheduler.stop()
+
+        assert service.checks == []
+        assert not scheduler.is_scheduled(monitor.id)
+
+    async def test_jitter_spreads_first_runs(self):
+        """Test that first runs are spread across the interval"""
+        service = FakeMonitorService([])
+        scheduler = CheckScheduler(service, session_factory=FakeSession, jitter=1.0)
+
+        for _ in range(50):
+            scheduler.schedule(uuid.uuid4(), 60)
+
+        due_times = [entry[0] for entry in scheduler._heap]
+        assert max(due_times) - min(due_times) > 10
+
+    async def test_stats_report_lag_and_queue_depth(self):
+        """Test that scheduler metrics are exposed"""
+        service = FakeMonitorService([])
+        scheduler = CheckScheduler(service, session_factory=FakeSession, max_concurrency=4, queue_size=8)
+
+        stats = scheduler.stats()
+
+        assert stats["running"] is False
+        assert stats["queue_depth"] == 0
+        assert stats["max_concurrency"] == 4
+        assert set(stats["lag_seconds"]) == {"last", "avg", "max"}
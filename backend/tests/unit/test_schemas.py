@@ -87,12 +87,12 @@ class TestListSchemas:
         assert list_schema.position == 0
 
     def test_list_create_default_position(self):
-        """Test ListCreate with default position"""
+        """Test ListCreate without a position (appended after the last list)"""
         data = {"name": "Backlog"}
         list_schema = ListCreate(**data)
 
         assert list_schema.name == "Backlog"
-        assert list_schema.position == 0
+        assert list_schema.position is None
 
     def test_list_create_negative_position(self):
         """Test that negative position is allowed (business logic handles this)"""
@@ -140,7 +140,7 @@ class TestCardSchemas:
 
         assert card.title == "Quick task"
         assert card.description is None
-        assert card.position == 0  # default
+        assert card.position is None  # default: appended to the list
 
     def test_card_create_long_title(self):
         """Test card with very long title"""
@@ -231,7 +231,7 @@ class TestSchemaValidation:
         assert not hasattr(board, "extra_field")
 
     def test_list_create_type_coercion(self):
-        """Test that string position is coerced to int"""
+        """Test that string position is coerced to float"""
         data = {
             "name": "List",
             "position": "5"  # string
@@ -239,7 +239,7 @@ class TestSchemaValidation:
         list_schema = ListCreate(**data)
 
         assert list_schema.position == 5
-        assert isinstance(list_schema.position, int)
+        assert isinstance(list_schema.position, float)
 
     def test_card_create_whitespace_title(self):
         """Test card with whitespace-only title"""
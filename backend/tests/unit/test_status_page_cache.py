@@ -0,0 +1,91 @@
+"""
+Unit tests for the status page snapshot cache (no database required)
+"""
+import pytest
+import asyncio
+from app.services.status_page_cache import StatusPageCache, etag_matches
+
+
+class CountingBuilder:
+    """Builds a status payload and counts how often it is called"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"overall_status": "operational", "monitors": [], "build": self.calls}
+
+
+@pytest.mark.asyncio
+class TestStatusPageCache:
+    """Tests for StatusPageCache"""
+
+    async def test_snapshot_is_reused(self):
+        """Test that a fresh snapshot is served without rebuilding"""
+        cache = StatusPageCache(min_refresh=60, max_age=60)
+        build = CountingBuilder()
+
+        first = await cache.get(build)
+        second = await cache.get(build)
+
+        assert build.calls == 1
+        assert second is first
+        assert cache.hits == 1
+
+    async def test_concurrent_requests_share_one_rebuild(self):
+        """Test that a burst of requests on a cold cache builds once"""
+        cache = StatusPageCache(min_refresh=60, max_age=60)
+        build = CountingBuilder(delay=0.02)
+
+        snapshots = await asyncio.gather(*(cache.get(build) for _ in range(50)))
+
+        assert build.calls == 1
+        assert len({s.etag for s in snapshots}) == 1
+
+    async def test_invalidate_respects_min_refresh(self):
+        """Test that invalidation is applied only after min_refresh has passed"""
+        cache = StatusPageCache(min_refresh=60, max_age=120)
+        build = CountingBuilder()
+        await cache.get(build)
+
+        cache.invalidate()
+        await cache.get(build)
+        assert build.calls == 1
+
+        cache.min_refresh = 0
+        snapshot = await cache.get(build)
+        assert build.calls == 2
+        assert b'"build":2' in snapshot.body
+
+    async def test_failed_rebuild_stays_dirty(self):
+        """Test that a failed build is retried on the next request"""
+        cache = StatusPageCache(min_refresh=0, max_age=60)
+
+        async def failing():
+            raise RuntimeError("database unavailable")
+
+        with pytest.raises(RuntimeError):
+            await cache.get(failing)
+
+        build = CountingBuilder()
+        await cache.get(build)
+        assert build.calls == 1
+
+
+class TestEtagMatches:
+    """Tests for If-None-Match handling"""
+
+    def test_matches(self):
+        """Test strong, weak, list and wildcard forms"""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+
+    def test_no_match(self):
+        """Test missing and different tags"""
+        assert not etag_matches(None, '"abc"')
+        assert not etag_matches('"def"', '"abc"')
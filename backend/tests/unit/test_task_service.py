@@ -5,6 +5,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.task_service import TaskService
 from app.models import Board, List, Card, Activity
+from app.utils.positions import POSITION_STEP
 import uuid
 
 
@@ -197,7 +198,7 @@ class TestTaskServiceList:
     async def test_create_list_default_position(
         self, db_session: AsyncSession, sample_board: Board
     ):
-        """Test creating list with default position"""
+        """Test creating list with default position (after the last list)"""
         list_obj = await TaskService.create_list(
             db_session,
             sample_board.id,
@@ -205,7 +206,7 @@ class TestTaskServiceList:
         )
 
         assert list_obj is not None
-        assert list_obj.position == 0
+        assert list_obj.position == POSITION_STEP
 
     async def test_create_list_on_nonexistent_board(self, db_session: AsyncSession):
         """Test creating list on board that doesn't exist"""
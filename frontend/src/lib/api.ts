@@ -50,14 +50,14 @@ export const boards = {
 }
 
 export const lists = {
-  create: (boardId: string, data: { name: string; position: number }) =>
+  create: (boardId: string, data: { name: string; position?: number }) =>
     api.post(`/boards/${boardId}/lists`, data),
 }
 
 export const cards = {
   create: (listId: string, data: { title: string; description?: string }) =>
     api.post(`/lists/${listId}/cards`, data),
-  move: (cardId: string, data: { list_id: string; position: number }) =>
+  move: (cardId: string, data: { list_id: string; position?: number; after_card_id?: string; before_card_id?: string }) =>
     api.put(`/cards/${cardId}/move`, data),
 }
 
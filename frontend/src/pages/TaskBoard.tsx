@@ -37,7 +37,7 @@ export default function TaskBoard() {
 
   const createListMutation = useMutation({
     mutationFn: (data: { boardId: string; name: string }) =>
-      lists.create(data.boardId, { name: data.name, position: 0 }),
+      lists.create(data.boardId, { name: data.name }),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['board', selectedBoard] })
       setNewListName('')